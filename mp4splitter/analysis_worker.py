@@ -0,0 +1,45 @@
+"""
+Background analysis worker for the MP4 Splitter application.
+"""
+
+import threading
+
+from PySide6.QtCore import QThread, Signal
+
+from mp4splitter.cancellation import OperationCancelled
+
+
+class AnalysisWorker(QThread):
+    """
+    Thread that runs a video analysis off the GUI thread.
+
+    The analysis is a callable taking ``cancel_event`` and
+    ``progress_callback`` keyword arguments, such as
+    ``scene_detector.detect_scenes`` with its other arguments bound. Its
+    return value is delivered through ``analysis_completed``.
+    """
+    progress_updated = Signal(float, float)  # percent, speed
+    analysis_completed = Signal(object)      # result of the analysis
+    analysis_cancelled = Signal()
+    error_occurred = Signal(str)             # error message
+
+    def __init__(self, analysis, parent=None):
+        super().__init__(parent)
+        self.analysis = analysis
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        """Run the analysis (executed in the worker thread)."""
+        try:
+            result = self.analysis(cancel_event=self.cancel_event,
+                                   progress_callback=self.progress_updated.emit)
+        except OperationCancelled:
+            self.analysis_cancelled.emit()
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+        else:
+            self.analysis_completed.emit(result)
+
+    def cancel(self):
+        """Request cancellation of the analysis. Safe to call from the GUI thread."""
+        self.cancel_event.set()
@@ -0,0 +1,111 @@
+"""
+Streaming audio decode for the MP4 Splitter application.
+
+The audio of a video is decoded by ffmpeg to mono 16-bit PCM at a low
+sample rate and read from a pipe in fixed-size blocks, which are handed to
+an analysis as NumPy arrays. Memory use does not depend on the length of
+the recording, so the silence detector and the waveform overview can
+process files of any length in one pass.
+"""
+
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+from moviepy.config import FFMPEG_BINARY
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+from mp4splitter.cancellation import OperationCancelled
+from mp4splitter.progress import REPORT_INTERVAL
+
+# Speech and music carry nothing above 8 kHz that matters for finding
+# pauses or drawing levels, so the audio is analyzed at 16 kHz mono
+SAMPLE_RATE = 16000
+
+# Samples read from the pipe at once (10 seconds of audio)
+BLOCK_SAMPLES = SAMPLE_RATE * 10
+
+
+def run_audio_analysis(video_path, process_block, multiple=1, cancel_event=None,
+                       progress_callback=None):
+    """
+    Decode the audio of a video and pass it to an analysis block by block.
+
+    Args:
+        video_path: Path to the video.
+        process_block: Callable receiving consecutive ``int16`` sample
+            arrays. Every block but the last holds a multiple of
+            ``multiple`` samples; the last one holds the rest.
+        multiple: Block lengths are rounded to a multiple of this.
+        cancel_event: Optional ``threading.Event`` that stops the decode.
+        progress_callback: Optional callable receiving ``(percent, speed)``,
+            where ``speed`` is seconds of audio decoded per second.
+
+    Returns:
+        int: The number of samples decoded.
+
+    Raises:
+        ValueError: If the video has no audio.
+        RuntimeError: If ffmpeg fails to decode the audio.
+        OperationCancelled: If the cancel event was set.
+    """
+    infos = ffmpeg_parse_infos(video_path)
+    if not infos.get("audio_found"):
+        raise ValueError("The video has no audio track")
+    duration = infos["duration"]
+
+    cmd = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+           "-i", video_path, "-map", "0:a:0", "-vn", "-sn",
+           "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"]
+    block_size = max(BLOCK_SAMPLES // multiple, 1) * multiple * 2  # 16-bit samples
+
+    stderr = tempfile.TemporaryFile()
+    process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                               stderr=stderr)
+    started = last_report = time.monotonic()
+    samples = 0
+    try:
+        remainder = b""
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise OperationCancelled()
+
+            data = process.stdout.read(block_size)
+            if not data:
+                break
+            data = remainder + data
+            usable = len(data) - len(data) % (multiple * 2)
+            remainder = data[usable:]
+            if usable:
+                process_block(np.frombuffer(data[:usable], dtype=np.int16))
+                samples += usable // 2
+
+            now = time.monotonic()
+            if progress_callback is not None and now - last_report >= REPORT_INTERVAL:
+                last_report = now
+                position = samples / SAMPLE_RATE
+                progress_callback(min(100.0 * position / duration, 100.0) if duration else 0.0,
+                                  position / (now - started))
+
+        process.wait()
+        if process.returncode != 0:
+            stderr.seek(0)
+            message = stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(message or f"ffmpeg exited with code {process.returncode}")
+        # A trailing odd byte cannot be a sample
+        remainder = remainder[:len(remainder) - len(remainder) % 2]
+        if remainder:
+            process_block(np.frombuffer(remainder, dtype=np.int16))
+            samples += len(remainder) // 2
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        stderr.close()
+
+    if progress_callback is not None:
+        elapsed = time.monotonic() - started
+        progress_callback(100.0, duration / elapsed if elapsed > 0 else 0.0)
+    return samples
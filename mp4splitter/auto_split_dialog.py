@@ -0,0 +1,82 @@
+"""
+Auto split dialog component for the MP4 Splitter application.
+"""
+
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QDoubleSpinBox,
+                               QComboBox, QCheckBox, QDialogButtonBox)
+
+# Interval units offered by the dialog
+SECONDS = "seconds"
+FRAMES = "frames"
+
+
+class AutoSplitDialog(QDialog):
+    """
+    Dialog asking for the interval of fixed-length segments.
+
+    Args:
+        duration_ms: Duration of the video in milliseconds.
+        fps: Frame rate of the video, or None if unknown (frames are then
+            not offered as a unit).
+        parent: Parent widget.
+    """
+    def __init__(self, duration_ms, fps=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Auto Split")
+        self.duration_ms = duration_ms
+        self.fps = fps
+        self.setup_ui()
+        self.update_summary()
+
+    def setup_ui(self):
+        """Set up the user interface."""
+        layout = QVBoxLayout(self)
+
+        interval_layout = QHBoxLayout()
+        interval_layout.addWidget(QLabel("Split every"))
+        self.interval_spin = QDoubleSpinBox()
+        self.interval_spin.setRange(0.001, 1000000)
+        self.interval_spin.setDecimals(3)
+        self.interval_spin.setValue(10)
+        interval_layout.addWidget(self.interval_spin)
+        self.unit_combo = QComboBox()
+        self.unit_combo.addItem("seconds", SECONDS)
+        if self.fps:
+            self.unit_combo.addItem("frames", FRAMES)
+        interval_layout.addWidget(self.unit_combo)
+        layout.addLayout(interval_layout)
+
+        self.align_checkbox = QCheckBox("Align cuts to the nearest keyframe")
+        self.align_checkbox.setToolTip(
+            "Move every cut to the closest keyframe, so the segments can be stream copied"
+        )
+        layout.addWidget(self.align_checkbox)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.interval_spin.valueChanged.connect(self.update_summary)
+        self.unit_combo.currentIndexChanged.connect(self.update_summary)
+
+    def interval_ms(self):
+        """Return the chosen interval in milliseconds."""
+        value = self.interval_spin.value()
+        if self.unit_combo.currentData() == FRAMES:
+            return value * 1000 / self.fps
+        return value * 1000
+
+    def align_to_keyframes(self):
+        """Return True if the cuts should be moved to keyframes."""
+        return self.align_checkbox.isChecked()
+
+    def update_summary(self):
+        """Show how many segments the interval gives."""
+        segments = max(int(-(-self.duration_ms // self.interval_ms())), 1)
+        self.summary_label.setText(
+            f"About {segments} segments; the current split points are replaced"
+        )
@@ -0,0 +1,228 @@
+"""
+Program boundary detection for the MP4 Splitter application.
+
+Broadcast captures separate programs with black slates and sometimes with
+frozen frames. The detectors here mark runs of black frames (low mean
+luma) and frozen frames (almost no difference to the previous frame) on
+the downscaled grayscale frames of ``frame_analysis``. They run alongside
+the scene detector on the same decode, so finding every kind of boundary
+costs one pass over the file.
+"""
+
+import numpy as np
+
+from mp4splitter.frame_analysis import BatchFrameConsumer, run_analysis
+from mp4splitter.scene_detector import DEFAULT_MIN_SCENE_LENGTH, DEFAULT_THRESHOLD, SceneDetector
+from mp4splitter.split_spec import points_from_cuts
+
+# Frames whose mean luma is below this are black; video black is 16 in
+# the limited range most sources use
+BLACK_LUMA = 24
+
+# Frames whose mean absolute difference to the previous frame is below
+# this, in gray levels, are frozen; encoding noise alone stays under it
+FREEZE_DIFFERENCE = 0.5
+
+# Shortest runs reported, in seconds
+DEFAULT_MIN_BLACK = 0.5
+DEFAULT_MIN_FREEZE = 2.0
+
+BLACK = "black"
+FREEZE = "freeze"
+
+
+class IntervalDetector(BatchFrameConsumer):
+    """
+    Frame consumer reporting runs of frames that meet a condition.
+
+    Subclasses implement ``flag_frames``. After the analysis ``intervals``
+    holds ``(start_sec, end_sec)`` pairs of the runs lasting at least
+    ``min_duration``.
+
+    Args:
+        min_duration: Shortest run reported, in seconds.
+    """
+    kind = None
+
+    def __init__(self, min_duration):
+        super().__init__()
+        self.min_duration = min_duration
+        self.intervals = []
+        self.frames = 0
+        self.run_start = None  # first frame of the current run
+
+    def start(self, pipeline):
+        super().start(pipeline)
+        self.intervals = []
+        self.frames = 0
+        self.run_start = None
+
+    def process_batch(self, first_index, frames):
+        flags = self.flag_frames(frames)
+        # Frames where the condition switches on or off
+        changes = np.flatnonzero(np.diff(flags.astype(np.int8))) + 1
+        boundaries = [0, *changes.tolist(), len(flags)]
+        for first, last in zip(boundaries, boundaries[1:]):
+            if flags[first]:
+                if self.run_start is None:
+                    self.run_start = first_index + first
+            else:
+                self._end_run(first_index + first)
+        self.frames = first_index + len(flags)
+
+    def finish(self):
+        super().finish()
+        self._end_run(self.frames)
+
+    def _end_run(self, end_frame):
+        if self.run_start is not None and end_frame - self.run_start >= self.min_duration * self.fps:
+            self.intervals.append((self.run_start / self.fps, end_frame / self.fps))
+        self.run_start = None
+
+    def flag_frames(self, frames):
+        """
+        Return a boolean array marking the frames of a batch that meet the condition.
+
+        Args:
+            frames: ``uint8`` array of shape ``(count, height, width)``.
+        """
+        raise NotImplementedError
+
+
+class BlackFrameDetector(IntervalDetector):
+    """Finds runs of black frames."""
+    kind = BLACK
+
+    def __init__(self, min_duration=DEFAULT_MIN_BLACK, luma=BLACK_LUMA):
+        super().__init__(min_duration)
+        self.luma = luma
+
+    def flag_frames(self, frames):
+        return frames.reshape(len(frames), -1).mean(axis=1) < self.luma
+
+
+class FreezeFrameDetector(IntervalDetector):
+    """Finds runs of frames that do not change."""
+    kind = FREEZE
+
+    def __init__(self, min_duration=DEFAULT_MIN_FREEZE, difference=FREEZE_DIFFERENCE):
+        super().__init__(min_duration)
+        self.difference = difference
+        self.previous_frame = None
+
+    def start(self, pipeline):
+        super().start(pipeline)
+        self.previous_frame = None
+
+    def flag_frames(self, frames):
+        frames = frames.reshape(len(frames), -1).astype(np.int16)
+        first_batch = self.previous_frame is None
+        if first_batch:
+            frames_before = np.concatenate([frames[:1], frames[:-1]])
+        else:
+            frames_before = np.concatenate([self.previous_frame[np.newaxis], frames[:-1]])
+        self.previous_frame = frames[-1]
+        flags = np.abs(frames - frames_before).mean(axis=1) < self.difference
+        if first_batch:
+            # The first frame of the video has nothing to be frozen on
+            flags[0] = False
+        return flags
+
+
+class Segmentation:
+    """
+    Boundaries found by one analysis pass.
+
+    Args:
+        scene_cuts: Scene change times in seconds.
+        intervals: ``(start_sec, end_sec, kind)`` black and frozen runs.
+        duration: Duration of the analyzed video in seconds.
+        min_scene_length: Minimum distance between two cuts, in seconds.
+    """
+    def __init__(self, scene_cuts, intervals, duration, min_scene_length=DEFAULT_MIN_SCENE_LENGTH):
+        self.scene_cuts = list(scene_cuts)
+        self.intervals = sorted(intervals)
+        self.duration = duration
+        self.min_scene_length = min_scene_length
+
+    def count(self, kind):
+        """Return the number of black or frozen runs found."""
+        return sum(1 for interval in self.intervals if interval[2] == kind)
+
+    def cut_times(self):
+        """
+        Return the cut times of the segmentation.
+
+        Each black or frozen run between two programs is cut in its middle;
+        runs touching the start or end of the video separate nothing. Scene
+        cuts inside or next to such a run (fades into and out of a slate)
+        are dropped in favour of the run's cut.
+
+        Returns:
+            list: Cut times in seconds, ascending.
+        """
+        # Overlapping runs, e.g. a black slate that is also frozen, are one boundary
+        merged = []
+        for start, end, kind in self.intervals:
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        cuts = [(start + end) / 2 for start, end in merged
+                if start > 0 and end < self.duration]
+        for cut in self.scene_cuts:
+            if not any(start - self.min_scene_length < cut < end + self.min_scene_length
+                       for start, end in merged):
+                cuts.append(cut)
+        return sorted(cuts)
+
+    def split_points(self):
+        """Return SplitPoint objects with a segment between every two boundaries."""
+        return points_from_cuts([int(round(t * 1000)) for t in self.cut_times()])
+
+
+def detect_boundaries(video_path, scene_threshold=DEFAULT_THRESHOLD, black=True, freeze=True,
+                      min_scene_length=DEFAULT_MIN_SCENE_LENGTH, cancel_event=None,
+                      progress_callback=None):
+    """
+    Find scene changes, black slates and frozen frames in one pass.
+
+    Args:
+        video_path: Path to the video.
+        scene_threshold: Minimum score of a scene cut, or None to not look
+            for scene changes.
+        black: Look for runs of black frames.
+        freeze: Look for runs of frozen frames.
+        min_scene_length: Minimum distance between two cuts, in seconds.
+        cancel_event: Optional ``threading.Event`` that stops the analysis.
+        progress_callback: Optional callable receiving ``(percent, speed)``.
+
+    Returns:
+        Segmentation: The boundaries found.
+
+    Raises:
+        ValueError: If no detector is selected.
+        RuntimeError: If ffmpeg fails to decode the video.
+        OperationCancelled: If the cancel event was set.
+    """
+    scene_detector = None
+    detectors = []
+    if scene_threshold is not None:
+        scene_detector = SceneDetector(scene_threshold, min_scene_length)
+    if black:
+        detectors.append(BlackFrameDetector())
+    if freeze:
+        detectors.append(FreezeFrameDetector())
+    analyzers = detectors + ([scene_detector] if scene_detector is not None else [])
+    if not analyzers:
+        raise ValueError("No detector selected")
+
+    run_analysis(video_path, analyzers, cancel_event, progress_callback)
+
+    intervals = [(start, end, detector.kind)
+                 for detector in detectors for start, end in detector.intervals]
+    scene_cuts = scene_detector.cut_times() if scene_detector is not None else []
+    analyzer = analyzers[0]
+    return Segmentation(scene_cuts, intervals, analyzer.first_index / analyzer.fps,
+                        min_scene_length)
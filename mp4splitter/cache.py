@@ -0,0 +1,207 @@
+"""
+Persistent metadata cache for the MP4 Splitter application.
+
+Probe results, keyframe indexes, thumbnails and waveforms are stored in an
+SQLite database under the user cache directory, keyed by the identity of
+the source file, so reopening an unchanged file does not read it again.
+The database is capped in size and evicts the least recently used entries.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+# Default size cap of the cache database contents, in bytes
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when the layout of the table or of stored values changes
+CACHE_VERSION = 2
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def user_cache_dir():
+    """
+    Return the per-user cache directory of the application.
+
+    The ``MP4SPLITTER_CACHE_DIR`` environment variable overrides the
+    platform default.
+    """
+    override = os.environ.get("MP4SPLITTER_CACHE_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "mp4splitter")
+
+
+def file_identity(video_path):
+    """Return a key that changes whenever the file at the path is replaced or modified."""
+    stat = os.stat(video_path)
+    return (os.path.abspath(video_path), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+class MetadataCache:
+    """
+    Size-capped LRU store of per-file metadata.
+
+    Entries are addressed by a kind (e.g. "info" or "keyframes"), the
+    identity of the source file and an optional key within that kind (e.g.
+    the time of a thumbnail). Entries of older versions of a file are
+    dropped as soon as a new version is stored. The cache is safe to use
+    from several threads, and database errors are treated as cache misses
+    so a broken cache never breaks the application.
+
+    Args:
+        path: Path of the SQLite database file.
+        max_bytes: Maximum total size of the stored values.
+    """
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        with self.lock, self.connection:
+            self._create_schema()
+
+    def _create_schema(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS entries")
+            self.connection.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                bytes INTEGER NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (kind, path, key, size, mtime_ns, inode)
+            )
+        """)
+        self.connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def get(self, kind, video_path, key=""):
+        """
+        Return a stored value, or None if there is none for the current file.
+
+        Args:
+            kind: Kind of value, e.g. "info".
+            video_path: Path of the source file.
+            key: Key of the value within its kind.
+        """
+        try:
+            identity = file_identity(video_path)
+        except OSError:
+            return None
+        where = "kind = ? AND path = ? AND key = ? AND size = ? AND mtime_ns = ? AND inode = ?"
+        params = (kind, identity[0], key, *identity[1:])
+        try:
+            with self.lock, self.connection:
+                row = self.connection.execute(f"SELECT value FROM entries WHERE {where}",
+                                              params).fetchone()
+                if row is None:
+                    return None
+                self.connection.execute(f"UPDATE entries SET accessed = ? WHERE {where}",
+                                        (time.time(), *params))
+        except sqlite3.Error:
+            return None
+        return row[0]
+
+    def put(self, kind, video_path, value, key=""):
+        """
+        Store a value for the current version of a file.
+
+        Args:
+            kind: Kind of value, e.g. "info".
+            video_path: Path of the source file.
+            value: The bytes to store.
+            key: Key of the value within its kind.
+        """
+        try:
+            identity = file_identity(video_path)
+        except OSError:
+            return
+        value = bytes(value)
+        try:
+            with self.lock, self.connection:
+                # Values of a previous version of the file can never be hit again
+                self.connection.execute(
+                    "DELETE FROM entries WHERE path = ? AND "
+                    "NOT (size = ? AND mtime_ns = ? AND inode = ?)",
+                    identity
+                )
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (kind, identity[0], *identity[1:], key, value, len(value), time.time())
+                )
+                self._evict()
+        except sqlite3.Error:
+            pass
+
+    def get_json(self, kind, video_path, key=""):
+        """Return a stored JSON value, or None."""
+        value = self.get(kind, video_path, key)
+        return json.loads(value) if value is not None else None
+
+    def put_json(self, kind, video_path, value, key=""):
+        """Store a value as JSON."""
+        self.put(kind, video_path, json.dumps(value).encode("utf-8"), key)
+
+    def _evict(self):
+        """Drop the least recently used entries until the cache fits its cap."""
+        total = self.connection.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.connection.execute("SELECT rowid, bytes FROM entries ORDER BY accessed")
+        expired = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            expired.append((rowid,))
+            total -= size
+        self.connection.executemany("DELETE FROM entries WHERE rowid = ?", expired)
+
+    def clear(self):
+        """Remove every entry."""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM entries")
+
+    def close(self):
+        """Close the database."""
+        with self.lock:
+            self.connection.close()
+
+
+def get_cache():
+    """
+    Return the shared cache of the application, opening it on first use.
+
+    Returns:
+        MetadataCache: The cache, or None if the database cannot be opened;
+        callers then simply work without a cache.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = MetadataCache(os.path.join(user_cache_dir(), "cache.sqlite3"))
+            except (OSError, sqlite3.Error):
+                return None
+        return _cache
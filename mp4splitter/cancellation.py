@@ -0,0 +1,10 @@
+"""
+Cancellation support shared by the MP4 Splitter's long-running operations.
+"""
+
+# How often a running operation is checked for cancellation, in seconds
+CANCEL_POLL_INTERVAL = 0.2
+
+
+class OperationCancelled(Exception):
+    """Raised when a long-running operation is stopped through its cancel event."""
@@ -0,0 +1,289 @@
+"""
+Command-line interface for the MP4 Splitter application.
+
+Runs the splitting engine without a display: nothing here imports Qt
+widgets. Progress is written to standard output as JSON lines, one event
+per line, and the exit status tells schedulers how the job ended.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from mp4splitter.cancellation import CANCEL_POLL_INTERVAL
+from mp4splitter.encoder_profiles import DEFAULT_PROFILE, PROFILES
+from mp4splitter.job_queue import DEFAULT_CONCURRENCY, JobQueue
+from mp4splitter.mp4 import MP4Error
+from mp4splitter.service import DEFAULT_HOST, DEFAULT_PORT, SplitService
+from mp4splitter.split_planner import plan_by_size
+from mp4splitter.split_spec import load_split_spec, parse_time, points_from_cuts
+from mp4splitter.split_strategies import DEFAULT_MODE, STRATEGIES, CopyStrategy
+from mp4splitter.video_splitter import VideoSplitter
+from mp4splitter.watch_folder import (DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_TIME,
+                                      FolderWatcher, SplitTemplate)
+
+# Exit statuses
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_CANCELLED = 130
+
+
+class JsonLinesReporter:
+    """
+    Writes the splitter's signals to a stream as JSON lines.
+
+    Args:
+        splitter: The VideoSplitter to report on.
+        stream: Text stream to write to.
+    """
+    def __init__(self, splitter, stream):
+        self.stream = stream
+        self.result = None
+        self.error = None
+        splitter.segment_started.connect(
+            lambda number, filename: self.emit("segment_started", segment=number, filename=filename)
+        )
+        splitter.progress_updated.connect(
+            lambda done, total: self.emit("segments", done=done, total=total)
+        )
+        splitter.frame_progress.connect(
+            lambda percent, fps, speed: self.emit("progress", percent=round(percent, 2),
+                                                  fps=round(fps, 2), speed=round(speed, 3))
+        )
+        splitter.splitting_completed.connect(lambda: self.finish("completed"))
+        splitter.splitting_cancelled.connect(lambda: self.finish("cancelled"))
+        splitter.error_occurred.connect(self.fail)
+
+    def emit(self, event, **fields):
+        """Write one event line."""
+        self.stream.write(json.dumps({"event": event, **fields}) + "\n")
+        self.stream.flush()
+
+    def finish(self, result):
+        self.result = result
+        self.emit(result)
+
+    def fail(self, message):
+        self.result = "error"
+        self.error = message
+        self.emit("error", message=message)
+
+
+def run_split(args):
+    """Run the ``split`` command."""
+    if args.max_size is not None and args.mode != CopyStrategy.name:
+        print(f"mp4splitter-cli: --max-size plans stream copy segments; use --mode "
+              f"{CopyStrategy.name}", file=sys.stderr)
+        return EXIT_USAGE
+    try:
+        if args.spec:
+            points = load_split_spec(args.spec, args.spec_format)
+        elif args.max_size is not None:
+            points = plan_by_size(args.source, int(args.max_size * 1024 * 1024))
+        else:
+            points = points_from_cuts([parse_time(t) for t in args.cut])
+    except MP4Error as e:
+        print(f"mp4splitter-cli: cannot plan segments by size: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+        print(f"mp4splitter-cli: invalid split spec: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    if not points:
+        print("mp4splitter-cli: the split spec defines no segments", file=sys.stderr)
+        return EXIT_USAGE
+
+    splitter = VideoSplitter(args.source, None, args.mode, args.workers, args.profile)
+    reporter = JsonLinesReporter(splitter, sys.stdout)
+    cancel_requested = []
+
+    def request_cancel(signum, frame):
+        cancel_requested.append(signum)
+        splitter.cancel()
+
+    signal.signal(signal.SIGINT, request_cancel)
+    signal.signal(signal.SIGTERM, request_cancel)
+
+    try:
+        splitter.set_output_dir(args.output_dir)
+    except OSError as e:
+        reporter.fail(f"Cannot create output directory: {e}")
+        return EXIT_FAILED
+    splitter.split_video(points, resume=not args.no_resume)
+
+    if reporter.result == "completed":
+        return EXIT_OK
+    # ffmpeg children receive the same terminal interrupt and may fail
+    # before the cancellation is noticed; report that as a cancel too
+    if reporter.result == "cancelled" or cancel_requested:
+        return EXIT_CANCELLED
+    return EXIT_FAILED
+
+
+def run_serve(args):
+    """Run the ``serve`` command until interrupted."""
+    try:
+        service = SplitService(args.host, args.port, JobQueue(args.concurrency), args.verbose)
+    except OSError as e:
+        print(f"mp4splitter-cli: cannot listen on {args.host}:{args.port}: {e}", file=sys.stderr)
+        return EXIT_FAILED
+
+    stop_requested = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_requested.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_requested.set())
+
+    service.start()
+    host, port = service.address
+    print(json.dumps({"event": "listening", "host": host, "port": port}), flush=True)
+    # Wake up regularly so the signal handlers get a chance to run
+    while not stop_requested.wait(CANCEL_POLL_INTERVAL):
+        pass
+    service.shutdown()
+    print(json.dumps({"event": "stopped"}), flush=True)
+    return EXIT_OK
+
+
+def run_watch(args):
+    """Run the ``watch`` command until interrupted."""
+    if not os.path.isdir(args.directory):
+        print(f"mp4splitter-cli: not a directory: {args.directory}", file=sys.stderr)
+        return EXIT_USAGE
+    try:
+        template = SplitTemplate(args.interval, sidecar=not args.no_sidecar)
+    except ValueError as e:
+        print(f"mp4splitter-cli: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    job_queue = JobQueue(args.concurrency)
+    try:
+        watcher = FolderWatcher(args.directory, args.output_dir, template, job_queue,
+                                args.mode, args.profile, args.workers,
+                                args.poll_interval, args.settle_time)
+    except ValueError as e:
+        print(f"mp4splitter-cli: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except OSError as e:
+        print(f"mp4splitter-cli: cannot create output directory: {e}", file=sys.stderr)
+        return EXIT_FAILED
+
+    output_lock = threading.Lock()
+    failures = []
+
+    def report(event, details):
+        if event == "failed":
+            failures.append(details["file"])
+        with output_lock:
+            print(json.dumps({"event": event, **details}), flush=True)
+
+    watcher.add_listener(report)
+
+    stop_requested = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_requested.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_requested.set())
+
+    watcher.run(stop_requested, until_idle=args.once)
+    # Interrupted jobs are not recorded as handled, so the next run resumes them
+    if stop_requested.is_set():
+        job_queue.pause()
+        job_queue.cancel_all()
+    # Wait until the watcher has recorded every result, not just until the
+    # queue is idle, so the ledger is complete when the process exits
+    while watcher.busy:
+        if stop_requested.is_set():
+            job_queue.cancel_all()
+        time.sleep(CANCEL_POLL_INTERVAL)
+
+    if stop_requested.is_set():
+        return EXIT_CANCELLED
+    return EXIT_FAILED if failures else EXIT_OK
+
+
+def build_parser():
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="mp4splitter-cli",
+        description="Split MP4 videos without a display. Progress is written to "
+                    "standard output as JSON lines."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    split = commands.add_parser("split", help="split one video into segments")
+    split.add_argument("source", help="video file to split")
+    split.add_argument("-o", "--output-dir", required=True,
+                       help="directory the segments are written to")
+    spec = split.add_mutually_exclusive_group(required=True)
+    spec.add_argument("--cut", nargs="+", metavar="TIME",
+                      help="cut the video at these times (seconds or [HH:]MM:SS[.mmm])")
+    spec.add_argument("--spec", metavar="FILE",
+                      help="CSV or JSON file listing the segments; \"-\" reads standard input")
+    spec.add_argument("--max-size", type=float, metavar="MB",
+                      help="cut at keyframes so every segment stays under this size "
+                           "(stream copy of MP4 files only)")
+    split.add_argument("--spec-format", choices=["csv", "json"],
+                       help="format of the --spec file (default: from its extension)")
+    split.add_argument("--mode", choices=list(STRATEGIES), default=DEFAULT_MODE,
+                       help=f"split mode (default: {DEFAULT_MODE})")
+    split.add_argument("--profile", choices=list(PROFILES), default=DEFAULT_PROFILE,
+                       help=f"encoder profile for re-encoding modes (default: {DEFAULT_PROFILE})")
+    split.add_argument("--workers", type=int, default=1,
+                       help="number of segments written in parallel (default: 1)")
+    split.add_argument("--no-resume", action="store_true",
+                       help="rewrite every segment even if the job journal has it")
+    split.set_defaults(handler=run_split)
+
+    serve = commands.add_parser("serve", help="run the local HTTP job service")
+    serve.add_argument("--host", default=DEFAULT_HOST,
+                       help=f"address to listen on (default: {DEFAULT_HOST})")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT,
+                       help=f"port to listen on (default: {DEFAULT_PORT})")
+    serve.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                       help=f"number of jobs run at once (default: {DEFAULT_CONCURRENCY})")
+    serve.add_argument("--verbose", action="store_true", help="log every request")
+    serve.set_defaults(handler=run_serve)
+
+    watch = commands.add_parser("watch", help="split every new video dropped into a directory")
+    watch.add_argument("directory", help="directory to watch for MP4 files")
+    watch.add_argument("-o", "--output-dir", required=True,
+                       help="directory the segments and the ledger of handled files are written to")
+    watch.add_argument("--interval", type=float, metavar="SECONDS",
+                       help="split into segments of this length when a video has no sidecar spec")
+    watch.add_argument("--no-sidecar", action="store_true",
+                       help="ignore <video name>.csv/.json split specs next to the videos")
+    watch.add_argument("--mode", choices=list(STRATEGIES), default=DEFAULT_MODE,
+                       help=f"split mode (default: {DEFAULT_MODE})")
+    watch.add_argument("--profile", choices=list(PROFILES), default=DEFAULT_PROFILE,
+                       help=f"encoder profile for re-encoding modes (default: {DEFAULT_PROFILE})")
+    watch.add_argument("--workers", type=int, default=1,
+                       help="number of segments of one video written in parallel (default: 1)")
+    watch.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                       help=f"number of videos split at once (default: {DEFAULT_CONCURRENCY})")
+    watch.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                       help=f"seconds between directory scans (default: {DEFAULT_POLL_INTERVAL:g})")
+    watch.add_argument("--settle-time", type=float, default=DEFAULT_SETTLE_TIME,
+                       help="seconds a file must stop changing before it is split "
+                            f"(default: {DEFAULT_SETTLE_TIME:g})")
+    watch.add_argument("--once", action="store_true",
+                       help="exit once the videos already in the directory are split")
+    watch.set_defaults(handler=run_watch)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Returns:
+        int: The exit status.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Single-pass decode pipeline for the MP4 Splitter application.
+
+The source is decoded once, sequentially, through an ffmpeg pipe and every
+frame is handed to each registered consumer. This keeps the total decode
+work proportional to the length of the source, however many consumers
+(segment encoders, analyzers) are attached.
+"""
+
+import subprocess
+import tempfile
+
+from moviepy.config import FFMPEG_BINARY
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+from mp4splitter.cancellation import OperationCancelled
+
+# Bytes per pixel of the raw pixel formats the pipeline can produce
+BYTES_PER_PIXEL = {
+    "rgb24": 3,
+    "gray": 1,
+}
+
+
+class FrameConsumer:
+    """
+    Base class for objects that receive frames from a ``DecodePipeline``.
+    """
+    def start(self, pipeline):
+        """Called once before the first frame with the running pipeline."""
+
+    def process_frame(self, index, time_sec, frame):
+        """
+        Handle one decoded frame.
+
+        Args:
+            index: Zero-based frame number.
+            time_sec: Presentation time of the frame in seconds.
+            frame: Raw pixel data as bytes, ``pipeline.frame_size`` long.
+        """
+
+    def finish(self):
+        """Called once after the last frame has been delivered."""
+
+    def abort(self):
+        """Called instead of ``finish`` when decoding fails or is cancelled."""
+
+
+class DecodePipeline:
+    """
+    Decode a video once and fan its frames out to several consumers.
+
+    Frames are produced at a constant rate, so a frame's time is its index
+    divided by ``fps``.
+
+    Args:
+        video_path: Path to the source video.
+        size: Optional ``(width, height)`` to scale frames to.
+        pix_fmt: Raw pixel format, one of ``BYTES_PER_PIXEL``.
+        fps: Optional output frame rate; defaults to the source frame rate.
+    """
+    def __init__(self, video_path, size=None, pix_fmt="rgb24", fps=None):
+        infos = ffmpeg_parse_infos(video_path)
+        self.video_path = video_path
+        self.scaled = size is not None
+        self.size = tuple(size or infos["video_size"])
+        self.pix_fmt = pix_fmt
+        self.fps = fps or infos["video_fps"]
+        self.duration = infos["duration"]
+        self.consumers = []
+
+    @property
+    def frame_size(self):
+        """Size of one raw frame in bytes."""
+        width, height = self.size
+        return width * height * BYTES_PER_PIXEL[self.pix_fmt]
+
+    def add_consumer(self, consumer):
+        """Register a ``FrameConsumer`` to receive every decoded frame."""
+        self.consumers.append(consumer)
+
+    def run(self, cancel_event=None):
+        """
+        Decode the whole source and deliver its frames to the consumers.
+
+        Args:
+            cancel_event: Optional ``threading.Event`` checked between frames.
+
+        Raises:
+            RuntimeError: If ffmpeg fails to decode the source.
+            OperationCancelled: If the cancel event was set.
+        """
+        cmd = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+               "-i", self.video_path, "-map", "0:v:0", "-an", "-sn"]
+        if self.scaled:
+            cmd += ["-vf", "scale={}:{}".format(*self.size)]
+        cmd += ["-r", f"{self.fps}", "-f", "rawvideo", "-pix_fmt", self.pix_fmt, "-"]
+
+        stderr = tempfile.TemporaryFile()
+        process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                   stderr=stderr)
+        try:
+            for consumer in self.consumers:
+                consumer.start(self)
+
+            frame_size = self.frame_size
+            index = 0
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+
+                frame = process.stdout.read(frame_size)
+                if len(frame) < frame_size:
+                    break
+
+                time_sec = index / self.fps
+                for consumer in self.consumers:
+                    consumer.process_frame(index, time_sec, frame)
+                index += 1
+
+            process.wait()
+            if process.returncode != 0:
+                stderr.seek(0)
+                message = stderr.read().decode(errors="replace").strip()
+                raise RuntimeError(message or f"ffmpeg exited with code {process.returncode}")
+
+            for consumer in self.consumers:
+                consumer.finish()
+        except BaseException:
+            for consumer in self.consumers:
+                consumer.abort()
+            raise
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            stderr.close()
@@ -0,0 +1,102 @@
+"""
+Encoder profiles for the MP4 Splitter application.
+
+A profile bundles the libx264/AAC settings used by the re-encoding split
+modes, so a job can trade encoding speed for output size.
+"""
+
+
+class EncoderProfile:
+    """
+    Named set of encoder settings.
+
+    Args:
+        name: Profile name used in the API and the GUI.
+        label: Human readable description.
+        preset: x264 preset, from "ultrafast" to "veryslow".
+        crf: Constant rate factor. Ignored when ``video_bitrate`` is set.
+        video_bitrate: Target video bitrate such as "4000k", or None for CRF.
+        threads: Number of encoder threads, or None to let ffmpeg decide.
+        tune: x264 tune such as "film" or "fastdecode", or None.
+        audio_bitrate: AAC bitrate such as "128k", or None for the default.
+    """
+    def __init__(self, name, label, preset="medium", crf=23, video_bitrate=None,
+                 threads=None, tune=None, audio_bitrate=None):
+        self.name = name
+        self.label = label
+        self.preset = preset
+        self.crf = crf
+        self.video_bitrate = video_bitrate
+        self.threads = threads
+        self.tune = tune
+        self.audio_bitrate = audio_bitrate
+
+    def rate_control_args(self):
+        """Return the ffmpeg arguments selecting CRF or bitrate rate control."""
+        if self.video_bitrate is not None:
+            return ["-b:v", self.video_bitrate]
+        return ["-crf", str(self.crf)]
+
+    def video_args(self):
+        """Return the ffmpeg output arguments for the video stream."""
+        args = ["-c:v", "libx264", "-preset", self.preset, *self.rate_control_args()]
+        if self.tune:
+            args += ["-tune", self.tune]
+        if self.threads is not None:
+            args += ["-threads", str(self.threads)]
+        return args
+
+    def audio_args(self):
+        """Return the ffmpeg output arguments for the audio stream."""
+        args = ["-c:a", "aac"]
+        if self.audio_bitrate:
+            args += ["-b:a", self.audio_bitrate]
+        return args
+
+    def settings(self):
+        """Return the profile as a dictionary, e.g. for the job journal."""
+        return {
+            "name": self.name,
+            "preset": self.preset,
+            "crf": self.crf,
+            "video_bitrate": self.video_bitrate,
+            "threads": self.threads,
+            "tune": self.tune,
+            "audio_bitrate": self.audio_bitrate,
+        }
+
+
+# Available profiles, keyed by the name used in the API and the GUI
+PROFILES = {
+    "fast-draft": EncoderProfile(
+        "fast-draft", "Fast draft (quick, larger files)",
+        preset="veryfast", crf=28, tune="fastdecode", audio_bitrate="96k"
+    ),
+    "balanced": EncoderProfile(
+        "balanced", "Balanced",
+        preset="medium", crf=23, audio_bitrate="128k"
+    ),
+    "archive": EncoderProfile(
+        "archive", "Archive (slow, best quality)",
+        preset="slow", crf=18, audio_bitrate="192k"
+    ),
+}
+
+DEFAULT_PROFILE = "balanced"
+
+
+def get_profile(profile):
+    """
+    Resolve a profile name to an ``EncoderProfile``.
+
+    ``EncoderProfile`` instances are returned unchanged, so custom profiles
+    can be passed wherever a profile name is accepted.
+
+    Raises:
+        ValueError: If the profile name is not known.
+    """
+    if isinstance(profile, EncoderProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown encoder profile: {profile}")
+    return PROFILES[profile]
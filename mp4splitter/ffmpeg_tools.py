@@ -0,0 +1,234 @@
+"""
+FFmpeg helpers for the MP4 Splitter application.
+"""
+
+import re
+import subprocess
+import tempfile
+import threading
+from fractions import Fraction
+
+from moviepy.config import FFMPEG_BINARY
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+from mp4splitter.cancellation import CANCEL_POLL_INTERVAL, OperationCancelled
+
+
+def run_ffmpeg(args, cancel_event=None, progress_callback=None):
+    """
+    Run ffmpeg with the given arguments and wait for it to finish.
+
+    Args:
+        args: Command line arguments, without the ffmpeg binary itself.
+        cancel_event: Optional ``threading.Event``; when it is set the ffmpeg
+            process is killed.
+        progress_callback: Optional callable receiving the output position in
+            seconds, fed from ffmpeg's ``-progress`` reports. It is called
+            from a reader thread.
+
+    Raises:
+        RuntimeError: If ffmpeg exits with a non-zero status.
+        OperationCancelled: If the cancel event was set before ffmpeg finished.
+    """
+    cmd = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-y"]
+    if progress_callback is not None:
+        cmd += ["-progress", "pipe:1", "-nostats"]
+    cmd += list(args)
+
+    stderr = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE if progress_callback is not None else subprocess.DEVNULL,
+        stderr=stderr
+    )
+    reader = None
+    if progress_callback is not None:
+        reader = threading.Thread(target=read_progress, args=(process.stdout, progress_callback),
+                                  daemon=True)
+        reader.start()
+
+    try:
+        while True:
+            try:
+                process.wait(timeout=CANCEL_POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel_event is not None and cancel_event.is_set():
+                    process.kill()
+                    process.wait()
+                    raise OperationCancelled()
+        if reader is not None:
+            reader.join()
+
+        if process.returncode != 0:
+            stderr.seek(0)
+            message = stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(message or f"ffmpeg exited with code {process.returncode}")
+    finally:
+        stderr.close()
+
+
+def read_progress(stream, progress_callback):
+    """
+    Parse ffmpeg ``-progress`` output and report the output position.
+
+    Args:
+        stream: Binary stream carrying the ``key=value`` progress lines.
+        progress_callback: Callable receiving the position in seconds.
+    """
+    with stream:
+        for line in stream:
+            key, _, value = line.decode(errors="replace").strip().partition("=")
+            # Despite its name, out_time_ms is in microseconds as well
+            if key == "out_time_us" and value.isdigit():
+                progress_callback(int(value) / 1000000)
+
+
+class FrameEncoder:
+    """
+    An ffmpeg process that encodes raw frames written to its standard input.
+
+    Args:
+        output_path: Path of the file to create.
+        size: ``(width, height)`` of the frames.
+        fps: Frame rate of the frames.
+        pix_fmt: Pixel format of the frames.
+        extra_inputs: Arguments for additional inputs (e.g. an audio source),
+            placed after the raw frame input so it is input 0.
+        output_args: Mapping and codec arguments for the output.
+    """
+    def __init__(self, output_path, size, fps, pix_fmt="rgb24", extra_inputs=(), output_args=()):
+        width, height = size
+        self.output_path = output_path
+        cmd = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-y",
+               "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}",
+               "-r", f"{fps}", "-i", "pipe:0",
+               *extra_inputs, *output_args, output_path]
+        # stderr goes to a file so a chatty encoder can never block on a full pipe
+        self.stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                        stderr=self.stderr)
+
+    def write_frame(self, frame):
+        """Write one frame of raw pixel data."""
+        try:
+            self.process.stdin.write(frame)
+        except BrokenPipeError:
+            self.process.wait()
+            raise RuntimeError(self._error_message())
+
+    def close(self):
+        """
+        Finish encoding and wait for ffmpeg to exit.
+
+        Raises:
+            RuntimeError: If ffmpeg exits with a non-zero status.
+        """
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self.process.wait()
+        try:
+            if self.process.returncode != 0:
+                raise RuntimeError(self._error_message())
+        finally:
+            self.stderr.close()
+
+    def kill(self):
+        """Stop ffmpeg immediately, discarding the output."""
+        self.process.kill()
+        self.process.wait()
+        self.stderr.close()
+
+    def _error_message(self):
+        self.stderr.seek(0)
+        message = self.stderr.read().decode(errors="replace").strip()
+        return message or f"ffmpeg exited with code {self.process.returncode}"
+
+
+def probe_duration(video_path):
+    """Return the duration of a media file in seconds without opening a reader."""
+    return ffmpeg_parse_infos(video_path)["duration"]
+
+
+def probe_start_time(video_path):
+    """Return the start time of a media file in seconds, 0 if it reports none."""
+    return ffmpeg_parse_infos(video_path).get("start") or 0.0
+
+
+def probe_video_fps(video_path):
+    """Return the frame rate of the first video stream, or None if there is none."""
+    return ffmpeg_parse_infos(video_path).get("video_fps")
+
+
+def probe_video_codec(video_path):
+    """Return the codec name of the first video stream, or None if there is none."""
+    return ffmpeg_parse_infos(video_path).get("video_codec_name")
+
+
+def probe_audio_stream(video_path):
+    """
+    Describe the first audio stream of a media file.
+
+    Returns:
+        dict: ``codec``, ``sample_rate`` (Hz) and ``channel_layout`` (e.g.
+        "stereo"), or None if the file has no audio stream.
+    """
+    # ffmpeg_parse_infos does not report the audio codec or layout, so read
+    # the stream description from ffmpeg's input summary directly
+    result = subprocess.run([FFMPEG_BINARY, "-hide_banner", "-i", video_path],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    match = re.search(r"Stream #\S+.*?: Audio: (\w+)[^,]*(?:, (\d+) Hz)?(?:, ([^,\n]+))?",
+                      result.stderr.decode(errors="replace"))
+    if not match:
+        return None
+    codec, sample_rate, channel_layout = match.groups()
+    return {
+        "codec": codec,
+        "sample_rate": int(sample_rate) if sample_rate else None,
+        "channel_layout": channel_layout.strip() if channel_layout else None,
+    }
+
+
+def probe_audio_codec(video_path):
+    """Return the codec name of the first audio stream, or None if there is none."""
+    stream = probe_audio_stream(video_path)
+    return stream["codec"] if stream else None
+
+
+def scan_keyframes(video_path):
+    """
+    List the keyframe times of the first video stream.
+
+    The packets are passed through ffmpeg's ``framecrc`` muxer with stream
+    copy, so nothing is decoded and the scan runs at disk speed.
+
+    Args:
+        video_path: Path to the video file.
+
+    Returns:
+        list: Sorted keyframe presentation times in seconds, relative to the
+        start of the file.
+    """
+    # Without -copyts ffmpeg already shifts the timestamps so the input
+    # starts at 0, which makes them relative to the start of the file
+    cmd = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+           "-i", video_path, "-map", "0:v:0", "-c", "copy", "-f", "framecrc", "-"]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        message = result.stderr.decode(errors="replace").strip()
+        raise RuntimeError(message or f"ffmpeg exited with code {result.returncode}")
+
+    time_base = None
+    keyframes = []
+    for line in result.stdout.decode(errors="replace").splitlines():
+        if line.startswith("#tb 0:"):
+            time_base = Fraction(line.split(":", 1)[1].strip())
+        elif line and not line.startswith("#"):
+            # Non-key packets carry an "F=" flags column, keyframes do not
+            fields = [field.strip() for field in line.split(",")]
+            if len(fields) >= 6 and not any(f.startswith("F=") for f in fields[6:]):
+                keyframes.append(float(int(fields[2]) * time_base))
+    return sorted(keyframes)
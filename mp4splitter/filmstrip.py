@@ -0,0 +1,166 @@
+"""
+Filmstrip component for the MP4 Splitter application.
+"""
+
+from PySide6.QtWidgets import QWidget, QSizePolicy
+from PySide6.QtGui import QPainter, QColor, QPen
+from PySide6.QtCore import Qt, QRectF, Signal
+
+
+# Height of the strip in pixels
+FILMSTRIP_HEIGHT = 54
+
+# Narrowest time span the strip can be zoomed to, in milliseconds
+MIN_SPAN_MS = 10000
+
+# Factor the span changes by per wheel step
+ZOOM_STEP = 1.25
+
+# Thumbnails are requested every Nth slot first, then at halving strides,
+# so the whole strip is covered quickly and sharpened afterwards
+COARSE_STRIDES = (8, 4, 2, 1)
+
+
+class Filmstrip(QWidget):
+    """
+    Strip of keyframe thumbnails covering the visible part of a video.
+
+    Every slot shows the nearest thumbnail loaded so far, so the strip
+    fills in coarsely at once and sharpens as more thumbnails arrive. The
+    wheel zooms around the pointer and Shift+wheel scrolls; clicking asks
+    the player to seek there. Thumbnails are decoded by a ThumbnailLoader
+    on its thread pool, never by the widget itself.
+
+    Args:
+        loader: ThumbnailLoader of the video shown.
+    """
+    # Emitted with a time in milliseconds when the strip is clicked
+    position_requested = Signal(int)
+    # Emitted with the start and span in milliseconds when the visible part changes
+    view_changed = Signal(float, float)
+
+    def __init__(self, loader):
+        super().__init__()
+        self.loader = loader
+        self.loader.index_ready.connect(self.index_ready)
+        self.loader.thumbnail_ready.connect(self.thumbnail_ready)
+        self.duration_ms = 0
+        self.position_ms = 0
+        self.view_start = 0
+        self.view_span = 0
+        self.last_slot_width = None
+        self.setFixedHeight(FILMSTRIP_HEIGHT)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setCursor(Qt.PointingHandCursor)
+
+    def set_duration(self, duration_ms):
+        """Set the duration of the video and show all of it."""
+        self.duration_ms = duration_ms
+        self.view_start = 0
+        self.view_span = duration_ms
+        self.view_changed.emit(self.view_start, self.view_span)
+        self.request_visible()
+        self.update()
+
+    def set_position(self, position_ms):
+        """Move the playhead, scrolling the strip to keep it in view."""
+        self.position_ms = position_ms
+        if not self.view_start <= position_ms <= self.view_start + self.view_span:
+            self.set_view(position_ms - self.view_span / 2, self.view_span)
+        self.update()
+
+    def slot_width(self):
+        """Return the width of one thumbnail slot in pixels."""
+        image = self.loader.images.first()
+        if image is not None:
+            return max(image.width() * self.height() // max(image.height(), 1), 1)
+        return self.height() * 16 // 9
+
+    def time_at(self, x):
+        """Return the time in milliseconds shown at a horizontal position."""
+        if self.width() <= 0:
+            return 0
+        return int(self.view_start + self.view_span * x / self.width())
+
+    def set_view(self, start_ms, span_ms):
+        """Show ``span_ms`` milliseconds from ``start_ms``, kept within the video."""
+        span_ms = min(max(span_ms, min(MIN_SPAN_MS, self.duration_ms)), self.duration_ms)
+        start_ms = min(max(start_ms, 0), self.duration_ms - span_ms)
+        if (start_ms, span_ms) != (self.view_start, self.view_span):
+            self.view_start, self.view_span = start_ms, span_ms
+            self.view_changed.emit(start_ms, span_ms)
+            self.request_visible()
+            self.update()
+
+    def slot_times(self, slot_width):
+        """Return the time at the centre of every slot of the visible strip."""
+        slots = -(-self.width() // slot_width)
+        return [self.time_at((i + 0.5) * slot_width) for i in range(slots)]
+
+    def request_visible(self):
+        """Queue thumbnails for the visible slots, coarse first."""
+        if self.duration_ms <= 0 or self.width() <= 0:
+            return
+        slot_width = self.slot_width()
+        times = self.slot_times(slot_width)
+        for level, stride in enumerate(COARSE_STRIDES):
+            # Visible work goes before anything queued for an earlier view
+            self.loader.request(times[::stride], priority=len(COARSE_STRIDES) - level)
+        # Prefetch the slots of the next zoom level at the lowest priority
+        halves = self.slot_times(max(slot_width // 2, 1))
+        self.loader.request(halves, priority=0)
+
+    def index_ready(self, keyframe_index):
+        """Start loading thumbnails once the keyframe index of a new video is known."""
+        self.request_visible()
+        self.update()
+
+    def thumbnail_ready(self, time_ms):
+        """Repaint when a thumbnail finished loading."""
+        slot_width = self.slot_width()
+        if slot_width != self.last_slot_width:
+            # The first thumbnail shows the real aspect ratio, which changes the slots
+            self.last_slot_width = slot_width
+            self.request_visible()
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.fillRect(self.rect(), QColor(32, 32, 32))
+        if self.view_span <= 0:
+            return
+
+        slot_width = self.slot_width()
+        for i, time_ms in enumerate(self.slot_times(slot_width)):
+            image = self.loader.images.nearest(time_ms)
+            if image is not None:
+                painter.drawImage(QRectF(i * slot_width, 0, slot_width, self.height()), image)
+
+        x = (self.position_ms - self.view_start) * self.width() / self.view_span
+        painter.setPen(QPen(QColor(255, 64, 64), 2))
+        painter.drawLine(int(x), 0, int(x), self.height())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.request_visible()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.view_span > 0:
+            self.position_requested.emit(self.time_at(event.position().x()))
+
+    def wheelEvent(self, event):
+        if self.view_span <= 0:
+            return
+        delta = event.angleDelta()
+        steps = (delta.y() or delta.x()) / 120
+        if event.modifiers() & Qt.ShiftModifier or delta.x():
+            # Scroll by a tenth of the visible span per step
+            self.set_view(self.view_start - steps * self.view_span / 10, self.view_span)
+        else:
+            # Zoom around the time under the pointer
+            anchor = self.time_at(event.position().x())
+            fraction = (anchor - self.view_start) / self.view_span
+            span = self.view_span / (ZOOM_STEP ** steps)
+            self.set_view(anchor - fraction * span, span)
+        event.accept()
@@ -0,0 +1,132 @@
+"""
+Frame analysis support for the MP4 Splitter application.
+
+Analyzers look at a heavily downscaled grayscale copy of the video, which
+ffmpeg produces much faster than full frames and which is small enough to
+process in batches with NumPy. Several analyzers can share one decode by
+being attached to the same ``DecodePipeline``.
+"""
+
+import time
+
+import numpy as np
+
+from mp4splitter.decode_pipeline import DecodePipeline, FrameConsumer
+from mp4splitter.progress import REPORT_INTERVAL
+
+# Size of the frames the analyzers see: 16:9 and small enough that a
+# batch of several hundred frames fits in a few megabytes
+ANALYSIS_SIZE = (64, 36)
+
+# Frames collected before a batch is handed to NumPy
+BATCH_FRAMES = 512
+
+
+class BatchFrameConsumer(FrameConsumer):
+    """
+    Frame consumer that processes frames in NumPy batches.
+
+    Subclasses implement ``process_batch``. Frames are delivered in order
+    and every batch but the last holds ``batch_frames`` frames.
+    """
+    batch_frames = BATCH_FRAMES
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.buffered = 0
+        self.first_index = 0
+        self.shape = None
+        self.fps = None
+
+    def start(self, pipeline):
+        width, height = pipeline.size
+        self.shape = (height, width)
+        self.fps = pipeline.fps
+        self.buffer = bytearray()
+        self.buffered = 0
+        self.first_index = 0
+
+    def process_frame(self, index, time_sec, frame):
+        self.buffer += frame
+        self.buffered += 1
+        if self.buffered >= self.batch_frames:
+            self._flush()
+
+    def finish(self):
+        self._flush()
+
+    def _flush(self):
+        if not self.buffered:
+            return
+        frames = np.frombuffer(bytes(self.buffer), dtype=np.uint8)
+        self.process_batch(self.first_index, frames.reshape(self.buffered, *self.shape))
+        self.first_index += self.buffered
+        self.buffer = bytearray()
+        self.buffered = 0
+
+    def process_batch(self, first_index, frames):
+        """
+        Handle a batch of frames.
+
+        Args:
+            first_index: Frame number of the first frame in the batch.
+            frames: ``uint8`` array of shape ``(count, height, width)``.
+        """
+
+
+class ProgressConsumer(FrameConsumer):
+    """
+    Reports how far decoding has progressed, at most every ``interval`` seconds.
+
+    Args:
+        callback: Callable receiving ``(percent, speed)``, where ``speed`` is
+            seconds of video analyzed per second of wall time.
+        interval: Minimum time between two reports, in seconds.
+    """
+    def __init__(self, callback, interval=REPORT_INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self.duration = 0
+        self.started = None
+        self.last_report = None
+
+    def start(self, pipeline):
+        self.duration = pipeline.duration
+        self.started = self.last_report = time.monotonic()
+
+    def process_frame(self, index, time_sec, frame):
+        now = time.monotonic()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report(time_sec, now)
+
+    def finish(self):
+        self.report(self.duration, time.monotonic())
+
+    def report(self, time_sec, now):
+        elapsed = now - self.started
+        percent = 100.0 * time_sec / self.duration if self.duration > 0 else 0.0
+        speed = time_sec / elapsed if elapsed > 0 else 0.0
+        self.callback(min(percent, 100.0), speed)
+
+
+def run_analysis(video_path, analyzers, cancel_event=None, progress_callback=None):
+    """
+    Decode a video once at analysis size and feed it to the analyzers.
+
+    Args:
+        video_path: Path to the video.
+        analyzers: FrameConsumer objects expecting grayscale frames.
+        cancel_event: Optional ``threading.Event`` that stops the analysis.
+        progress_callback: Optional callable receiving ``(percent, speed)``.
+
+    Raises:
+        RuntimeError: If ffmpeg fails to decode the video.
+        OperationCancelled: If the cancel event was set.
+    """
+    pipeline = DecodePipeline(video_path, size=ANALYSIS_SIZE, pix_fmt="gray")
+    for analyzer in analyzers:
+        pipeline.add_consumer(analyzer)
+    if progress_callback is not None:
+        pipeline.add_consumer(ProgressConsumer(progress_callback))
+    pipeline.run(cancel_event)
@@ -0,0 +1,126 @@
+"""
+On-disk journal of split jobs for the MP4 Splitter application.
+
+The journal lives in the output directory next to the segments. It records
+which source and settings produced each finished segment, so a rerun of the
+same job only writes the segments that are missing or corrupt.
+"""
+
+import hashlib
+import json
+import os
+
+# Read size used when hashing segment files
+HASH_BLOCK_SIZE = 1024 * 1024
+
+JOURNAL_VERSION = 1
+
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_identity(video_path):
+    """Describe a source file well enough to notice when it changes."""
+    stat = os.stat(video_path)
+    return {
+        "path": os.path.abspath(video_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+class JobJournal:
+    """
+    Journal of one split job.
+
+    Args:
+        path: Path of the journal file.
+        source: Source identity, see ``source_identity``.
+        settings: Dictionary of the settings that affect the output bytes.
+        plan: List of ``(index, start_sec, end_sec, output_filename,
+            output_path)`` tuples.
+    """
+    def __init__(self, path, source, settings, plan):
+        self.path = path
+        self.source = source
+        self.settings = settings
+        self.segments = [
+            {"filename": filename, "start": start_sec, "end": end_sec}
+            for _, start_sec, end_sec, filename, _ in plan
+        ]
+        self.completed = {}
+
+    @staticmethod
+    def journal_path(output_dir, video_path):
+        """Return the journal path for a source in an output directory."""
+        base_name = os.path.splitext(os.path.basename(video_path))[0]
+        return os.path.join(output_dir, f".{base_name}.mp4splitter-journal.json")
+
+    @classmethod
+    def open(cls, output_dir, video_path, settings, plan):
+        """
+        Load the journal of a job, keeping only entries that are still valid.
+
+        Completed segments are forgotten if the source file or the settings
+        changed since they were written.
+        """
+        journal = cls(cls.journal_path(output_dir, video_path), source_identity(video_path),
+                      settings, plan)
+        try:
+            with open(journal.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return journal
+
+        if (data.get("version") == JOURNAL_VERSION and
+                data.get("source") == journal.source and
+                data.get("settings") == journal.settings):
+            journal.completed = data.get("completed", {})
+        return journal
+
+    def is_complete(self, start_sec, end_sec, output_path):
+        """
+        Check whether a segment was already written and is intact.
+
+        The segment must have been recorded with the same time range, and the
+        file on disk must still have the recorded size and hash.
+        """
+        entry = self.completed.get(os.path.basename(output_path))
+        if entry is None or entry["start"] != start_sec or entry["end"] != end_sec:
+            return False
+        try:
+            if os.path.getsize(output_path) != entry["size"]:
+                return False
+            return file_sha256(output_path) == entry["sha256"]
+        except OSError:
+            return False
+
+    def mark_complete(self, start_sec, end_sec, output_path):
+        """Record a finished segment and save the journal."""
+        self.completed[os.path.basename(output_path)] = {
+            "start": start_sec,
+            "end": end_sec,
+            "size": os.path.getsize(output_path),
+            "sha256": file_sha256(output_path),
+        }
+        self.save()
+
+    def save(self):
+        """Write the journal atomically, so a crash never leaves it half-written."""
+        data = {
+            "version": JOURNAL_VERSION,
+            "source": self.source,
+            "settings": self.settings,
+            "segments": self.segments,
+            "completed": self.completed,
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,326 @@
+"""
+Batch job queue for the MP4 Splitter application.
+
+Split jobs wait in a queue and are run on background threads, up to a
+configurable number at a time. The queue does not depend on the GUI; the
+window shows it through ``QueuePanel`` and other front ends can drive it
+directly.
+"""
+
+import copy
+import itertools
+import os
+import threading
+
+from PySide6.QtCore import Qt
+
+from mp4splitter.encoder_profiles import DEFAULT_PROFILE, get_profile
+from mp4splitter.split_strategies import DEFAULT_MODE
+from mp4splitter.video_splitter import VideoSplitter
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+# Number of jobs run at once unless configured otherwise
+DEFAULT_CONCURRENCY = max(1, (os.cpu_count() or 1) // 2)
+
+_job_ids = itertools.count(1)
+
+
+class SplitJob:
+    """
+    One video to split.
+
+    The split points are copied, so the caller can keep editing its own.
+
+    Args:
+        video_path: Path to the source video.
+        output_dir: Directory the segments are written to.
+        split_points: List of SplitPoint objects.
+        mode: Split mode name, see ``split_strategies.STRATEGIES``.
+        profile: Encoder profile name or ``EncoderProfile``.
+        workers: Number of worker processes used by the job itself.
+
+    Attributes:
+        job_id: Unique number of the job within the process.
+        status: One of the job states of this module.
+        segments_done: Number of segments written so far.
+        percent: Overall progress in percent.
+        error: Error message of a failed job, or None.
+    """
+    def __init__(self, video_path, output_dir, split_points, mode=DEFAULT_MODE,
+                 profile=DEFAULT_PROFILE, workers=1):
+        self.job_id = next(_job_ids)
+        self.video_path = video_path
+        self.output_dir = output_dir
+        self.split_points = copy.deepcopy(split_points)
+        self.mode = mode
+        self.profile = profile
+        self.workers = workers
+        self.status = QUEUED
+        self.segments_done = 0
+        self.percent = 0.0
+        self.error = None
+        self.splitter = None
+        self.cancel_requested = False
+
+    @property
+    def segment_count(self):
+        """Number of segments in the job."""
+        return len(self.split_points)
+
+    @property
+    def output_key(self):
+        """Identifies the segment files the job writes."""
+        base_name = os.path.splitext(os.path.basename(self.video_path))[0]
+        return (os.path.abspath(self.output_dir), base_name)
+
+    @property
+    def finished(self):
+        """Whether the job has completed, failed or been cancelled."""
+        return self.status in FINISHED_STATES
+
+    def to_dict(self):
+        """Return the job settings and state as a plain dictionary."""
+        return {
+            "id": self.job_id,
+            "video_path": self.video_path,
+            "output_dir": self.output_dir,
+            "mode": self.mode,
+            "profile": get_profile(self.profile).name,
+            "workers": self.workers,
+            "status": self.status,
+            "segments_done": self.segments_done,
+            "segment_count": self.segment_count,
+            "percent": self.percent,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Runs queued split jobs in order, a limited number at a time.
+
+    All methods are safe to call from any thread. Listeners registered with
+    ``add_listener`` are called with the changed job whenever a job is
+    added, moved, removed, starts, reports progress or finishes. They run
+    on whichever thread made the change, so GUI code must forward them to
+    its own thread.
+
+    Args:
+        max_concurrent: Maximum number of jobs running at once.
+    """
+    def __init__(self, max_concurrent=DEFAULT_CONCURRENCY):
+        self.condition = threading.Condition()
+        self.jobs = []
+        self.max_concurrent = max(1, max_concurrent)
+        self.paused = False
+        self.listeners = []
+
+    def add_listener(self, callback):
+        """Register a callable receiving ``(job,)`` on every job change."""
+        self.listeners.append(callback)
+
+    def submit(self, job):
+        """
+        Add a job to the end of the queue.
+
+        Returns:
+            SplitJob: The job.
+        """
+        with self.condition:
+            self.jobs.append(job)
+        self._notify(job)
+        self._schedule()
+        return job
+
+    def get(self, job_id):
+        """Return the job with the given ID, or None."""
+        with self.condition:
+            return next((job for job in self.jobs if job.job_id == job_id), None)
+
+    def list_jobs(self):
+        """Return the jobs in queue order."""
+        with self.condition:
+            return list(self.jobs)
+
+    def move(self, job_id, position):
+        """
+        Move a job to another position in the queue.
+
+        Only the order of queued jobs matters; running and finished jobs are
+        simply listed where they are placed.
+        """
+        with self.condition:
+            job = self._find(job_id)
+            self.jobs.remove(job)
+            position = max(0, min(position, len(self.jobs)))
+            self.jobs.insert(position, job)
+        self._notify(job)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job.
+
+        A queued job is cancelled at once; a running job stops as soon as
+        its split strategy allows. Finished jobs are left alone.
+        """
+        with self.condition:
+            job = self._find(job_id)
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                self.condition.notify_all()
+            elif job.status == RUNNING:
+                # The job thread may not have created its splitter yet
+                job.cancel_requested = True
+                if job.splitter is not None:
+                    job.splitter.cancel()
+                return
+            else:
+                return
+        self._notify(job)
+
+    def cancel_all(self):
+        """Cancel every queued and running job."""
+        for job in self.list_jobs():
+            self.cancel(job.job_id)
+
+    def remove(self, job_id):
+        """
+        Remove a job that is not running from the queue.
+
+        Raises:
+            ValueError: If the job is running.
+        """
+        with self.condition:
+            job = self._find(job_id)
+            if job.status == RUNNING:
+                raise ValueError("A running job cannot be removed; cancel it first")
+            self.jobs.remove(job)
+            self.condition.notify_all()
+        self._notify(job)
+
+    def clear_finished(self):
+        """Remove every completed, failed or cancelled job."""
+        with self.condition:
+            finished = [job for job in self.jobs if job.finished]
+            self.jobs = [job for job in self.jobs if not job.finished]
+        for job in finished:
+            self._notify(job)
+
+    def set_max_concurrent(self, max_concurrent):
+        """Change the number of jobs run at once; running jobs are not stopped."""
+        with self.condition:
+            self.max_concurrent = max(1, int(max_concurrent))
+        self._schedule()
+
+    def pause(self):
+        """Stop starting new jobs. Running jobs continue."""
+        with self.condition:
+            self.paused = True
+
+    def resume(self):
+        """Start queued jobs again after ``pause``."""
+        with self.condition:
+            self.paused = False
+        self._schedule()
+
+    def wait(self, timeout=None):
+        """
+        Block until no job is queued or running.
+
+        Returns:
+            bool: True if the queue became idle, False on timeout.
+        """
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: all(job.finished for job in self.jobs), timeout
+            )
+
+    def _find(self, job_id):
+        job = next((job for job in self.jobs if job.job_id == job_id), None)
+        if job is None:
+            raise KeyError(f"No job with ID {job_id}")
+        return job
+
+    def _notify(self, job):
+        for callback in list(self.listeners):
+            callback(job)
+
+    def _schedule(self):
+        """Start queued jobs while there are free slots."""
+        started = []
+        with self.condition:
+            if not self.paused:
+                running = [job for job in self.jobs if job.status == RUNNING]
+                # Jobs writing the same segment files must not run at once
+                busy_outputs = {job.output_key for job in running}
+                for job in self.jobs:
+                    if len(running) + len(started) >= self.max_concurrent:
+                        break
+                    if job.status == QUEUED and job.output_key not in busy_outputs:
+                        busy_outputs.add(job.output_key)
+                        job.status = RUNNING
+                        started.append(job)
+
+        for job in started:
+            self._notify(job)
+            thread = threading.Thread(target=self._run_job, args=(job,), daemon=True,
+                                      name=f"split-job-{job.job_id}")
+            thread.start()
+
+    def _run_job(self, job):
+        """Run one job (executed in its own thread)."""
+        # The splitter is created here so that it belongs to the thread using
+        # it; QObjects left behind by short-lived threads (such as the HTTP
+        # service's request threads) crash Qt when their thread exits
+        splitter = VideoSplitter(job.video_path, None, job.mode, job.workers, job.profile)
+        with self.condition:
+            job.splitter = splitter
+            if job.cancel_requested:
+                splitter.cancel()
+        result = {}
+
+        def progress_updated(current, total):
+            job.segments_done = current
+            self._notify(job)
+
+        def frame_progress(percent, fps, speed):
+            job.percent = percent
+            self._notify(job)
+
+        # Direct connections: this thread has no event loop, so queued
+        # deliveries to the handlers would never run
+        splitter.progress_updated.connect(progress_updated, Qt.DirectConnection)
+        splitter.frame_progress.connect(frame_progress, Qt.DirectConnection)
+        splitter.splitting_completed.connect(lambda: result.setdefault("status", COMPLETED),
+                                             Qt.DirectConnection)
+        splitter.splitting_cancelled.connect(lambda: result.setdefault("status", CANCELLED),
+                                             Qt.DirectConnection)
+        splitter.error_occurred.connect(lambda message: result.setdefault("error", message),
+                                        Qt.DirectConnection)
+
+        try:
+            splitter.set_output_dir(job.output_dir)
+            splitter.split_video(job.split_points)
+        except Exception as e:
+            result.setdefault("error", str(e))
+
+        with self.condition:
+            if "error" in result:
+                job.status = FAILED
+                job.error = result["error"]
+            else:
+                job.status = result.get("status", FAILED)
+            if job.status == COMPLETED:
+                job.percent = 100.0
+            job.splitter = None
+            self.condition.notify_all()
+        self._notify(job)
+        self._schedule()
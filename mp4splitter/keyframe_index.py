@@ -0,0 +1,143 @@
+"""
+Keyframe index for the MP4 Splitter application.
+
+Split points that land on keyframes can be cut without re-encoding, so the
+index is used to snap split points and by the smart-cut strategy.
+"""
+
+import bisect
+import threading
+from array import array
+from collections import OrderedDict
+
+from mp4splitter.cache import file_identity, get_cache
+from mp4splitter.ffmpeg_tools import scan_keyframes
+from mp4splitter.mp4 import MP4Error, parse_mp4
+
+# Number of indexes kept in memory
+INDEX_CACHE_SIZE = 16
+
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+
+# Locks of the indexes being built, by file identity
+_build_locks = {}
+
+
+class KeyframeIndex:
+    """
+    Sorted keyframe presentation times of a video.
+
+    Args:
+        times: Keyframe times in seconds, relative to the start of the video.
+    """
+    def __init__(self, times):
+        self.times = sorted(times)
+
+    def __len__(self):
+        return len(self.times)
+
+    @classmethod
+    def from_movie(cls, movie):
+        """Build the index from the sync sample and timing tables of an MP4."""
+        track = movie.video_track
+        if track is None:
+            return cls([])
+        samples = track.samples
+        sync = samples.sync_samples if samples.sync_samples is not None else range(len(samples))
+        cts = samples.cts_offsets
+        times = []
+        for index in sync:
+            pts = samples.dts[index] + (cts[index] if cts is not None else 0)
+            times.append(max(track.to_seconds(pts - track.media_time), 0.0))
+        return cls(times)
+
+    @classmethod
+    def build(cls, video_path):
+        """
+        Build the index for a file.
+
+        MP4 files are read from their sample tables; other files fall back to
+        an ffmpeg packet scan.
+        """
+        try:
+            return cls.from_movie(parse_mp4(video_path))
+        except (MP4Error, OSError):
+            return cls(scan_keyframes(video_path))
+
+    def at_or_after(self, time_sec, tolerance=0.0):
+        """Return the first keyframe at or after the given time, or None."""
+        i = bisect.bisect_left(self.times, time_sec - tolerance)
+        return self.times[i] if i < len(self.times) else None
+
+    def at_or_before(self, time_sec, tolerance=0.0):
+        """Return the last keyframe at or before the given time, or None."""
+        i = bisect.bisect_right(self.times, time_sec + tolerance)
+        return self.times[i - 1] if i > 0 else None
+
+    def nearest(self, time_sec):
+        """Return the keyframe closest to the given time, or None if there are none."""
+        candidates = [t for t in (self.at_or_before(time_sec), self.at_or_after(time_sec))
+                      if t is not None]
+        return min(candidates, key=lambda t: abs(t - time_sec)) if candidates else None
+
+    def nearest_ms(self, time_ms):
+        """Return the keyframe closest to a time in milliseconds, in milliseconds."""
+        nearest = self.nearest(time_ms / 1000)
+        return time_ms if nearest is None else int(round(nearest * 1000))
+
+
+def get_keyframe_index(video_path):
+    """
+    Return the keyframe index of a file, building it on first use.
+
+    Indexes are cached in memory and in the persistent metadata cache per
+    file identity, so reopening an unchanged file does not rescan it. Safe
+    to call from several threads; each index is built only once.
+    """
+    key = file_identity(video_path)
+    with _index_lock:
+        index = _cached_index(key)
+        if index is not None:
+            return index
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+
+    # Threads asking for the same file wait for the first one to build it
+    try:
+        with build_lock:
+            with _index_lock:
+                index = _cached_index(key)
+            if index is not None:
+                return index
+            index = _load_index(video_path)
+            with _index_lock:
+                _index_cache[key] = index
+                while len(_index_cache) > INDEX_CACHE_SIZE:
+                    _index_cache.popitem(last=False)
+            return index
+    finally:
+        with _index_lock:
+            if _build_locks.get(key) is build_lock:
+                del _build_locks[key]
+
+
+def _cached_index(key):
+    """Return an index from memory, marking it as used; call with ``_index_lock`` held."""
+    index = _index_cache.get(key)
+    if index is not None:
+        _index_cache.move_to_end(key)
+    return index
+
+
+def _load_index(video_path):
+    """Read an index from the metadata cache, or build and store it."""
+    cache = get_cache()
+    stored = cache.get("keyframes", video_path) if cache is not None else None
+    if stored is not None:
+        times = array("d")
+        times.frombytes(stored)
+        return KeyframeIndex(times)
+    index = KeyframeIndex.build(video_path)
+    if cache is not None:
+        cache.put("keyframes", video_path, array("d", index.times).tobytes())
+    return index
@@ -2,15 +2,32 @@
 Main window component for the MP4 Splitter application.
 """
 
+import functools
+import os
+
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                               QPushButton, QFileDialog, QLabel, QProgressBar,
-                              QMessageBox, QStatusBar, QSplitter)
+                              QMessageBox, QStatusBar, QSplitter, QComboBox,
+                              QSpinBox, QCheckBox, QInputDialog, QDialog)
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QIcon, QAction
 
 from mp4splitter.split_points_table import SplitPointsTable
 from mp4splitter.video_player import VideoPlayer
 from mp4splitter.video_splitter import VideoSplitter
+from mp4splitter.split_worker import SplitWorker
+from mp4splitter.job_queue import SplitJob
+from mp4splitter.queue_panel import QueuePanel
+from mp4splitter.split_strategies import STRATEGIES, DEFAULT_MODE, CopyStrategy
+from mp4splitter.encoder_profiles import PROFILES, DEFAULT_PROFILE
+from mp4splitter.split_planner import plan_by_size, plan_fixed_interval
+from mp4splitter.auto_split_dialog import AutoSplitDialog
+from mp4splitter.analysis_worker import AnalysisWorker
+from mp4splitter.scene_detector import DEFAULT_THRESHOLD
+from mp4splitter.scene_dialog import SceneDialog
+from mp4splitter.boundary_detector import BLACK, FREEZE, detect_boundaries
+from mp4splitter.silence_detector import DEFAULT_MIN_SILENCE_MS, DEFAULT_THRESHOLD_DB, detect_silences
+from mp4splitter.silence_dialog import SilenceDialog
 
 
 class MainWindow(QMainWindow):
@@ -30,7 +47,19 @@ class MainWindow(QMainWindow):
 
         # Initialize state
         self.current_video_path = None
+        self.current_video_info = None
         self.output_dir = None
+        self.split_worker = None
+        self.last_max_segment_mb = 100.0
+        self.analysis_worker = None
+        self.analysis_video_path = None
+        self.last_scene_threshold = DEFAULT_THRESHOLD
+        self.last_scene_detectors = (True, True, False)  # scenes, black slates, frozen frames
+        self.last_silence_threshold = DEFAULT_THRESHOLD_DB
+        self.last_min_silence_ms = DEFAULT_MIN_SILENCE_MS
+        self.silence_map_path = None  # video the silences were last looked for in
+        self.keyframe_index_error = None
+        self.pending_auto_split = None  # interval in ms of an auto split waiting for keyframes
 
     def setup_ui(self):
         """Set up the user interface."""
@@ -69,6 +98,50 @@ class MainWindow(QMainWindow):
         self.split_points_table = SplitPointsTable()
         right_layout.addWidget(self.split_points_table)
 
+        self.snap_keyframes_checkbox = QCheckBox("Snap split points to keyframes")
+        self.snap_keyframes_checkbox.setToolTip(
+            "Place new and edited split points on the nearest keyframe, "
+            "so segments can be stream copied without re-encoding"
+        )
+        self.snap_silences_checkbox = QCheckBox("Snap split points to silences")
+        self.snap_silences_checkbox.setToolTip(
+            "Move new and edited split points into a pause in the audio "
+            "if there is one within two seconds"
+        )
+        snap_layout = QHBoxLayout()
+        snap_layout.addWidget(self.snap_keyframes_checkbox)
+        snap_layout.addWidget(self.snap_silences_checkbox)
+        snap_layout.addStretch()
+        right_layout.addLayout(snap_layout)
+
+        auto_split_layout = QHBoxLayout()
+        auto_split_layout.addStretch()
+        self.auto_split_btn = QPushButton("Auto Split...")
+        self.auto_split_btn.setEnabled(False)
+        self.auto_split_btn.setToolTip(
+            "Replace the split points with segments of a fixed number of seconds or frames"
+        )
+        auto_split_layout.addWidget(self.auto_split_btn)
+        self.detect_scenes_btn = QPushButton("Detect Scenes...")
+        self.detect_scenes_btn.setEnabled(False)
+        self.detect_scenes_btn.setToolTip(
+            "Replace the split points with one segment per scene, found by analyzing the video"
+        )
+        auto_split_layout.addWidget(self.detect_scenes_btn)
+        self.detect_silences_btn = QPushButton("Detect Silences...")
+        self.detect_silences_btn.setEnabled(False)
+        self.detect_silences_btn.setToolTip(
+            "Replace the split points with cuts in the pauses of the audio"
+        )
+        auto_split_layout.addWidget(self.detect_silences_btn)
+        self.split_by_size_btn = QPushButton("Split by Size...")
+        self.split_by_size_btn.setEnabled(False)
+        self.split_by_size_btn.setToolTip(
+            "Replace the split points with stream copy segments that each stay under a file size"
+        )
+        auto_split_layout.addWidget(self.split_by_size_btn)
+        right_layout.addLayout(auto_split_layout)
+
         # Output directory selection
         output_layout = QHBoxLayout()
         output_layout.addWidget(QLabel("Output directory:"))
@@ -83,14 +156,44 @@ class MainWindow(QMainWindow):
         self.progress_bar.setVisible(False)
         right_layout.addWidget(self.progress_bar)
 
-        # Start splitting button
+        # Split mode selection and start splitting button
         split_btn_layout = QHBoxLayout()
+        split_btn_layout.addWidget(QLabel("Mode:"))
+        self.mode_combo = QComboBox()
+        for name, strategy in STRATEGIES.items():
+            self.mode_combo.addItem(strategy.label, name)
+        self.mode_combo.setCurrentIndex(self.mode_combo.findData(DEFAULT_MODE))
+        split_btn_layout.addWidget(self.mode_combo)
+        split_btn_layout.addWidget(QLabel("Quality:"))
+        self.profile_combo = QComboBox()
+        for name, profile in PROFILES.items():
+            self.profile_combo.addItem(profile.label, name)
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData(DEFAULT_PROFILE))
+        self.profile_combo.setToolTip("Encoder profile used by the re-encoding modes")
+        split_btn_layout.addWidget(self.profile_combo)
+        split_btn_layout.addWidget(QLabel("Workers:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, os.cpu_count() or 1)
+        self.workers_spin.setValue(1)
+        self.workers_spin.setToolTip("Number of segments written in parallel")
+        split_btn_layout.addWidget(self.workers_spin)
         split_btn_layout.addStretch()
         self.start_splitting_btn = QPushButton("Start Splitting")
         self.start_splitting_btn.setEnabled(False)
         split_btn_layout.addWidget(self.start_splitting_btn)
+        self.cancel_splitting_btn = QPushButton("Cancel")
+        self.cancel_splitting_btn.setVisible(False)
+        split_btn_layout.addWidget(self.cancel_splitting_btn)
+        self.add_to_queue_btn = QPushButton("Add to Queue")
+        self.add_to_queue_btn.setEnabled(False)
+        self.add_to_queue_btn.setToolTip("Split this video later as part of the batch job queue")
+        split_btn_layout.addWidget(self.add_to_queue_btn)
         right_layout.addLayout(split_btn_layout)
 
+        # Batch job queue
+        self.queue_panel = QueuePanel()
+        right_layout.addWidget(self.queue_panel)
+
         # Add panels to splitter
         splitter.addWidget(left_panel)
         splitter.addWidget(right_panel)
@@ -115,14 +218,25 @@ class MainWindow(QMainWindow):
         self.open_btn.clicked.connect(self.open_video)
         self.select_output_btn.clicked.connect(self.select_output_directory)
         self.start_splitting_btn.clicked.connect(self.start_splitting)
+        self.cancel_splitting_btn.clicked.connect(self.cancel_splitting)
+        self.add_to_queue_btn.clicked.connect(self.add_to_queue)
+        self.auto_split_btn.clicked.connect(self.auto_split)
+        self.detect_scenes_btn.clicked.connect(self.detect_scenes)
+        self.detect_silences_btn.clicked.connect(self.detect_silences)
+        self.split_by_size_btn.clicked.connect(self.split_by_size)
+        self.snap_keyframes_checkbox.toggled.connect(self.toggle_keyframe_snapping)
+        self.snap_silences_checkbox.toggled.connect(self.toggle_silence_snapping)
+        self.mode_combo.currentIndexChanged.connect(self.update_profile_combo_state)
 
         # Connect video player's add split point signal
         self.video_player.add_split_point_signal.connect(self.split_points_table.add_split_point)
 
-        # Connect video splitter signals
-        self.video_splitter.progress_updated.connect(self.update_progress)
-        self.video_splitter.segment_started.connect(self.segment_started)
-        self.video_splitter.splitting_completed.connect(self.splitting_completed)
+        # The player reads the keyframe index of every video in the background
+        thumbnail_loader = self.video_player.thumbnail_loader
+        thumbnail_loader.index_ready.connect(self.keyframe_index_loaded)
+        thumbnail_loader.index_failed.connect(self.keyframe_index_failed)
+
+        # Errors while reading video info; split jobs are connected per worker
         self.video_splitter.error_occurred.connect(self.show_error)
 
     def setup_menu(self):
@@ -165,21 +279,277 @@ class MainWindow(QMainWindow):
 
             # Update video info
             video_info = self.video_splitter.get_video_info()
+            self.current_video_info = video_info
             if video_info:
                 duration_str = self.format_time(video_info["duration"])
                 resolution = f"{video_info['width']}x{video_info['height']}"
                 self.video_info_label.setText(
-                    f"{video_info['filename']} ({resolution}, {duration_str})"
+                    f"{video_info['filename']} ({resolution}, {video_info['video_codec']}, "
+                    f"{duration_str})"
                 )
+                self.video_info_label.setToolTip(self.format_video_details(video_info))
 
             # Clear existing split points
-            self.split_points_table.split_points = []
-            self.split_points_table.update_table()
+            self.split_points_table.set_keyframe_index(None)
+            self.split_points_table.set_silence_map(None)
+            self.split_points_table.set_split_points([])
+            self.keyframe_index_error = None
+            self.pending_auto_split = None
+
+            self.cancel_analysis()
+            if self.analysis_worker is None:
+                self.detect_scenes_btn.setEnabled(True)
+                self.detect_silences_btn.setEnabled(True)
+            if self.snap_silences_checkbox.isChecked():
+                self.load_silence_map()
+            self.auto_split_btn.setEnabled(video_info is not None)
+            self.split_by_size_btn.setEnabled(True)
 
             # Update status
             self.status_bar.showMessage(f"Loaded video: {file_path}")
             self.update_splitting_button_state()
 
+    def toggle_keyframe_snapping(self, enabled):
+        """Turn snapping of split points to keyframes on or off."""
+        self.split_points_table.set_snap_to_keyframes(enabled)
+        if not enabled or not self.current_video_path:
+            return
+        if self.keyframe_index_error is not None:
+            self.show_error(f"Error reading keyframes: {self.keyframe_index_error}")
+        elif self.split_points_table.keyframe_index is None:
+            # Snapping starts once the player has read the index
+            self.status_bar.showMessage("Reading keyframes...")
+
+    def keyframe_index_loaded(self, keyframe_index):
+        """Use the keyframe index of the current video once it has been read."""
+        self.split_points_table.set_keyframe_index(keyframe_index)
+        if self.pending_auto_split is not None:
+            interval_ms, self.pending_auto_split = self.pending_auto_split, None
+            self.apply_auto_split(interval_ms, keyframe_index)
+        elif self.snap_keyframes_checkbox.isChecked():
+            self.status_bar.showMessage(f"Keyframe index loaded: {len(keyframe_index)} keyframes")
+
+    def keyframe_index_failed(self, error_message):
+        """Report a keyframe index that cannot be read if something waits for it."""
+        self.keyframe_index_error = error_message
+        if self.snap_keyframes_checkbox.isChecked() or self.pending_auto_split is not None:
+            self.pending_auto_split = None
+            self.show_error(f"Error reading keyframes: {error_message}")
+
+    def auto_split(self):
+        """Replace the split points with segments of a fixed length."""
+        if not self.current_video_path or not self.current_video_info:
+            return
+        duration = self.current_video_info["duration"]
+        dialog = AutoSplitDialog(duration, self.current_video_info["fps"], self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+
+        keyframe_index = None
+        if dialog.align_to_keyframes():
+            keyframe_index = self.split_points_table.keyframe_index
+            if self.keyframe_index_error is not None:
+                self.show_error(f"Error reading keyframes: {self.keyframe_index_error}")
+                return
+            if keyframe_index is None:
+                # Finished by keyframe_index_loaded
+                self.pending_auto_split = dialog.interval_ms()
+                self.status_bar.showMessage("Reading keyframes...")
+                return
+        self.apply_auto_split(dialog.interval_ms(), keyframe_index)
+
+    def apply_auto_split(self, interval_ms, keyframe_index):
+        """Replace the split points with fixed-length segments, aligned if an index is given."""
+        split_points = plan_fixed_interval(self.current_video_info["duration"], interval_ms,
+                                           keyframe_index)
+        self.split_points_table.set_split_points(split_points)
+        self.update_splitting_button_state()
+        self.status_bar.showMessage(f"Created {len(split_points)} segments")
+
+    def detect_scenes(self):
+        """Analyze the video in the background and propose a split point per scene or slate."""
+        if self.analysis_worker is not None:
+            # The button cancels a running detection
+            self.cancel_analysis()
+            return
+        if not self.current_video_path:
+            return
+        dialog = SceneDialog(self.last_scene_threshold, *self.last_scene_detectors, parent=self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        self.last_scene_threshold = dialog.threshold_spin.value()
+        self.last_scene_detectors = (dialog.scenes(), dialog.black(), dialog.freeze())
+        # Every selected detector runs on the same decode of the video
+        self.start_analysis(
+            "Scene detection", self.detect_scenes_btn,
+            functools.partial(detect_boundaries, self.current_video_path, dialog.threshold(),
+                              dialog.black(), dialog.freeze()),
+            self.scenes_detected
+        )
+
+    def detect_silences(self):
+        """Analyze the audio in the background and propose a split point per silence."""
+        if self.analysis_worker is not None:
+            self.cancel_analysis()
+            return
+        if not self.current_video_path:
+            return
+        dialog = SilenceDialog(self.last_silence_threshold, self.last_min_silence_ms, self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        self.last_silence_threshold = dialog.threshold_db()
+        self.last_min_silence_ms = dialog.min_silence_ms()
+        self.start_analysis(
+            "Silence detection", self.detect_silences_btn,
+            functools.partial(detect_silences, self.current_video_path,
+                              self.last_silence_threshold, self.last_min_silence_ms),
+            self.silences_detected
+        )
+
+    def toggle_silence_snapping(self, enabled):
+        """Turn snapping of split points to silences on or off."""
+        self.split_points_table.set_snap_to_silences(enabled)
+        if enabled and self.split_points_table.silence_map is None:
+            self.load_silence_map()
+
+    def load_silence_map(self):
+        """Find the silences of the current video in the background for snapping."""
+        if not self.current_video_path or self.analysis_worker is not None:
+            # A running analysis loads the silences when it finishes
+            return
+        self.silence_map_path = self.current_video_path
+        self.start_analysis(
+            "Silence detection", self.detect_silences_btn,
+            functools.partial(detect_silences, self.current_video_path,
+                              self.last_silence_threshold, self.last_min_silence_ms),
+            self.silence_map_loaded
+        )
+
+    def start_analysis(self, name, button, analysis, completed):
+        """
+        Run an analysis of the current video on a background thread.
+
+        Args:
+            name: Name of the analysis shown in the status bar.
+            button: Button that started the analysis; it cancels it while running.
+            analysis: Callable taking ``cancel_event`` and ``progress_callback``.
+            completed: Slot receiving the result of the analysis.
+        """
+        self.analysis_name = name
+        self.analysis_button = button
+        self.analysis_button_text = button.text()
+        self.analysis_video_path = self.current_video_path
+        self.analysis_worker = AnalysisWorker(analysis, parent=self)
+        self.analysis_worker.progress_updated.connect(self.update_analysis_progress, Qt.QueuedConnection)
+        self.analysis_worker.analysis_completed.connect(completed, Qt.QueuedConnection)
+        self.analysis_worker.analysis_cancelled.connect(self.analysis_cancelled, Qt.QueuedConnection)
+        self.analysis_worker.error_occurred.connect(self.analysis_failed, Qt.QueuedConnection)
+        self.analysis_worker.finished.connect(self.analysis_worker_finished)
+
+        # Only one analysis runs at a time; its own button cancels it
+        for analysis_button in (self.detect_scenes_btn, self.detect_silences_btn):
+            analysis_button.setEnabled(analysis_button is button)
+        button.setText("Cancel")
+        self.status_bar.showMessage(f"{name}...")
+        self.analysis_worker.start()
+
+    def cancel_analysis(self):
+        """Ask a running analysis to stop; its results are discarded."""
+        if self.analysis_worker is not None:
+            self.analysis_worker.cancel()
+            self.analysis_video_path = None
+
+    def update_analysis_progress(self, percent, speed):
+        """Show the progress of the running analysis in the status bar."""
+        if self.analysis_worker is not None and not self.analysis_worker.cancel_event.is_set():
+            self.status_bar.showMessage(f"{self.analysis_name}... {percent:.0f}% ({speed:.1f}x)")
+
+    def scenes_detected(self, segmentation):
+        """Replace the split points with the detected scenes and slates."""
+        if self.analysis_video_path != self.current_video_path:
+            return
+        split_points = segmentation.split_points()
+        self.split_points_table.set_split_points(split_points)
+        self.update_splitting_button_state()
+        self.status_bar.showMessage(
+            f"Found {len(segmentation.scene_cuts)} scene changes, "
+            f"{segmentation.count(BLACK)} black slates and {segmentation.count(FREEZE)} freezes "
+            f"({len(split_points)} segments)"
+        )
+
+    def silences_detected(self, silence_map):
+        """Replace the split points with cuts in the detected silences."""
+        if self.analysis_video_path != self.current_video_path:
+            return
+        self.split_points_table.set_silence_map(silence_map)
+        split_points = silence_map.split_points()
+        self.split_points_table.set_split_points(split_points)
+        self.update_splitting_button_state()
+        self.status_bar.showMessage(
+            f"Found {len(silence_map)} silences ({len(split_points)} segments)"
+        )
+
+    def silence_map_loaded(self, silence_map):
+        """Use the detected silences for snapping new split points."""
+        if self.analysis_video_path != self.current_video_path:
+            return
+        self.split_points_table.set_silence_map(silence_map)
+        self.status_bar.showMessage(f"Silences found for snapping: {len(silence_map)}")
+
+    def analysis_cancelled(self):
+        """Handle an analysis that was stopped."""
+        self.status_bar.showMessage(f"{self.analysis_name} cancelled")
+
+    def analysis_failed(self, error_message):
+        """Handle an analysis that stopped with an error."""
+        self.show_error(f"{self.analysis_name} failed: {error_message}")
+
+    def analysis_worker_finished(self):
+        """Release the finished analysis worker."""
+        if self.analysis_worker is not None:
+            self.analysis_worker.deleteLater()
+            self.analysis_worker = None
+        self.analysis_button.setText(self.analysis_button_text)
+        video_loaded = self.current_video_path is not None
+        self.detect_scenes_btn.setEnabled(video_loaded)
+        self.detect_silences_btn.setEnabled(video_loaded)
+        # Snapping was turned on or a new video loaded while another analysis ran
+        if (self.snap_silences_checkbox.isChecked() and
+                self.split_points_table.silence_map is None and
+                self.silence_map_path != self.current_video_path):
+            self.load_silence_map()
+
+    def split_by_size(self):
+        """Replace the split points with segments that stay under a chosen file size."""
+        if not self.current_video_path:
+            return
+        max_mb, ok = QInputDialog.getDouble(
+            self, "Split by Size", "Maximum segment size (MB):",
+            self.last_max_segment_mb, 0.1, 1000000, 1
+        )
+        if not ok:
+            return
+        self.last_max_segment_mb = max_mb
+
+        try:
+            split_points = plan_by_size(self.current_video_path, int(max_mb * 1024 * 1024))
+        except Exception as e:
+            self.show_error(f"Error planning segments: {str(e)}")
+            return
+
+        self.split_points_table.set_split_points(split_points)
+        # The plan is only valid for stream copy; re-encoding changes the sizes
+        self.mode_combo.setCurrentIndex(self.mode_combo.findData(CopyStrategy.name))
+        self.update_splitting_button_state()
+        self.status_bar.showMessage(
+            f"Planned {len(split_points)} stream copy segments of at most {max_mb:g} MB"
+        )
+
+    def update_profile_combo_state(self):
+        """Only offer encoder profiles for modes that re-encode."""
+        strategy = STRATEGIES[self.mode_combo.currentData()]
+        self.profile_combo.setEnabled(strategy.reencodes)
+
     def select_output_directory(self):
         """Select output directory for split files."""
         output_dir = QFileDialog.getExistingDirectory(
@@ -206,21 +576,82 @@ class MainWindow(QMainWindow):
             )
             return
 
+        if self.split_worker is not None:
+            return
+
+        # Run the job on a background thread so the window stays responsive
+        self.split_worker = SplitWorker(
+            self.current_video_path,
+            self.output_dir,
+            selected_points,
+            mode=self.mode_combo.currentData(),
+            workers=self.workers_spin.value(),
+            profile=self.profile_combo.currentData(),
+            parent=self
+        )
+        splitter = self.split_worker.splitter
+        splitter.progress_updated.connect(self.update_progress, Qt.QueuedConnection)
+        splitter.frame_progress.connect(self.update_frame_progress, Qt.QueuedConnection)
+        splitter.segment_started.connect(self.segment_started, Qt.QueuedConnection)
+        splitter.splitting_completed.connect(self.splitting_completed, Qt.QueuedConnection)
+        splitter.splitting_cancelled.connect(self.splitting_cancelled, Qt.QueuedConnection)
+        splitter.error_occurred.connect(self.splitting_failed, Qt.QueuedConnection)
+        self.split_worker.finished.connect(self.split_worker_finished)
+
         # Prepare UI for splitting
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
         self.start_splitting_btn.setEnabled(False)
-        self.open_btn.setEnabled(False)
-        self.select_output_btn.setEnabled(False)
+        self.cancel_splitting_btn.setEnabled(True)
+        self.cancel_splitting_btn.setVisible(True)
 
         # Start splitting
         self.status_bar.showMessage("Splitting video...")
-        self.video_splitter.split_video(selected_points)
+        self.split_worker.start()
+
+    def add_to_queue(self):
+        """Queue the current video and its selected split points as a batch job."""
+        if not self.current_video_path or not self.output_dir:
+            return
+
+        selected_points = self.split_points_table.get_selected_points()
+        if not selected_points:
+            QMessageBox.warning(
+                self,
+                "No Split Points Selected",
+                "Please select at least one split point to proceed."
+            )
+            return
+
+        self.queue_panel.add_job(SplitJob(
+            self.current_video_path,
+            self.output_dir,
+            selected_points,
+            mode=self.mode_combo.currentData(),
+            profile=self.profile_combo.currentData(),
+            workers=self.workers_spin.value()
+        ))
+        self.status_bar.showMessage(
+            f"Queued {os.path.basename(self.current_video_path)} for splitting"
+        )
+
+    def cancel_splitting(self):
+        """Ask the running split job to stop."""
+        if self.split_worker is not None:
+            self.split_worker.cancel()
+            self.cancel_splitting_btn.setEnabled(False)
+            self.status_bar.showMessage("Cancelling...")
 
     def update_progress(self, current, total):
-        """Update the progress bar."""
-        progress_percent = int((current / total) * 100) if total > 0 else 0
-        self.progress_bar.setValue(progress_percent)
+        """Show how many segments have been written."""
+        self.progress_bar.setFormat(f"%p% ({current}/{total} segments)")
+
+    def update_frame_progress(self, percent, fps, speed):
+        """Update the progress bar from per-frame encoder progress."""
+        self.progress_bar.setValue(int(percent))
+        if speed > 0:
+            self.status_bar.showMessage(f"Splitting video... {fps:.0f} fps ({speed:.1f}x)")
 
     def segment_started(self, segment_num, filename):
         """Update status when a new segment starts processing."""
@@ -229,30 +660,42 @@ class MainWindow(QMainWindow):
     def splitting_completed(self):
         """Handle completion of the splitting process."""
         self.status_bar.showMessage("Splitting completed successfully")
+        segment_count = self.split_worker.segment_count if self.split_worker else 0
 
         # Reset UI
         self.progress_bar.setVisible(False)
-        self.start_splitting_btn.setEnabled(True)
-        self.open_btn.setEnabled(True)
-        self.select_output_btn.setEnabled(True)
+        self.cancel_splitting_btn.setVisible(False)
 
         # Show success message
         QMessageBox.information(
             self,
             "Splitting Completed",
-            f"Video has been successfully split into {len(self.split_points_table.get_selected_points())} segments."
+            f"Video has been successfully split into {segment_count} segments."
         )
 
+    def splitting_cancelled(self):
+        """Handle a split job that was stopped by the user."""
+        self.status_bar.showMessage("Splitting cancelled")
+        self.progress_bar.setVisible(False)
+        self.cancel_splitting_btn.setVisible(False)
+
+    def splitting_failed(self, error_message):
+        """Handle a split job that stopped with an error."""
+        self.progress_bar.setVisible(False)
+        self.cancel_splitting_btn.setVisible(False)
+        self.show_error(error_message)
+
+    def split_worker_finished(self):
+        """Release the finished split worker and allow a new job to start."""
+        if self.split_worker is not None:
+            self.split_worker.deleteLater()
+            self.split_worker = None
+        self.update_splitting_button_state()
+
     def show_error(self, error_message):
         """Display error message."""
         self.status_bar.showMessage(f"Error: {error_message}")
 
-        # Reset UI
-        self.progress_bar.setVisible(False)
-        self.start_splitting_btn.setEnabled(True)
-        self.open_btn.setEnabled(True)
-        self.select_output_btn.setEnabled(True)
-
         # Show error message
         QMessageBox.critical(
             self,
@@ -260,6 +703,18 @@ class MainWindow(QMainWindow):
             f"An error occurred: {error_message}"
         )
 
+    def closeEvent(self, event):
+        """Stop running split jobs and analyses before the window closes."""
+        if self.split_worker is not None:
+            self.split_worker.cancel()
+            self.split_worker.wait()
+        if self.analysis_worker is not None:
+            self.analysis_worker.cancel()
+            self.analysis_worker.wait()
+        self.queue_panel.shutdown()
+        self.video_player.shutdown()
+        super().closeEvent(event)
+
     def show_about(self):
         """Show about dialog."""
         QMessageBox.about(
@@ -271,12 +726,31 @@ class MainWindow(QMainWindow):
         )
 
     def update_splitting_button_state(self):
-        """Update the state of the start splitting button."""
-        self.start_splitting_btn.setEnabled(
+        """Update the state of the start splitting and add to queue buttons."""
+        can_split = (
             self.current_video_path is not None and
             self.output_dir is not None and
             len(self.split_points_table.split_points) > 0
         )
+        self.start_splitting_btn.setEnabled(self.split_worker is None and can_split)
+        self.add_to_queue_btn.setEnabled(can_split)
+
+    def format_video_details(self, video_info):
+        """Describe the streams of a video for the info label tooltip."""
+        lines = [f"Video: {video_info['video_codec']}, {video_info['width']}x{video_info['height']}, "
+                 f"{video_info['fps']:.3f} fps"]
+        if video_info["video_bitrate"]:
+            lines.append(f"Video bitrate: {video_info['video_bitrate']} kb/s")
+        if video_info["keyframes"] is not None:
+            lines.append(f"Keyframes: {video_info['keyframes']}")
+        if video_info["audio_codec"]:
+            lines.append(f"Audio: {video_info['audio_codec']}, {video_info['audio_sample_rate']} Hz, "
+                         f"{video_info['audio_channel_layout']}")
+        else:
+            lines.append("Audio: none")
+        if video_info["bitrate"]:
+            lines.append(f"Overall bitrate: {video_info['bitrate']} kb/s")
+        return "\n".join(lines)
 
     def format_time(self, ms):
         """Format milliseconds into HH:MM:SS.mmm string."""
@@ -0,0 +1,11 @@
+"""
+Pure-Python MP4 parsing and remuxing for the MP4 Splitter application.
+"""
+
+from mp4splitter.mp4.boxes import MP4Error
+from mp4splitter.mp4.movie import Movie, Track, parse_mp4
+from mp4splitter.mp4.probe import MovieSummary, probe_mp4
+from mp4splitter.mp4.remux import remux_segment
+
+__all__ = ["MP4Error", "Movie", "MovieSummary", "Track", "parse_mp4", "probe_mp4",
+           "remux_segment"]
@@ -0,0 +1,141 @@
+"""
+ISO base media (MP4) box reading and writing helpers.
+"""
+
+import struct
+
+# Boxes whose payload is a plain list of child boxes
+CONTAINER_BOXES = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"edts", b"dinf", b"udta"}
+
+
+class MP4Error(Exception):
+    """Raised when a file cannot be parsed or remuxed as an MP4."""
+
+
+class Box:
+    """
+    A box located inside a bytes buffer.
+
+    Args:
+        box_type: Four-character type as bytes, e.g. ``b"moov"``.
+        data: Buffer holding the box.
+        start: Offset of the box header in ``data``.
+        payload_start: Offset of the box payload in ``data``.
+        end: Offset just past the end of the box in ``data``.
+    """
+    def __init__(self, box_type, data, start, payload_start, end):
+        self.type = box_type
+        self.data = data
+        self.start = start
+        self.payload_start = payload_start
+        self.end = end
+
+    @property
+    def raw(self):
+        """The complete box, header included."""
+        return bytes(self.data[self.start:self.end])
+
+    @property
+    def payload(self):
+        """The box payload, without the header."""
+        return bytes(self.data[self.payload_start:self.end])
+
+    @property
+    def version(self):
+        """Version byte of a full box."""
+        return self.data[self.payload_start]
+
+    def children(self):
+        """Iterate over the child boxes of a container box."""
+        return iter_boxes(self.data, self.payload_start, self.end)
+
+    def find(self, *path):
+        """
+        Return the first descendant matching a path of box types, or None.
+
+        Example: ``moov.find(b"trak", b"mdia", b"mdhd")``.
+        """
+        box = self
+        for box_type in path:
+            box = next((child for child in box.children() if child.type == box_type), None)
+            if box is None:
+                return None
+        return box
+
+    def find_all(self, box_type):
+        """Return all direct children of the given type."""
+        return [child for child in self.children() if child.type == box_type]
+
+    def __repr__(self):
+        return f"Box({self.type.decode('latin-1')}, size={self.end - self.start})"
+
+
+def parse_box_header(header, offset, limit):
+    """
+    Decode a box header.
+
+    Args:
+        header: At least 16 bytes starting at the box (fewer at end of data).
+        offset: Absolute offset of the box.
+        limit: Absolute offset where the enclosing space ends; used for
+            boxes that declare a size of 0 ("to the end").
+
+    Returns:
+        tuple: ``(box_type, header_size, end)``.
+    """
+    if len(header) < 8:
+        raise MP4Error(f"Truncated box header at offset {offset}")
+    size, box_type = struct.unpack(">I4s", header[:8])
+    header_size = 8
+    if size == 1:
+        if len(header) < 16:
+            raise MP4Error(f"Truncated box header at offset {offset}")
+        size = struct.unpack(">Q", header[8:16])[0]
+        header_size = 16
+    elif size == 0:
+        size = limit - offset
+    if size < header_size or offset + size > limit:
+        raise MP4Error(f"Invalid size for box {box_type!r} at offset {offset}")
+    return box_type, header_size, offset + size
+
+
+def iter_boxes(data, start=0, end=None):
+    """Iterate over the boxes stored back to back in ``data[start:end]``."""
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        box_type, header_size, box_end = parse_box_header(data[offset:offset + 16], offset, end)
+        yield Box(box_type, data, offset, offset + header_size, box_end)
+        offset = box_end
+
+
+def read_top_level_boxes(f):
+    """
+    List the top-level boxes of an open file without reading their payloads.
+
+    Returns:
+        list: ``(box_type, offset, header_size, end)`` tuples.
+    """
+    f.seek(0, 2)
+    file_size = f.tell()
+    boxes = []
+    offset = 0
+    while offset + 8 <= file_size:
+        f.seek(offset)
+        box_type, header_size, end = parse_box_header(f.read(16), offset, file_size)
+        boxes.append((box_type, offset, header_size, end))
+        offset = end
+    return boxes
+
+
+def build_box(box_type, payload):
+    """Serialize a box from its type and payload."""
+    size = 8 + len(payload)
+    if size > 0xFFFFFFFF:
+        return struct.pack(">I4sQ", 1, box_type, size + 8) + payload
+    return struct.pack(">I4s", size, box_type) + payload
+
+
+def build_full_box(box_type, version, flags, payload):
+    """Serialize a full box (one with a version and flags) from its payload."""
+    return build_box(box_type, struct.pack(">I", (version << 24) | flags) + payload)
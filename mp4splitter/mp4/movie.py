@@ -0,0 +1,184 @@
+"""
+MP4 movie structure parsing for the MP4 remuxer.
+"""
+
+import struct
+
+from mp4splitter.mp4.boxes import MP4Error, iter_boxes, read_top_level_boxes
+from mp4splitter.mp4.sample_table import SampleTable
+
+
+def read_header_boxes(path):
+    """
+    Read the ``ftyp`` and ``moov`` boxes of an MP4 file, skipping the media data.
+
+    Returns:
+        tuple: ``(ftyp, moov)``: the raw ``ftyp`` box (empty if missing) and
+        the parsed ``moov`` box.
+
+    Raises:
+        MP4Error: If the file has no ``moov`` box or is fragmented.
+    """
+    ftyp = b""
+    with open(path, "rb") as f:
+        top_level = read_top_level_boxes(f)
+        types = [box[0] for box in top_level]
+        if b"moov" not in types:
+            raise MP4Error("No moov box found; not an MP4 file")
+        if b"moof" in types:
+            raise MP4Error("Fragmented MP4 files are not supported")
+
+        for box_type, offset, header_size, end in top_level:
+            if box_type in (b"ftyp", b"moov"):
+                f.seek(offset)
+                data = f.read(end - offset)
+                if box_type == b"ftyp":
+                    ftyp = data
+                else:
+                    moov = next(iter_boxes(data))
+    return ftyp, moov
+
+
+class Track:
+    """
+    One track of an MP4 movie, with its sample table expanded.
+
+    Attributes:
+        track_id: Track ID from ``tkhd``.
+        handler: Handler type, e.g. ``b"vide"`` or ``b"soun"``.
+        codec: Four-character code of the first sample description.
+        timescale: Media timescale (units per second).
+        duration: Media duration in timescale units.
+        media_time: Media time where presentation starts, from the edit list.
+        width, height: Presentation size from ``tkhd`` (0 for audio).
+        tkhd, mdhd: The header boxes, patched when remuxing.
+        hdlr: The raw ``hdlr`` box.
+        minf_boxes: Raw children of ``minf`` other than ``stbl``.
+        samples: The expanded ``SampleTable``.
+    """
+    def __init__(self, trak):
+        tkhd = trak.find(b"tkhd")
+        mdhd = trak.find(b"mdia", b"mdhd")
+        hdlr = trak.find(b"mdia", b"hdlr")
+        minf = trak.find(b"mdia", b"minf")
+        stbl = minf.find(b"stbl") if minf is not None else None
+        if tkhd is None or mdhd is None or hdlr is None or stbl is None:
+            raise MP4Error("Track is missing tkhd, mdhd, hdlr or stbl")
+
+        self.tkhd = tkhd
+        self.mdhd = mdhd
+        self.hdlr = hdlr.raw
+        self.minf_boxes = [child.raw for child in minf.children() if child.type != b"stbl"]
+
+        tkhd_payload = tkhd.payload
+        if tkhd.version == 1:
+            self.track_id = struct.unpack(">I", tkhd_payload[20:24])[0]
+        else:
+            self.track_id = struct.unpack(">I", tkhd_payload[12:16])[0]
+        width, height = struct.unpack(">II", tkhd_payload[-8:])
+        self.width = width >> 16
+        self.height = height >> 16
+
+        mdhd_payload = mdhd.payload
+        if mdhd.version == 1:
+            self.timescale, self.duration = struct.unpack(">IQ", mdhd_payload[20:32])
+        else:
+            self.timescale, self.duration = struct.unpack(">II", mdhd_payload[12:20])
+        if not self.timescale:
+            raise MP4Error("Track has a zero timescale")
+
+        self.handler = hdlr.payload[8:12]
+        self.media_time = self._parse_media_time(trak.find(b"edts", b"elst"))
+        self.samples = SampleTable.from_box(stbl)
+
+        stsd = self.samples.stsd
+        self.codec = stsd[20:24].decode("latin-1") if len(stsd) >= 24 else ""
+
+    @staticmethod
+    def _parse_media_time(elst):
+        """Return the media time of the first non-empty edit, or 0."""
+        if elst is None:
+            return 0
+        payload = elst.payload
+        count = struct.unpack(">I", payload[4:8])[0]
+        entry_format, entry_size = (">Qq", 16) if elst.version == 1 else (">Ii", 8)
+        for i in range(count):
+            offset = 8 + i * (entry_size + 4)
+            _, media_time = struct.unpack(entry_format, payload[offset:offset + entry_size])
+            if media_time != -1:
+                return media_time
+        return 0
+
+    @property
+    def is_video(self):
+        return self.handler == b"vide"
+
+    @property
+    def is_audio(self):
+        return self.handler == b"soun"
+
+    def to_seconds(self, media_units):
+        """Convert a time in media timescale units to seconds."""
+        return media_units / self.timescale
+
+
+class Movie:
+    """
+    A parsed MP4 file: its ``ftyp``, movie header and tracks.
+
+    Sample data is not read; tracks reference it by absolute file offset.
+
+    Attributes:
+        path: Path of the source file.
+        ftyp: The raw ``ftyp`` box.
+        mvhd: The movie header box.
+        timescale: Movie timescale (units per second).
+        duration: Movie duration in movie timescale units.
+        tracks: List of ``Track`` objects.
+        udta: The raw ``moov/udta`` box, or None.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.udta = None
+        self.tracks = []
+
+        self.ftyp, moov = read_header_boxes(path)
+        self.mvhd = moov.find(b"mvhd")
+        if self.mvhd is None:
+            raise MP4Error("Movie header (mvhd) not found")
+        payload = self.mvhd.payload
+        if self.mvhd.version == 1:
+            self.timescale, self.duration = struct.unpack(">IQ", payload[20:32])
+        else:
+            self.timescale, self.duration = struct.unpack(">II", payload[12:20])
+
+        for child in moov.children():
+            if child.type == b"trak":
+                self.tracks.append(Track(child))
+            elif child.type == b"udta":
+                self.udta = child.raw
+
+    @property
+    def video_track(self):
+        """The first video track, or None."""
+        return next((track for track in self.tracks if track.is_video), None)
+
+    @property
+    def audio_tracks(self):
+        """All audio tracks."""
+        return [track for track in self.tracks if track.is_audio]
+
+    @property
+    def duration_seconds(self):
+        """Movie duration in seconds."""
+        return self.duration / self.timescale if self.timescale else 0
+
+
+def parse_mp4(path):
+    """
+    Parse the structure of an MP4 file.
+
+    Raises:
+        MP4Error: If the file is not a (non-fragmented) MP4 file.
+    """
+    return Movie(path)
@@ -0,0 +1,148 @@
+"""
+Fast MP4 metadata probing.
+
+Only the headers and the entry counts of the sample tables are read, so
+probing costs the same for a short clip and a file of many gigabytes.
+"""
+
+import struct
+
+from mp4splitter.mp4.boxes import MP4Error
+from mp4splitter.mp4.movie import read_header_boxes
+from mp4splitter.mp4.sample_table import read_array
+
+# Sample entry codes mapped to the codec names ffmpeg reports
+CODEC_NAMES = {
+    "avc1": "h264",
+    "avc3": "h264",
+    "hvc1": "hevc",
+    "hev1": "hevc",
+    "av01": "av1",
+    "vp09": "vp9",
+    "mp4v": "mpeg4",
+    "mp4a": "aac",
+    ".mp3": "mp3",
+    "ac-3": "ac3",
+    "ec-3": "eac3",
+    "Opus": "opus",
+    "fLaC": "flac",
+    "alac": "alac",
+}
+
+CHANNEL_LAYOUTS = {1: "mono", 2: "stereo", 6: "5.1", 8: "7.1"}
+
+
+class TrackSummary:
+    """
+    Header-level description of one track.
+
+    Attributes:
+        handler: Handler type, e.g. ``b"vide"`` or ``b"soun"``.
+        codec: Codec name, using ffmpeg's names where known.
+        timescale: Media timescale (units per second).
+        duration: Media duration in timescale units.
+        width, height: Presentation size from ``tkhd`` (0 for audio).
+        sample_count: Number of samples (frames for video).
+        sync_count: Number of sync samples (keyframes for video).
+        data_size: Total size of the samples in bytes.
+        channels, sample_rate: Audio layout from the sample description
+            (0 for video).
+    """
+    def __init__(self, trak):
+        tkhd = trak.find(b"tkhd")
+        mdhd = trak.find(b"mdia", b"mdhd")
+        hdlr = trak.find(b"mdia", b"hdlr")
+        stbl = trak.find(b"mdia", b"minf", b"stbl")
+        if tkhd is None or mdhd is None or hdlr is None or stbl is None:
+            raise MP4Error("Track is missing tkhd, mdhd, hdlr or stbl")
+
+        width, height = struct.unpack(">II", tkhd.payload[-8:])
+        self.width = width >> 16
+        self.height = height >> 16
+
+        mdhd_payload = mdhd.payload
+        if mdhd.version == 1:
+            self.timescale, self.duration = struct.unpack(">IQ", mdhd_payload[20:32])
+        else:
+            self.timescale, self.duration = struct.unpack(">II", mdhd_payload[12:20])
+        self.handler = hdlr.payload[8:12]
+
+        boxes = {child.type: child for child in stbl.children()}
+        stsd = boxes[b"stsd"].payload if b"stsd" in boxes else b""
+        code = stsd[12:16].decode("latin-1") if len(stsd) >= 16 else ""
+        self.codec = CODEC_NAMES.get(code, code)
+        self.channels = 0
+        self.sample_rate = 0
+        if self.handler == b"soun" and len(stsd) >= 44:
+            # Version 0 audio sample entry: channel count and 16.16 sample rate
+            self.channels = struct.unpack(">H", stsd[32:34])[0]
+            self.sample_rate = struct.unpack(">I", stsd[40:44])[0] >> 16 or self.timescale
+
+        self.sample_count = 0
+        self.data_size = 0
+        stsz = boxes.get(b"stsz")
+        if stsz is not None:
+            sample_size, self.sample_count = struct.unpack(">II", stsz.payload[4:12])
+            if sample_size:
+                self.data_size = sample_size * self.sample_count
+            else:
+                self.data_size = sum(read_array("I", stsz.payload, 12, self.sample_count))
+
+        # Without an stss box every sample is a sync sample
+        stss = boxes.get(b"stss")
+        if stss is not None:
+            self.sync_count = struct.unpack(">I", stss.payload[4:8])[0]
+        else:
+            self.sync_count = self.sample_count
+
+    @property
+    def duration_seconds(self):
+        """Media duration in seconds."""
+        return self.duration / self.timescale if self.timescale else 0
+
+    @property
+    def channel_layout(self):
+        """Channel layout name such as "stereo", or the channel count."""
+        return CHANNEL_LAYOUTS.get(self.channels, f"{self.channels} channels")
+
+
+class MovieSummary:
+    """
+    Header-level description of an MP4 file.
+
+    Attributes:
+        duration: Movie duration in seconds.
+        tracks: List of ``TrackSummary`` objects.
+    """
+    def __init__(self, path):
+        _, moov = read_header_boxes(path)
+        mvhd = moov.find(b"mvhd")
+        if mvhd is None:
+            raise MP4Error("Movie header (mvhd) not found")
+        payload = mvhd.payload
+        if mvhd.version == 1:
+            timescale, duration = struct.unpack(">IQ", payload[20:32])
+        else:
+            timescale, duration = struct.unpack(">II", payload[12:20])
+        self.duration = duration / timescale if timescale else 0
+        self.tracks = [TrackSummary(trak) for trak in moov.find_all(b"trak")]
+
+    @property
+    def video_track(self):
+        """The first video track, or None."""
+        return next((track for track in self.tracks if track.handler == b"vide"), None)
+
+    @property
+    def audio_track(self):
+        """The first audio track, or None."""
+        return next((track for track in self.tracks if track.handler == b"soun"), None)
+
+
+def probe_mp4(path):
+    """
+    Read the header-level description of an MP4 file.
+
+    Raises:
+        MP4Error: If the file is not a (non-fragmented) MP4 file.
+    """
+    return MovieSummary(path)
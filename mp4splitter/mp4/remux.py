@@ -0,0 +1,317 @@
+"""
+Keyframe-aligned MP4 segment remuxing without ffmpeg.
+
+A segment is written as a new MP4 whose sample tables are rebuilt from the
+source's and whose ``mdat`` is assembled by copying byte ranges of the
+source's sample data, so no frame is ever decoded and memory use does not
+depend on the segment length.
+"""
+
+import struct
+from array import array
+from bisect import bisect_left
+
+from mp4splitter.cancellation import OperationCancelled
+from mp4splitter.mp4.boxes import MP4Error, build_box, build_full_box
+from mp4splitter.mp4.movie import Movie
+from mp4splitter.mp4.sample_table import SampleTable, build_stbl
+
+# Tolerance when comparing a requested cut time to a sample time, in seconds
+CUT_TOLERANCE = 0.001
+
+# Size of the buffer used to copy sample data
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class TrackSegment:
+    """
+    The samples of one track that fall inside a segment.
+
+    Attributes:
+        track: Source ``Track``.
+        first, last: Source sample range ``[first, last)``.
+        samples: ``SampleTable`` of the selected samples.
+        chunks: ``(source_offset, size, sample_count)`` of each output chunk.
+        media_time: Edit list media time for the new track.
+        presentation_end: Composition end time of the last presented sample.
+    """
+    def __init__(self, track, first, last):
+        self.track = track
+        self.first = first
+        self.last = last
+
+        source = track.samples
+        samples = SampleTable()
+        samples.stsd = source.stsd
+        samples.sizes = source.sizes[first:last]
+        samples.durations = source.durations[first:last]
+        samples.dts = array("q", (dts - source.dts[first] for dts in source.dts[first:last]))
+        if source.cts_offsets is not None:
+            samples.cts_offsets = source.cts_offsets[first:last]
+        if source.sync_samples is not None:
+            lo = bisect_left(source.sync_samples, first)
+            hi = bisect_left(source.sync_samples, last)
+            samples.sync_samples = [index - first for index in source.sync_samples[lo:hi]]
+
+        # Keep the source chunking: samples of one source chunk are contiguous on disk
+        self.chunks = []
+        for index in range(first, last):
+            chunk = source.sample_chunks[index]
+            size = source.sizes[index]
+            if index > first and source.sample_chunks[index - 1] == chunk:
+                offset, total, count = self.chunks[-1]
+                self.chunks[-1] = (offset, total + size, count + 1)
+            else:
+                self.chunks.append((source.offsets[index], size, 1))
+                samples.chunk_descriptions.append(source.chunk_descriptions[chunk])
+        self.samples = samples
+
+        # Present from the earliest composition time, like the source edit list does
+        if samples.cts_offsets is not None:
+            times = [dts + cts for dts, cts in zip(samples.dts, samples.cts_offsets)]
+            self.media_time = min(times)
+            self.presentation_end = max(t + d for t, d in zip(times, samples.durations))
+        else:
+            self.media_time = 0
+            self.presentation_end = self.duration
+
+    @property
+    def duration(self):
+        """Media duration of the selected samples, in track timescale units."""
+        return sum(self.samples.durations)
+
+    def limit_presentation(self, seconds):
+        """Stop presenting the track after the given number of seconds."""
+        limit = self.media_time + round(seconds * self.track.timescale)
+        self.presentation_end = min(self.presentation_end, limit)
+
+    @property
+    def presented_duration(self):
+        """Duration covered by the edit list, in track timescale units."""
+        return max(self.presentation_end - self.media_time, 0)
+
+
+def select_samples(track, start_sec, end_sec):
+    """
+    Return the ``[first, last)`` samples of a track starting at ``start_sec``.
+
+    The range runs in decode order from the first sample at or after the
+    start to the first sample at or after the end.
+    """
+    samples = track.samples
+    start = round(start_sec * track.timescale) + track.media_time
+    end = round(end_sec * track.timescale) + track.media_time
+    first = bisect_left(samples.dts, start - round(CUT_TOLERANCE * track.timescale))
+    last = bisect_left(samples.dts, end)
+    return first, max(first, last)
+
+
+def keyframe_start(track, start_sec):
+    """
+    Find the sync sample to start a segment from.
+
+    Returns:
+        tuple: ``(sample_index, time_sec)`` of the last sync sample presented
+        at or before ``start_sec``, or of the first sync sample if none is.
+    """
+    samples = track.samples
+    candidates = samples.sync_samples if samples.sync_samples is not None else range(len(samples))
+    if not candidates:
+        raise MP4Error("Track has no sync samples")
+    cts = samples.cts_offsets
+
+    def presentation_time(index):
+        pts = samples.dts[index] + (cts[index] if cts is not None else 0)
+        return (pts - track.media_time) / track.timescale
+
+    # Sync sample times grow with their index, so the search can bisect
+    lo, hi = 0, len(candidates)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if presentation_time(candidates[mid]) <= start_sec + CUT_TOLERANCE:
+            lo = mid + 1
+        else:
+            hi = mid
+    index = candidates[max(lo - 1, 0)]
+    return index, max(presentation_time(index), 0.0)
+
+
+def plan_segment(movie, start_sec, end_sec):
+    """
+    Select the samples of every video and audio track for a segment.
+
+    The cut is moved back to the keyframe at or before ``start_sec`` on the
+    first video track (or the first audio track if there is no video).
+
+    Returns:
+        tuple: ``(actual_start_sec, track_segments)``.
+    """
+    tracks = [track for track in movie.tracks if track.is_video or track.is_audio]
+    if not tracks:
+        raise MP4Error("No video or audio tracks to remux")
+    reference = movie.video_track or tracks[0]
+
+    first, actual_start = keyframe_start(reference, start_sec)
+    _, last = select_samples(reference, actual_start, end_sec)
+    segments = [TrackSegment(reference, first, max(last, first + 1))]
+    for track in tracks:
+        if track is not reference:
+            first_sample, last_sample = select_samples(track, actual_start, end_sec)
+            if first_sample < last_sample:
+                segments.append(TrackSegment(track, first_sample, last_sample))
+
+    # Samples are selected in decode order, so reordered frames may run past
+    # the end; the edit list hides them
+    for segment in segments:
+        segment.limit_presentation(end_sec - actual_start)
+    return actual_start, segments
+
+
+def patch_duration(box, duration, offsets):
+    """
+    Rebuild a header box with a new duration.
+
+    Args:
+        box: The ``tkhd``, ``mdhd`` or ``mvhd`` ``Box``.
+        duration: New duration.
+        offsets: ``(version_0_offset, version_1_offset)`` of the duration
+            field in the payload.
+    """
+    payload = bytearray(box.payload)
+    if box.version == 1:
+        struct.pack_into(">Q", payload, offsets[1], duration)
+    else:
+        struct.pack_into(">I", payload, offsets[0], min(duration, 0xFFFFFFFF))
+    return build_box(box.type, bytes(payload))
+
+
+def build_edts(segment_duration, media_time):
+    """Build an ``edts`` box with a single edit."""
+    if segment_duration > 0xFFFFFFFF or media_time > 0x7FFFFFFF:
+        elst = build_full_box(b"elst", 1, 0, struct.pack(">IQqI", 1, segment_duration,
+                                                         media_time, 0x10000))
+    else:
+        elst = build_full_box(b"elst", 0, 0, struct.pack(">IIiI", 1, segment_duration,
+                                                         media_time, 0x10000))
+    return build_box(b"edts", elst)
+
+
+def build_moov(movie, segments, chunk_offsets, use_co64):
+    """Build the ``moov`` box for the remuxed segment."""
+    traks = []
+    movie_duration = 0
+    for segment, offsets in zip(segments, chunk_offsets):
+        track = segment.track
+        media_duration = segment.duration
+        track_duration = segment.presented_duration * movie.timescale // track.timescale
+        movie_duration = max(movie_duration, track_duration)
+
+        stbl = build_stbl(segment.samples, [chunk[2] for chunk in segment.chunks],
+                          offsets, use_co64)
+        minf = build_box(b"minf", b"".join(track.minf_boxes) + stbl)
+        mdia = build_box(b"mdia", patch_duration(track.mdhd, media_duration, (16, 24)) +
+                         track.hdlr + minf)
+        traks.append(build_box(b"trak", patch_duration(track.tkhd, track_duration, (20, 28)) +
+                               build_edts(track_duration, segment.media_time) + mdia))
+
+    mvhd = patch_duration(movie.mvhd, movie_duration, (16, 24))
+    return build_box(b"moov", mvhd + b"".join(traks) + (movie.udta or b""))
+
+
+def copy_range(source, output, offset, size, cancel_event=None, block_callback=None):
+    """
+    Copy ``size`` bytes at ``offset`` of the source file to the output file.
+
+    ``block_callback``, if given, receives the size of each block copied.
+    """
+    source.seek(offset)
+    while size > 0:
+        if cancel_event is not None and cancel_event.is_set():
+            raise OperationCancelled()
+        block = source.read(min(size, COPY_BUFFER_SIZE))
+        if not block:
+            raise MP4Error("Sample data extends past the end of the source file")
+        output.write(block)
+        size -= len(block)
+        if block_callback is not None:
+            block_callback(len(block))
+
+
+def remux_segment(movie, start_sec, end_sec, output_path, cancel_event=None,
+                  progress_callback=None):
+    """
+    Write the samples between two times to a new MP4 file without decoding.
+
+    The segment starts on the keyframe at or before ``start_sec``.
+
+    Args:
+        movie: Parsed source ``Movie``, or a path to parse.
+        start_sec: Requested segment start in seconds.
+        end_sec: Segment end in seconds.
+        output_path: Path of the MP4 file to create.
+        cancel_event: Optional ``threading.Event`` checked while copying.
+        progress_callback: Optional callable receiving the fraction of the
+            sample data copied so far.
+
+    Returns:
+        float: The actual start time of the segment in seconds.
+
+    Raises:
+        MP4Error: If the source cannot be remuxed.
+        OperationCancelled: If the cancel event was set.
+    """
+    if not isinstance(movie, Movie):
+        movie = Movie(movie)
+    actual_start, segments = plan_segment(movie, start_sec, end_sec)
+
+    # Lay the chunks out in source order so the copy reads the source sequentially
+    layout = sorted((chunk[0], t, c) for t, segment in enumerate(segments)
+                    for c, chunk in enumerate(segment.chunks))
+    data_size = sum(chunk[1] for segment in segments for chunk in segment.chunks)
+    mdat_header = (struct.pack(">I4sQ", 1, b"mdat", data_size + 16)
+                   if data_size + 8 > 0xFFFFFFFF else struct.pack(">I4s", data_size + 8, b"mdat"))
+
+    def lay_out(use_co64):
+        # The moov size does not depend on the offset values, only on their width
+        placeholder = [[0] * len(segment.chunks) for segment in segments]
+        data_start = (len(movie.ftyp) + len(build_moov(movie, segments, placeholder, use_co64)) +
+                      len(mdat_header))
+        offsets = [[0] * len(segment.chunks) for segment in segments]
+        position = data_start
+        for _, t, c in layout:
+            offsets[t][c] = position
+            position += segments[t].chunks[c][1]
+        return offsets, position
+
+    use_co64 = False
+    chunk_offsets, end_offset = lay_out(use_co64)
+    if end_offset > 0xFFFFFFFF:
+        use_co64 = True
+        chunk_offsets, end_offset = lay_out(use_co64)
+
+    copied = [0]
+
+    def block_copied(size):
+        copied[0] += size
+        if progress_callback is not None and data_size:
+            progress_callback(copied[0] / data_size)
+
+    with open(movie.path, "rb") as source, open(output_path, "wb") as output:
+        output.write(movie.ftyp)
+        output.write(build_moov(movie, segments, chunk_offsets, use_co64))
+        output.write(mdat_header)
+
+        # Merge chunks that are adjacent in the source into single copies
+        run_offset, run_size = None, 0
+        for _, t, c in layout:
+            offset, size, _ = segments[t].chunks[c]
+            if run_offset is not None and run_offset + run_size == offset:
+                run_size += size
+                continue
+            if run_offset is not None:
+                copy_range(source, output, run_offset, run_size, cancel_event, block_copied)
+            run_offset, run_size = offset, size
+        if run_offset is not None:
+            copy_range(source, output, run_offset, run_size, cancel_event, block_copied)
+
+    return actual_start
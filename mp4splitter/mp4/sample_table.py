@@ -0,0 +1,244 @@
+"""
+Sample table (``stbl``) parsing and building for the MP4 remuxer.
+"""
+
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, chain
+
+from mp4splitter.mp4.boxes import MP4Error, build_box, build_full_box
+
+
+def read_array(typecode, data, offset, count):
+    """Read ``count`` big-endian integers of the given array typecode."""
+    values = array(typecode)
+    end = offset + count * values.itemsize
+    if end > len(data):
+        raise MP4Error("Sample table entry list is truncated")
+    values.frombytes(data[offset:end])
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+
+def to_big_endian(values):
+    """Return the bytes of an array in big-endian order."""
+    if sys.byteorder == "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def run_length(values):
+    """Collapse a sequence into ``(count, value)`` runs."""
+    runs = []
+    for value in values:
+        if runs and runs[-1][1] == value:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, value])
+    return runs
+
+
+class SampleTable:
+    """
+    Expanded, per-sample view of an ``stbl`` box.
+
+    Attributes:
+        stsd: The raw ``stsd`` box, copied verbatim when remuxing.
+        sizes: Size in bytes of each sample.
+        offsets: Absolute file offset of each sample.
+        durations: Decode duration of each sample, in media timescale units.
+        dts: Decode timestamp of each sample, in media timescale units.
+        cts_offsets: Composition offset of each sample, or None if the track
+            has no ``ctts`` box.
+        sync_samples: Sorted zero-based indices of the sync samples
+            (keyframes), or None if every sample is a sync sample.
+        sample_chunks: Zero-based chunk number of each sample.
+        chunk_descriptions: Sample description index of each chunk.
+    """
+    def __init__(self):
+        self.stsd = b""
+        self.sizes = array("I")
+        self.offsets = array("Q")
+        self.durations = array("I")
+        self.dts = array("q")
+        self.cts_offsets = None
+        self.sync_samples = None
+        self.sample_chunks = array("I")
+        self.chunk_descriptions = array("I")
+
+    def __len__(self):
+        return len(self.sizes)
+
+    @classmethod
+    def from_box(cls, stbl):
+        """Build a sample table from a parsed ``stbl`` box."""
+        table = cls()
+        boxes = {child.type: child for child in stbl.children()}
+
+        if b"stsd" not in boxes or b"stts" not in boxes or b"stsc" not in boxes:
+            raise MP4Error("Sample table is missing stsd, stts or stsc")
+        if b"stsz" not in boxes:
+            raise MP4Error("Compact sample sizes (stz2) are not supported")
+        table.stsd = boxes[b"stsd"].raw
+
+        # Sample sizes
+        stsz = boxes[b"stsz"].payload
+        sample_size, sample_count = struct.unpack(">II", stsz[4:12])
+        if sample_size:
+            table.sizes = array("I", [sample_size]) * sample_count
+        else:
+            table.sizes = read_array("I", stsz, 12, sample_count)
+
+        # Decode times
+        stts = boxes[b"stts"].payload
+        entries = read_array("I", stts, 8, 2 * struct.unpack(">I", stts[4:8])[0])
+        durations = array("I")
+        for i in range(0, len(entries), 2):
+            durations.extend(array("I", [entries[i + 1]]) * entries[i])
+        if len(durations) != sample_count:
+            raise MP4Error("Time-to-sample table does not match the sample count")
+        table.durations = durations
+        table.dts = array("q", accumulate(chain([0], durations[:-1])))
+
+        # Composition offsets
+        if b"ctts" in boxes:
+            ctts = boxes[b"ctts"].payload
+            entries = read_array("i", ctts, 8, 2 * struct.unpack(">I", ctts[4:8])[0])
+            offsets = array("i")
+            for i in range(0, len(entries), 2):
+                offsets.extend(array("i", [entries[i + 1]]) * entries[i])
+            if len(offsets) != sample_count:
+                raise MP4Error("Composition offset table does not match the sample count")
+            table.cts_offsets = offsets
+
+        # Sync samples
+        if b"stss" in boxes:
+            stss = boxes[b"stss"].payload
+            numbers = read_array("I", stss, 8, struct.unpack(">I", stss[4:8])[0])
+            table.sync_samples = [number - 1 for number in numbers]
+
+        # Chunk offsets
+        if b"stco" in boxes:
+            stco = boxes[b"stco"].payload
+            chunk_offsets = read_array("I", stco, 8, struct.unpack(">I", stco[4:8])[0])
+        elif b"co64" in boxes:
+            co64 = boxes[b"co64"].payload
+            chunk_offsets = read_array("Q", co64, 8, struct.unpack(">I", co64[4:8])[0])
+        else:
+            raise MP4Error("Sample table has no chunk offsets")
+
+        # Sample-to-chunk runs, expanded to per-sample offsets
+        stsc = boxes[b"stsc"].payload
+        entries = read_array("I", stsc, 8, 3 * struct.unpack(">I", stsc[4:8])[0])
+        chunk_count = len(chunk_offsets)
+        offsets = array("Q")
+        sample_chunks = array("I")
+        chunk_descriptions = array("I")
+        sample = 0
+        for e in range(0, len(entries), 3):
+            first_chunk = entries[e] - 1
+            next_chunk = entries[e + 3] - 1 if e + 3 < len(entries) else chunk_count
+            samples_per_chunk = entries[e + 1]
+            for chunk in range(first_chunk, min(next_chunk, chunk_count)):
+                offset = chunk_offsets[chunk]
+                chunk_descriptions.append(entries[e + 2])
+                for _ in range(samples_per_chunk):
+                    if sample >= sample_count:
+                        raise MP4Error("Sample-to-chunk table describes too many samples")
+                    offsets.append(offset)
+                    sample_chunks.append(chunk)
+                    offset += table.sizes[sample]
+                    sample += 1
+        if sample != sample_count:
+            raise MP4Error("Sample-to-chunk table does not match the sample count")
+        table.offsets = offsets
+        table.sample_chunks = sample_chunks
+        table.chunk_descriptions = chunk_descriptions
+        return table
+
+    def is_sync(self, index):
+        """Return True if the sample at the given index is a sync sample."""
+        if self.sync_samples is None:
+            return True
+        i = bisect_left(self.sync_samples, index)
+        return i < len(self.sync_samples) and self.sync_samples[i] == index
+
+    def presentation_times(self):
+        """Return the composition timestamp of every sample."""
+        if self.cts_offsets is None:
+            return self.dts
+        return array("q", (dts + cts for dts, cts in zip(self.dts, self.cts_offsets)))
+
+
+def build_stts(durations):
+    """Build an ``stts`` box from per-sample durations."""
+    runs = run_length(durations)
+    entries = array("I", chain.from_iterable(runs))
+    return build_full_box(b"stts", 0, 0, struct.pack(">I", len(runs)) + to_big_endian(entries))
+
+
+def build_ctts(cts_offsets):
+    """Build a version 1 (signed) ``ctts`` box from per-sample composition offsets."""
+    runs = run_length(cts_offsets)
+    entries = array("i", chain.from_iterable(runs))
+    return build_full_box(b"ctts", 1, 0, struct.pack(">I", len(runs)) + to_big_endian(entries))
+
+
+def build_stss(sync_samples):
+    """Build an ``stss`` box from zero-based sync sample indices."""
+    numbers = array("I", (index + 1 for index in sync_samples))
+    return build_full_box(b"stss", 0, 0, struct.pack(">I", len(numbers)) + to_big_endian(numbers))
+
+
+def build_stsz(sizes):
+    """Build an ``stsz`` box, using the compact form when all samples are equal."""
+    if sizes and all(size == sizes[0] for size in sizes):
+        return build_full_box(b"stsz", 0, 0, struct.pack(">II", sizes[0], len(sizes)))
+    return build_full_box(b"stsz", 0, 0, struct.pack(">II", 0, len(sizes)) +
+                          to_big_endian(array("I", sizes)))
+
+
+def build_stsc(chunk_sample_counts, chunk_descriptions):
+    """Build an ``stsc`` box from per-chunk sample counts and description indices."""
+    entries = array("I")
+    previous = None
+    for chunk, (count, description) in enumerate(zip(chunk_sample_counts, chunk_descriptions)):
+        if (count, description) != previous:
+            entries.extend((chunk + 1, count, description))
+            previous = (count, description)
+    return build_full_box(b"stsc", 0, 0, struct.pack(">I", len(entries) // 3) +
+                          to_big_endian(entries))
+
+
+def build_chunk_offsets(chunk_offsets, use_co64):
+    """Build an ``stco`` box, or a ``co64`` box for offsets beyond 4 GiB."""
+    if use_co64:
+        return build_full_box(b"co64", 0, 0, struct.pack(">I", len(chunk_offsets)) +
+                              to_big_endian(array("Q", chunk_offsets)))
+    return build_full_box(b"stco", 0, 0, struct.pack(">I", len(chunk_offsets)) +
+                          to_big_endian(array("I", chunk_offsets)))
+
+
+def build_stbl(table, chunk_sample_counts, chunk_offsets, use_co64):
+    """
+    Build an ``stbl`` box for a sample table.
+
+    Args:
+        table: ``SampleTable`` describing the samples, in output order.
+        chunk_sample_counts: Number of samples in each output chunk.
+        chunk_offsets: Absolute offset of each output chunk in the new file.
+        use_co64: Write 64-bit chunk offsets.
+    """
+    children = [table.stsd, build_stts(table.durations)]
+    if table.cts_offsets is not None:
+        children.append(build_ctts(table.cts_offsets))
+    if table.sync_samples is not None:
+        children.append(build_stss(table.sync_samples))
+    children.append(build_stsc(chunk_sample_counts, table.chunk_descriptions))
+    children.append(build_stsz(table.sizes))
+    children.append(build_chunk_offsets(chunk_offsets, use_co64))
+    return build_box(b"stbl", b"".join(children))
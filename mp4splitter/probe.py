@@ -0,0 +1,99 @@
+"""
+Video metadata probing for the MP4 Splitter application.
+
+MP4 files are described from their ``moov`` headers alone, without
+starting a decoder; other files fall back to ffmpeg's input summary.
+"""
+
+import os
+
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+from mp4splitter.cache import get_cache
+from mp4splitter.ffmpeg_tools import probe_audio_stream
+from mp4splitter.mp4 import MP4Error, probe_mp4
+
+
+def probe_video(video_path, use_cache=True):
+    """
+    Describe a video file.
+
+    Args:
+        video_path: Path to the video file.
+        use_cache: Look the result up in, and store it to, the persistent
+            metadata cache.
+
+    Returns:
+        dict: ``filename``, ``size`` (bytes), ``duration`` (milliseconds),
+        ``width``, ``height``, ``fps``, ``video_codec``, ``bitrate`` and
+        ``video_bitrate`` (kb/s), ``frames`` and ``keyframes`` (None when
+        unknown), and ``audio_codec``, ``audio_sample_rate`` and
+        ``audio_channel_layout`` (None without audio).
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        info = cache.get_json("info", video_path)
+        if info is not None:
+            return info
+
+    try:
+        info = _probe_mp4_headers(video_path)
+    except MP4Error:
+        info = _probe_ffmpeg(video_path)
+
+    info["filename"] = os.path.basename(video_path)
+    info["size"] = os.path.getsize(video_path)
+    duration_sec = info["duration"] / 1000
+    info["bitrate"] = round(info["size"] * 8 / duration_sec / 1000) if duration_sec else None
+    if cache is not None:
+        cache.put_json("info", video_path, info)
+    return info
+
+
+def _probe_mp4_headers(video_path):
+    """Build the info dictionary from the MP4 headers."""
+    movie = probe_mp4(video_path)
+    video = movie.video_track
+    audio = movie.audio_track
+    if video is None or not video.duration:
+        raise MP4Error("No video track with a known duration")
+
+    return {
+        "duration": movie.duration * 1000,
+        "width": video.width,
+        "height": video.height,
+        "fps": video.sample_count / video.duration_seconds,
+        "video_codec": video.codec,
+        "video_bitrate": round(video.data_size * 8 / video.duration_seconds / 1000),
+        "frames": video.sample_count,
+        "keyframes": video.sync_count,
+        "audio_codec": audio.codec if audio else None,
+        "audio_sample_rate": audio.sample_rate if audio else None,
+        "audio_channel_layout": audio.channel_layout if audio else None,
+    }
+
+
+def _probe_ffmpeg(video_path):
+    """Build the info dictionary from ffmpeg's description of the input."""
+    infos = ffmpeg_parse_infos(video_path)
+    if not infos.get("video_found"):
+        raise OSError(f"No video stream found in {video_path}")
+    width, height = infos["video_size"]
+    audio = probe_audio_stream(video_path) if infos.get("audio_found") else None
+
+    return {
+        "duration": infos["duration"] * 1000,
+        "width": width,
+        "height": height,
+        "fps": infos["video_fps"],
+        "video_codec": infos.get("video_codec_name"),
+        "video_bitrate": infos.get("video_bitrate"),
+        "frames": infos.get("video_n_frames"),
+        "keyframes": None,
+        "audio_codec": audio["codec"] if audio else None,
+        "audio_sample_rate": audio["sample_rate"] if audio else None,
+        "audio_channel_layout": audio["channel_layout"] if audio else None,
+    }
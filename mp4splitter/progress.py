@@ -0,0 +1,84 @@
+"""
+Progress tracking for the MP4 Splitter application.
+
+Strategies report how far into each segment they are; the tracker turns
+that into an overall percentage, an encoding frame rate and a speed
+relative to real time, and rate-limits the reports so a per-frame source
+cannot flood the GUI event loop.
+"""
+
+import threading
+import time
+
+# Minimum time between two progress reports, in seconds
+REPORT_INTERVAL = 0.25
+
+
+class ProgressTracker:
+    """
+    Aggregates per-segment progress of a split job.
+
+    Thread-safe: updates may come from reader threads or worker callbacks.
+
+    Args:
+        segment_durations: Mapping of segment index to duration in seconds.
+        callback: Callable receiving ``(percent, fps, speed)``, where ``fps``
+            is source frames processed per second and ``speed`` is seconds of
+            source processed per second of wall time.
+        fps: Frame rate of the source, used to express speed in frames.
+        interval: Minimum time between two reports, in seconds.
+    """
+    def __init__(self, segment_durations, callback, fps=None, interval=REPORT_INTERVAL):
+        self.segment_durations = dict(segment_durations)
+        self.total = sum(self.segment_durations.values())
+        self.callback = callback
+        self.fps = fps or 0
+        self.interval = interval
+        self.done = {}
+        self.processed = 0.0
+        self.skipped = 0.0  # seconds done before this run, left out of the speed
+        self.started = time.monotonic()
+        self.last_report = None
+        self.lock = threading.Lock()
+
+    def update(self, index, done_sec):
+        """Record that the first ``done_sec`` seconds of a segment are written."""
+        with self.lock:
+            self._set_done(index, done_sec)
+            self._report()
+
+    def finish_segment(self, index):
+        """Record that a segment is complete and report immediately."""
+        with self.lock:
+            self._set_done(index, self.segment_durations.get(index, 0))
+            self._report(force=True)
+
+    def skip_segment(self, index):
+        """
+        Record a segment written by an earlier run.
+
+        It counts towards the percentage but not towards the frame rate and
+        speed, which only measure the work of this run.
+        """
+        with self.lock:
+            duration = self.segment_durations.get(index, 0)
+            self.skipped += duration - self.done.get(index, 0.0)
+            self._set_done(index, duration)
+
+    def _set_done(self, index, done_sec):
+        duration = self.segment_durations.get(index, 0)
+        done_sec = min(max(done_sec, 0.0), duration)
+        self.processed += done_sec - self.done.get(index, 0.0)
+        self.done[index] = done_sec
+
+    def _report(self, force=False):
+        now = time.monotonic()
+        if not force and self.last_report is not None and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+
+        elapsed = now - self.started
+        speed = (self.processed - self.skipped) / elapsed if elapsed > 0 else 0.0
+        percent = 100.0 * self.processed / self.total if self.total > 0 else 0.0
+        self.callback(min(percent, 100.0), speed * self.fps, speed)
+
@@ -0,0 +1,178 @@
+"""
+Job queue panel component for the MP4 Splitter application.
+"""
+
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
+                               QTableWidgetItem, QHeaderView, QPushButton, QLabel,
+                               QSpinBox, QAbstractItemView)
+from PySide6.QtCore import Qt, QObject, Signal
+
+from mp4splitter.job_queue import JobQueue, RUNNING
+
+
+class JobQueueBridge(QObject):
+    """
+    Forwards job queue notifications to the GUI thread.
+
+    The queue calls its listeners from worker threads; emitting a signal
+    from there delivers the update to GUI slots through a queued connection.
+    """
+    job_changed = Signal(int)  # job ID
+
+    def __init__(self, job_queue):
+        super().__init__()
+        job_queue.add_listener(lambda job: self.job_changed.emit(job.job_id))
+
+
+class QueuePanel(QWidget):
+    """
+    Panel listing the batch job queue with controls to reorder and cancel jobs.
+    """
+    def __init__(self, job_queue=None):
+        super().__init__()
+        self.job_queue = job_queue or JobQueue()
+        self.bridge = JobQueueBridge(self.job_queue)
+        self.setup_ui()
+        self.setup_connections()
+
+    def setup_ui(self):
+        """Set up the user interface."""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header_layout = QHBoxLayout()
+        header_layout.addWidget(QLabel("Job queue:"))
+        header_layout.addStretch()
+        header_layout.addWidget(QLabel("Concurrent jobs:"))
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, os.cpu_count() or 1)
+        self.concurrency_spin.setValue(self.job_queue.max_concurrent)
+        self.concurrency_spin.setToolTip("Number of queued jobs split at the same time")
+        header_layout.addWidget(self.concurrency_spin)
+        layout.addLayout(header_layout)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(4)  # File, Mode, Status, Progress
+        self.table.setHorizontalHeaderLabels(["File", "Mode", "Status", "Progress"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        buttons_layout = QHBoxLayout()
+        self.move_up_btn = QPushButton("Move Up")
+        buttons_layout.addWidget(self.move_up_btn)
+        self.move_down_btn = QPushButton("Move Down")
+        buttons_layout.addWidget(self.move_down_btn)
+        self.cancel_job_btn = QPushButton("Cancel Job")
+        buttons_layout.addWidget(self.cancel_job_btn)
+        self.remove_job_btn = QPushButton("Remove")
+        buttons_layout.addWidget(self.remove_job_btn)
+        buttons_layout.addStretch()
+        self.clear_finished_btn = QPushButton("Clear Finished")
+        buttons_layout.addWidget(self.clear_finished_btn)
+        layout.addLayout(buttons_layout)
+
+        self.update_button_state()
+
+    def setup_connections(self):
+        """Connect signals and slots."""
+        self.bridge.job_changed.connect(self.refresh, Qt.QueuedConnection)
+        self.concurrency_spin.valueChanged.connect(self.job_queue.set_max_concurrent)
+        self.table.itemSelectionChanged.connect(self.update_button_state)
+        self.move_up_btn.clicked.connect(lambda: self.move_selected(-1))
+        self.move_down_btn.clicked.connect(lambda: self.move_selected(1))
+        self.cancel_job_btn.clicked.connect(self.cancel_selected)
+        self.remove_job_btn.clicked.connect(self.remove_selected)
+        self.clear_finished_btn.clicked.connect(self.clear_finished)
+
+    def refresh(self):
+        """Update the table from the current state of the queue."""
+        selected_id = self.selected_job_id()
+        jobs = self.job_queue.list_jobs()
+        self.table.setRowCount(len(jobs))
+
+        for row, job in enumerate(jobs):
+            progress = f"{job.segments_done}/{job.segment_count} segments"
+            if job.status == RUNNING:
+                progress = f"{job.percent:.0f}% ({progress})"
+            values = [os.path.basename(job.video_path), job.mode, job.error or job.status, progress]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setText(value)
+                item.setData(Qt.UserRole, job.job_id)
+                if column == 0:
+                    item.setToolTip(f"{job.video_path}\n→ {job.output_dir}")
+
+            if job.job_id == selected_id:
+                self.table.selectRow(row)
+
+        self.update_button_state()
+
+    def add_job(self, job):
+        """Add a job to the queue."""
+        self.job_queue.submit(job)
+        self.refresh()
+
+    def selected_job_id(self):
+        """Return the ID of the selected job, or None."""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        item = self.table.item(rows[0].row(), 0)
+        return item.data(Qt.UserRole) if item is not None else None
+
+    def move_selected(self, offset):
+        """Move the selected job up or down the queue."""
+        job_id = self.selected_job_id()
+        if job_id is None:
+            return
+        row = self.table.selectionModel().selectedRows()[0].row()
+        self.job_queue.move(job_id, row + offset)
+        self.refresh()
+
+    def cancel_selected(self):
+        """Cancel the selected job."""
+        job_id = self.selected_job_id()
+        if job_id is not None:
+            self.job_queue.cancel(job_id)
+
+    def remove_selected(self):
+        """Remove the selected job if it is not running."""
+        job_id = self.selected_job_id()
+        if job_id is None:
+            return
+        try:
+            self.job_queue.remove(job_id)
+        except ValueError:
+            # The job started in the meantime
+            pass
+        self.table.clearSelection()
+        self.refresh()
+
+    def clear_finished(self):
+        """Remove all finished jobs from the list."""
+        self.job_queue.clear_finished()
+        self.refresh()
+
+    def update_button_state(self):
+        """Enable the job buttons that apply to the selected job."""
+        job_id = self.selected_job_id()
+        job = self.job_queue.get(job_id) if job_id is not None else None
+        self.move_up_btn.setEnabled(job is not None)
+        self.move_down_btn.setEnabled(job is not None)
+        self.cancel_job_btn.setEnabled(job is not None and not job.finished)
+        self.remove_job_btn.setEnabled(job is not None and job.status != RUNNING)
+
+    def shutdown(self):
+        """Cancel every job and wait for the running ones to stop."""
+        self.job_queue.pause()
+        self.job_queue.cancel_all()
+        self.job_queue.wait()
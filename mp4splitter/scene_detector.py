@@ -0,0 +1,119 @@
+"""
+Scene change detection for the MP4 Splitter application.
+
+Cuts are found by comparing consecutive downscaled grayscale frames. The
+score of a frame follows ffmpeg's ``scene`` filter: the mean absolute
+difference to the previous frame, reduced by how much that difference
+changed since the frame before, so steady motion and pans score low while
+a hard cut scores high.
+"""
+
+import numpy as np
+
+from mp4splitter.frame_analysis import BatchFrameConsumer, run_analysis
+from mp4splitter.split_spec import points_from_cuts
+
+# Scores range from 0 (identical frames) to 1. Downscaling averages fine
+# detail away, so cuts score lower than with ffmpeg's full-size frames:
+# motion stays around 0.01 while cuts between similar shots reach 0.15
+DEFAULT_THRESHOLD = 0.1
+
+# Cuts closer than this to the previous cut are ignored, in seconds, so a
+# flash or a burst of fast edits does not produce a string of tiny segments
+DEFAULT_MIN_SCENE_LENGTH = 1.0
+
+
+class SceneDetector(BatchFrameConsumer):
+    """
+    Frame consumer scoring every frame for a scene change.
+
+    After the analysis ``scores`` holds one score per frame (the first
+    frame scores 0) and ``cut_times()`` the times of the detected cuts.
+
+    Args:
+        threshold: Minimum score of a cut, between 0 and 1.
+        min_scene_length: Minimum distance between two cuts, in seconds.
+    """
+    def __init__(self, threshold=DEFAULT_THRESHOLD, min_scene_length=DEFAULT_MIN_SCENE_LENGTH):
+        super().__init__()
+        self.threshold = threshold
+        self.min_scene_length = min_scene_length
+        self.score_batches = []
+        self.previous_frame = None
+        self.previous_difference = 0.0
+        self.scores = np.zeros(0, dtype=np.float32)
+
+    def start(self, pipeline):
+        super().start(pipeline)
+        self.score_batches = []
+        self.previous_frame = None
+        self.previous_difference = 0.0
+
+    def process_batch(self, first_index, frames):
+        frames = frames.reshape(len(frames), -1).astype(np.int16)
+        if self.previous_frame is None:
+            # The first frame has nothing to differ from
+            frames_before = np.concatenate([frames[:1], frames[:-1]])
+        else:
+            frames_before = np.concatenate([self.previous_frame[np.newaxis], frames[:-1]])
+        # Mean absolute difference on a 0-100 scale, as in ffmpeg
+        difference = np.abs(frames - frames_before).mean(axis=1) * (100.0 / 255.0)
+        difference_before = np.concatenate([[self.previous_difference], difference[:-1]])
+        scores = np.minimum(difference, np.abs(difference - difference_before)) / 100.0
+        self.score_batches.append(scores.astype(np.float32))
+        self.previous_frame = frames[-1]
+        self.previous_difference = difference[-1]
+
+    def finish(self):
+        super().finish()
+        self.scores = (np.concatenate(self.score_batches) if self.score_batches
+                       else np.zeros(0, dtype=np.float32))
+        self.score_batches = []
+
+    def cut_times(self):
+        """
+        Return the times of the detected cuts.
+
+        Returns:
+            list: Cut times in seconds, ascending.
+        """
+        min_frames = self.min_scene_length * self.fps
+        cuts = []
+        for index in np.flatnonzero(self.scores >= self.threshold):
+            if index < min_frames:
+                continue
+            if cuts and index - cuts[-1] < min_frames:
+                # Keep the stronger of two cuts that are too close together
+                if self.scores[index] > self.scores[cuts[-1]]:
+                    cuts[-1] = index
+                continue
+            cuts.append(index)
+        return [int(index) / self.fps for index in cuts]
+
+    def split_points(self):
+        """Return SplitPoint objects with a segment for every detected scene."""
+        return points_from_cuts([int(round(t * 1000)) for t in self.cut_times()])
+
+
+def detect_scenes(video_path, threshold=DEFAULT_THRESHOLD, min_scene_length=DEFAULT_MIN_SCENE_LENGTH,
+                  cancel_event=None, progress_callback=None):
+    """
+    Find the scene changes of a video.
+
+    Args:
+        video_path: Path to the video.
+        threshold: Minimum score of a cut, between 0 and 1.
+        min_scene_length: Minimum distance between two cuts, in seconds.
+        cancel_event: Optional ``threading.Event`` that stops the analysis.
+        progress_callback: Optional callable receiving ``(percent, speed)``.
+
+    Returns:
+        SceneDetector: The detector holding the scores and cuts.
+
+    Raises:
+        RuntimeError: If ffmpeg fails to decode the video.
+        OperationCancelled: If the cancel event was set.
+    """
+    detector = SceneDetector(threshold, min_scene_length)
+    run_analysis(video_path, [detector], cancel_event, progress_callback)
+    return detector
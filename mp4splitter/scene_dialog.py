@@ -0,0 +1,80 @@
+"""
+Scene detection dialog component for the MP4 Splitter application.
+"""
+
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QDoubleSpinBox,
+                               QCheckBox, QDialogButtonBox)
+
+from mp4splitter.scene_detector import DEFAULT_THRESHOLD
+
+
+class SceneDialog(QDialog):
+    """
+    Dialog choosing which boundaries the video analysis looks for.
+
+    All selected detectors share one decode of the video, so adding one
+    costs little extra time.
+
+    Args:
+        threshold: Initial scene change threshold.
+        scenes: Initially look for scene changes.
+        black: Initially look for black slates.
+        freeze: Initially look for frozen frames.
+        parent: Parent widget.
+    """
+    def __init__(self, threshold=DEFAULT_THRESHOLD, scenes=True, black=True, freeze=False,
+                 parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Detect Scenes")
+        layout = QVBoxLayout(self)
+
+        self.scenes_checkbox = QCheckBox("Scene changes")
+        self.scenes_checkbox.setChecked(scenes)
+        layout.addWidget(self.scenes_checkbox)
+        threshold_layout = QHBoxLayout()
+        threshold_layout.addSpacing(20)
+        threshold_layout.addWidget(QLabel("Threshold (0-1, lower finds more cuts):"))
+        self.threshold_spin = QDoubleSpinBox()
+        self.threshold_spin.setRange(0.01, 1.0)
+        self.threshold_spin.setSingleStep(0.01)
+        self.threshold_spin.setValue(threshold)
+        threshold_layout.addWidget(self.threshold_spin)
+        layout.addLayout(threshold_layout)
+
+        self.black_checkbox = QCheckBox("Black slates between programs")
+        self.black_checkbox.setChecked(black)
+        layout.addWidget(self.black_checkbox)
+        self.freeze_checkbox = QCheckBox("Frozen frames")
+        self.freeze_checkbox.setChecked(freeze)
+        layout.addWidget(self.freeze_checkbox)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.ok_button = buttons.button(QDialogButtonBox.Ok)
+
+        for checkbox in (self.scenes_checkbox, self.black_checkbox, self.freeze_checkbox):
+            checkbox.toggled.connect(self.update_state)
+        self.update_state()
+
+    def update_state(self):
+        """Require at least one detector and only offer the threshold for scene changes."""
+        self.threshold_spin.setEnabled(self.scenes_checkbox.isChecked())
+        self.ok_button.setEnabled(self.scenes() or self.black() or self.freeze())
+
+    def threshold(self):
+        """Return the scene change threshold, or None if scene changes are not wanted."""
+        return self.threshold_spin.value() if self.scenes() else None
+
+    def scenes(self):
+        """Return True if scene changes are wanted."""
+        return self.scenes_checkbox.isChecked()
+
+    def black(self):
+        """Return True if black slates are wanted."""
+        return self.black_checkbox.isChecked()
+
+    def freeze(self):
+        """Return True if frozen frames are wanted."""
+        return self.freeze_checkbox.isChecked()
@@ -0,0 +1,324 @@
+"""
+Local HTTP job service for the MP4 Splitter application.
+
+A long-running process that accepts split jobs as JSON over HTTP and runs
+them on a shared ``JobQueue``. Keeping one process alive means MoviePy is
+imported once and the probe and keyframe caches stay warm between jobs.
+
+Endpoints:
+    GET    /queue                 Queue settings and job counts.
+    POST   /queue                 Change ``max_concurrent`` and/or ``paused``.
+    GET    /jobs                  All jobs, in queue order.
+    POST   /jobs                  Submit a job (see ``job_from_request``).
+    GET    /jobs/<id>             One job.
+    DELETE /jobs/<id>             Remove a job that is not running.
+    POST   /jobs/<id>/cancel      Cancel a job.
+    POST   /jobs/<id>/move        Move a job to ``{"position": n}``.
+    GET    /probe?path=<file>     Video information, see ``probe.probe_video``.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from mp4splitter.encoder_profiles import DEFAULT_PROFILE, PROFILES
+from mp4splitter.job_queue import FINISHED_STATES, JobQueue, SplitJob
+from mp4splitter.mp4 import MP4Error
+from mp4splitter.probe import probe_video
+from mp4splitter.split_planner import plan_by_size
+from mp4splitter.split_spec import parse_time, points_from_cuts, points_from_json
+from mp4splitter.split_strategies import DEFAULT_MODE, STRATEGIES, CopyStrategy
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest request body accepted, in bytes
+MAX_REQUEST_SIZE = 1024 * 1024
+
+
+class ServiceError(Exception):
+    """An error reported to the client with an HTTP status."""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def is_integer(value):
+    """Return True for JSON integers; true and false decode to bool, an int subclass."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def size_limit(value):
+    """
+    Convert a ``max_size`` in MB to bytes.
+
+    Raises:
+        ServiceError: If the value is not a finite positive number.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        max_bytes = value * 1024 * 1024
+        if math.isfinite(max_bytes):
+            return int(max_bytes)
+    raise ServiceError(HTTPStatus.BAD_REQUEST, "\"max_size\" must be a positive number of MB")
+
+
+def object_body(request):
+    """
+    Return the JSON object of a request body, or an empty one without a body.
+
+    Raises:
+        ServiceError: If the body is not a JSON object.
+    """
+    body = request["body"]
+    if body is None:
+        return {}
+    if not isinstance(body, dict):
+        raise ServiceError(HTTPStatus.BAD_REQUEST, "The request body must be a JSON object")
+    return body
+
+
+def job_from_request(data):
+    """
+    Create a SplitJob from a decoded request body.
+
+    The body holds ``source`` and ``output_dir`` paths, either ``cuts`` (a
+    list of cut times), ``segments`` (a split spec as accepted by
+    ``split_spec.points_from_json``) or ``max_size`` (a segment size limit
+    in MB for stream copy, see ``split_planner.plan_by_size``), and
+    optionally ``mode``, ``profile`` and ``workers``.
+
+    Raises:
+        ServiceError: If the request is invalid.
+    """
+    if not isinstance(data, dict):
+        raise ServiceError(HTTPStatus.BAD_REQUEST, "The request body must be a JSON object")
+    source = data.get("source")
+    output_dir = data.get("output_dir")
+    if not source or not output_dir:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, "\"source\" and \"output_dir\" are required")
+    if not os.path.isfile(source):
+        raise ServiceError(HTTPStatus.BAD_REQUEST, f"Source file not found: {source}")
+
+    mode = data.get("mode", DEFAULT_MODE)
+    if mode not in STRATEGIES:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, f"Unknown split mode: {mode}")
+    profile = data.get("profile", DEFAULT_PROFILE)
+    if profile not in PROFILES:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, f"Unknown encoder profile: {profile}")
+    workers = data.get("workers", 1)
+    if not is_integer(workers) or workers < 1:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, "\"workers\" must be a positive integer")
+
+    try:
+        if "cuts" in data:
+            points = points_from_cuts([parse_time(t) for t in data["cuts"]])
+        elif "segments" in data:
+            points = points_from_json(data["segments"])
+        elif "max_size" in data:
+            if mode != CopyStrategy.name:
+                raise ValueError(f"\"max_size\" plans stream copy segments; use mode "
+                                 f"\"{CopyStrategy.name}\"")
+            points = plan_by_size(source, size_limit(data["max_size"]))
+        else:
+            raise ValueError("One of \"cuts\", \"segments\" or \"max_size\" is required")
+    except (ValueError, TypeError, MP4Error) as e:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, str(e))
+    if not points:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, "The split spec defines no segments")
+
+    return SplitJob(source, output_dir, points, mode=mode, profile=profile, workers=workers)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes HTTP requests to the ``SplitService`` of the server.
+    """
+    server_version = "MP4Splitter"
+
+    # (method, path pattern, SplitService method name)
+    routes = [
+        ("GET", r"/queue", "get_queue"),
+        ("POST", r"/queue", "update_queue"),
+        ("GET", r"/jobs", "list_jobs"),
+        ("POST", r"/jobs", "submit_job"),
+        ("GET", r"/jobs/(\d+)", "get_job"),
+        ("DELETE", r"/jobs/(\d+)", "remove_job"),
+        ("POST", r"/jobs/(\d+)/cancel", "cancel_job"),
+        ("POST", r"/jobs/(\d+)/move", "move_job"),
+        ("GET", r"/probe", "probe"),
+    ]
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        """Find the route for the request and send its JSON response."""
+        url = urlparse(self.path)
+        try:
+            for route_method, pattern, handler_name in self.routes:
+                match = re.fullmatch(pattern, url.path.rstrip("/") or "/")
+                if match and route_method == method:
+                    handler = getattr(self.server.service, handler_name)
+                    args = [int(group) for group in match.groups()]
+                    request = {"body": self.read_body(), "query": parse_qs(url.query)}
+                    status, response = handler(request, *args)
+                    break
+            else:
+                raise ServiceError(HTTPStatus.NOT_FOUND, f"No endpoint {method} {url.path}")
+        except ServiceError as e:
+            status, response = e.status, {"error": str(e)}
+        except Exception as e:
+            status, response = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+        self.send_json(status, response)
+
+    def read_body(self):
+        """Return the decoded JSON request body, or None if there is none."""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_SIZE:
+            raise ServiceError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "The request body is not valid JSON")
+
+    def send_json(self, status, data):
+        """Send a JSON response."""
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.service.verbose:
+            super().log_message(format, *args)
+
+
+class SplitService:
+    """
+    HTTP/JSON front end of a job queue.
+
+    Args:
+        host: Address to listen on; the default only accepts local clients.
+        port: Port to listen on; 0 picks a free port.
+        job_queue: The queue to run jobs on; a new one is created if None.
+        verbose: Log every request to standard error.
+    """
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, job_queue=None, verbose=False):
+        self.job_queue = job_queue or JobQueue()
+        self.verbose = verbose
+        self.server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+        self.server.daemon_threads = True
+        self.server.service = self
+        self.thread = None
+
+    @property
+    def address(self):
+        """The ``(host, port)`` the service listens on."""
+        return self.server.server_address[:2]
+
+    def serve_forever(self):
+        """Handle requests until ``shutdown`` is called."""
+        self.server.serve_forever()
+
+    def start(self):
+        """Handle requests on a background thread."""
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True,
+                                       name="split-service")
+        self.thread.start()
+
+    def shutdown(self, cancel_jobs=True):
+        """Stop accepting requests and optionally cancel the remaining jobs."""
+        self.server.shutdown()
+        self.server.server_close()
+        if cancel_jobs:
+            self.job_queue.pause()
+            self.job_queue.cancel_all()
+            self.job_queue.wait()
+
+    def job_or_404(self, job_id):
+        job = self.job_queue.get(job_id)
+        if job is None:
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"No job with ID {job_id}")
+        return job
+
+    # Endpoint handlers: each takes the request and the URL arguments and
+    # returns (status, JSON-serialisable response)
+
+    def get_queue(self, request):
+        jobs = self.job_queue.list_jobs()
+        counts = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return HTTPStatus.OK, {
+            "max_concurrent": self.job_queue.max_concurrent,
+            "paused": self.job_queue.paused,
+            "jobs": counts,
+        }
+
+    def update_queue(self, request):
+        body = object_body(request)
+        if "max_concurrent" in body:
+            if not is_integer(body["max_concurrent"]) or body["max_concurrent"] < 1:
+                raise ServiceError(HTTPStatus.BAD_REQUEST,
+                                   "\"max_concurrent\" must be a positive integer")
+            self.job_queue.set_max_concurrent(body["max_concurrent"])
+        if "paused" in body:
+            if body["paused"]:
+                self.job_queue.pause()
+            else:
+                self.job_queue.resume()
+        return self.get_queue(request)
+
+    def list_jobs(self, request):
+        return HTTPStatus.OK, [job.to_dict() for job in self.job_queue.list_jobs()]
+
+    def submit_job(self, request):
+        job = self.job_queue.submit(job_from_request(request["body"]))
+        return HTTPStatus.CREATED, job.to_dict()
+
+    def get_job(self, request, job_id):
+        return HTTPStatus.OK, self.job_or_404(job_id).to_dict()
+
+    def remove_job(self, request, job_id):
+        job = self.job_or_404(job_id)
+        try:
+            self.job_queue.remove(job_id)
+        except ValueError as e:
+            raise ServiceError(HTTPStatus.CONFLICT, str(e))
+        return HTTPStatus.OK, job.to_dict()
+
+    def cancel_job(self, request, job_id):
+        job = self.job_or_404(job_id)
+        if job.status in FINISHED_STATES:
+            raise ServiceError(HTTPStatus.CONFLICT, f"Job {job_id} is already {job.status}")
+        self.job_queue.cancel(job_id)
+        return HTTPStatus.ACCEPTED, job.to_dict()
+
+    def move_job(self, request, job_id):
+        self.job_or_404(job_id)
+        position = object_body(request).get("position")
+        if not is_integer(position):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "\"position\" must be an integer")
+        self.job_queue.move(job_id, position)
+        return HTTPStatus.OK, [job.to_dict() for job in self.job_queue.list_jobs()]
+
+    def probe(self, request):
+        path = request["query"].get("path", [None])[0]
+        if not path or not os.path.isfile(path):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"File not found: {path}")
+        return HTTPStatus.OK, probe_video(path)
@@ -0,0 +1,187 @@
+"""
+Silence detection for the MP4 Splitter application.
+
+The audio is streamed by ``audio_analysis`` as mono 16-bit PCM. Each block
+is cut into short windows whose level (RMS, in dB relative to full scale)
+is computed with NumPy; runs of quiet windows are turned into silences as
+the stream goes by, so memory use does not depend on the length of the
+recording.
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+
+from mp4splitter.audio_analysis import SAMPLE_RATE, run_audio_analysis
+from mp4splitter.split_spec import points_from_cuts
+
+# Length of one level measurement, in milliseconds
+WINDOW_MS = 20
+
+# Windows quieter than this count as silent, in dBFS
+DEFAULT_THRESHOLD_DB = -40.0
+
+# Shortest pause that counts as a silence, in milliseconds
+DEFAULT_MIN_SILENCE_MS = 500
+
+# How far a new split point may be moved to reach a silence, in milliseconds
+DEFAULT_SNAP_TOLERANCE_MS = 2000
+
+# Snapped split points keep this distance from the edges of a silence, so
+# the first and last syllables around the cut are not clipped
+SNAP_MARGIN_MS = 100
+
+
+class SilenceMap:
+    """
+    Silent intervals of a recording.
+
+    Args:
+        silences: ``(start_ms, end_ms)`` pairs, sorted and not overlapping.
+        duration_ms: Duration of the recording in milliseconds.
+    """
+    def __init__(self, silences, duration_ms):
+        self.silences = list(silences)
+        self.duration_ms = duration_ms
+        self.ends = [end for start, end in self.silences]
+
+    def __len__(self):
+        return len(self.silences)
+
+    def cut_times(self):
+        """
+        Return a cut in the middle of every silence between two sounds.
+
+        Silences at the very start or end of the recording do not separate
+        anything and are left out.
+
+        Returns:
+            list: Cut times in milliseconds, ascending.
+        """
+        return [(start + end) // 2 for start, end in self.silences
+                if start > 0 and end < self.duration_ms]
+
+    def split_points(self):
+        """Return SplitPoint objects cutting the recording at its silences."""
+        return points_from_cuts(self.cut_times())
+
+    def snap_ms(self, time_ms, tolerance_ms=DEFAULT_SNAP_TOLERANCE_MS):
+        """
+        Move a time into the nearest silence.
+
+        Args:
+            time_ms: Time in milliseconds.
+            tolerance_ms: Maximum distance the time may move.
+
+        Returns:
+            int: The closest time inside a silence, kept ``SNAP_MARGIN_MS``
+            away from its edges where the silence is long enough, or the
+            time itself if no silence is within reach.
+        """
+        # Only the silences around the time can be the nearest
+        index = bisect_left(self.ends, time_ms)
+        best = time_ms
+        best_distance = None
+        for start, end in self.silences[max(index - 1, 0):index + 1]:
+            margin = min(SNAP_MARGIN_MS, (end - start) // 2)
+            target = min(max(time_ms, start + margin), end - margin)
+            distance = abs(target - time_ms)
+            if distance <= tolerance_ms and (best_distance is None or distance < best_distance):
+                best, best_distance = target, distance
+        return best
+
+
+class SilenceTracker:
+    """
+    Turns a stream of window levels into silent intervals.
+
+    Args:
+        threshold_db: Windows below this level are silent.
+        min_silence_ms: Shortest run of silent windows reported.
+    """
+    def __init__(self, threshold_db=DEFAULT_THRESHOLD_DB, min_silence_ms=DEFAULT_MIN_SILENCE_MS):
+        self.threshold_db = threshold_db
+        self.min_windows = max(int(np.ceil(min_silence_ms / WINDOW_MS)), 1)
+        self.silences = []
+        self.windows = 0
+        self.run_start = None  # first window of the current silent run
+
+    def add_levels(self, levels_db):
+        """Process the levels of the next windows, in dB."""
+        silent = levels_db < self.threshold_db
+        # Indices where the windows switch between silent and sound
+        changes = np.flatnonzero(np.diff(silent.astype(np.int8))) + 1
+        boundaries = [0, *changes.tolist(), len(silent)]
+        for first, last in zip(boundaries, boundaries[1:]):
+            if first == last:
+                continue
+            if silent[first]:
+                if self.run_start is None:
+                    self.run_start = self.windows + first
+            else:
+                self._end_run(self.windows + first)
+        self.windows += len(silent)
+
+    def finish(self):
+        """Close a silence running to the end of the stream."""
+        self._end_run(self.windows)
+
+    def _end_run(self, end_window):
+        if self.run_start is not None and end_window - self.run_start >= self.min_windows:
+            self.silences.append((self.run_start * WINDOW_MS, end_window * WINDOW_MS))
+        self.run_start = None
+
+
+def window_levels(samples):
+    """
+    Compute the RMS level of consecutive windows.
+
+    Args:
+        samples: ``int16`` array whose length is a multiple of the window.
+
+    Returns:
+        numpy.ndarray: Level of each window in dBFS; digital silence is
+        reported as -120 dB.
+    """
+    window = SAMPLE_RATE * WINDOW_MS // 1000
+    frames = samples.reshape(-1, window).astype(np.float32) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-6))
+
+
+def detect_silences(video_path, threshold_db=DEFAULT_THRESHOLD_DB,
+                    min_silence_ms=DEFAULT_MIN_SILENCE_MS, cancel_event=None,
+                    progress_callback=None):
+    """
+    Find the silences in the audio of a video.
+
+    Args:
+        video_path: Path to the video.
+        threshold_db: Windows quieter than this level are silent, in dBFS.
+        min_silence_ms: Shortest pause reported, in milliseconds.
+        cancel_event: Optional ``threading.Event`` that stops the analysis.
+        progress_callback: Optional callable receiving ``(percent, speed)``,
+            where ``speed`` is seconds of audio analyzed per second.
+
+    Returns:
+        SilenceMap: The silences found.
+
+    Raises:
+        ValueError: If the video has no audio.
+        RuntimeError: If ffmpeg fails to decode the audio.
+        OperationCancelled: If the cancel event was set.
+    """
+    window = SAMPLE_RATE * WINDOW_MS // 1000
+    tracker = SilenceTracker(threshold_db, min_silence_ms)
+
+    def process_block(samples):
+        # A partial window at the very end is too short to measure
+        usable = len(samples) - len(samples) % window
+        if usable:
+            tracker.add_levels(window_levels(samples[:usable]))
+
+    run_audio_analysis(video_path, process_block, window, cancel_event, progress_callback)
+    tracker.finish()
+    # The audio may end a little before the container says; a silence
+    # running to its end must still count as trailing
+    return SilenceMap(tracker.silences, tracker.windows * WINDOW_MS)
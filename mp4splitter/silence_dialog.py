@@ -0,0 +1,52 @@
+"""
+Silence detection dialog component for the MP4 Splitter application.
+"""
+
+from PySide6.QtWidgets import QDialog, QFormLayout, QDoubleSpinBox, QSpinBox, QDialogButtonBox
+
+from mp4splitter.silence_detector import DEFAULT_MIN_SILENCE_MS, DEFAULT_THRESHOLD_DB
+
+
+class SilenceDialog(QDialog):
+    """
+    Dialog asking what counts as a silence.
+
+    Args:
+        threshold_db: Initial silence threshold in dBFS.
+        min_silence_ms: Initial shortest silence in milliseconds.
+        parent: Parent widget.
+    """
+    def __init__(self, threshold_db=DEFAULT_THRESHOLD_DB, min_silence_ms=DEFAULT_MIN_SILENCE_MS,
+                 parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Detect Silences")
+        layout = QFormLayout(self)
+
+        self.threshold_spin = QDoubleSpinBox()
+        self.threshold_spin.setRange(-90, 0)
+        self.threshold_spin.setDecimals(1)
+        self.threshold_spin.setSuffix(" dB")
+        self.threshold_spin.setValue(threshold_db)
+        self.threshold_spin.setToolTip("Audio quieter than this level counts as silence")
+        layout.addRow("Silence below:", self.threshold_spin)
+
+        self.min_silence_spin = QSpinBox()
+        self.min_silence_spin.setRange(50, 600000)
+        self.min_silence_spin.setSingleStep(100)
+        self.min_silence_spin.setSuffix(" ms")
+        self.min_silence_spin.setValue(min_silence_ms)
+        self.min_silence_spin.setToolTip("Shorter pauses, e.g. between words, are not cut")
+        layout.addRow("Longer than:", self.min_silence_spin)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def threshold_db(self):
+        """Return the chosen silence threshold in dBFS."""
+        return self.threshold_spin.value()
+
+    def min_silence_ms(self):
+        """Return the chosen shortest silence in milliseconds."""
+        return self.min_silence_spin.value()
@@ -0,0 +1,129 @@
+"""
+Seek slider preview component for the MP4 Splitter application.
+"""
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QStyle, QStyleOptionSlider
+from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Qt, QObject, QEvent, QPoint
+
+# Keyframes on each side of the hovered one that are loaded in advance,
+# so moving the pointer a little shows a thumbnail at once
+PREFETCH_KEYFRAMES = 4
+
+# Thread pool priorities, above those of the filmstrip
+HOVER_PRIORITY = 20
+PREFETCH_PRIORITY = 10
+
+
+class SliderPreview(QObject):
+    """
+    Shows the thumbnail of the keyframe under the pointer above a seek slider.
+
+    Hovering never seeks the media player: the thumbnail comes from the
+    ThumbnailLoader's memory cache, and until the exact keyframe is
+    loaded the nearest loaded thumbnail stands in for it. The keyframes
+    around the pointer are prefetched, and requests for positions the
+    pointer has already left are dropped before they are decoded.
+
+    Args:
+        slider: The QSlider to preview; its range is in milliseconds.
+        loader: ThumbnailLoader of the video shown.
+        format_time: Callable formatting milliseconds for display.
+    """
+    def __init__(self, slider, loader, format_time):
+        super().__init__(slider)
+        self.slider = slider
+        self.loader = loader
+        self.format_time = format_time
+        self.hover_keyframe = None
+        self.wanted = frozenset()
+        self.setup_popup()
+
+        slider.setMouseTracking(True)
+        slider.installEventFilter(self)
+        loader.thumbnail_ready.connect(self.thumbnail_ready)
+
+    def setup_popup(self):
+        """Create the frameless window showing the preview."""
+        self.popup = QWidget(self.slider, Qt.ToolTip)
+        layout = QVBoxLayout(self.popup)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(2)
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.image_label)
+        self.time_label = QLabel()
+        self.time_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.time_label)
+
+    def eventFilter(self, obj, event):
+        if obj is self.slider:
+            if event.type() == QEvent.MouseMove:
+                self.show_preview(event.position().x())
+            elif event.type() in (QEvent.Leave, QEvent.Hide):
+                self.hide_preview()
+        return False
+
+    def value_at(self, x):
+        """Return the slider value under a horizontal position in the slider."""
+        option = QStyleOptionSlider()
+        self.slider.initStyleOption(option)
+        style = self.slider.style()
+        groove = style.subControlRect(QStyle.CC_Slider, option, QStyle.SC_SliderGroove, self.slider)
+        handle = style.subControlRect(QStyle.CC_Slider, option, QStyle.SC_SliderHandle, self.slider)
+        span = groove.width() - handle.width()
+        position = int(x) - groove.x() - handle.width() // 2
+        return QStyle.sliderValueFromPosition(self.slider.minimum(), self.slider.maximum(),
+                                              min(max(position, 0), span), span)
+
+    def show_preview(self, x):
+        """Show the preview for the pointer at a horizontal position."""
+        if self.slider.maximum() <= 0:
+            return
+        time_ms = self.value_at(x)
+        self.time_label.setText(self.format_time(time_ms))
+
+        position = self.loader.keyframe_position(time_ms)
+        if position is not None:
+            times = self.loader.keyframe_times
+            keyframe_ms = times[position]
+            if keyframe_ms != self.hover_keyframe:
+                self.hover_keyframe = keyframe_ms
+                first = max(position - PREFETCH_KEYFRAMES, 0)
+                self.wanted = frozenset(times[first:position + PREFETCH_KEYFRAMES + 1])
+                self.loader.request([keyframe_ms], HOVER_PRIORITY, self.is_wanted)
+                # Nearest neighbours first
+                neighbours = sorted(self.wanted, key=lambda t: abs(t - keyframe_ms))
+                self.loader.request(neighbours, PREFETCH_PRIORITY, self.is_wanted)
+            self.show_image(self.loader.images.get(keyframe_ms) or
+                            self.loader.images.nearest(keyframe_ms))
+
+        self.popup.adjustSize()
+        anchor = self.slider.mapToGlobal(QPoint(int(x), 0))
+        self.popup.move(anchor.x() - self.popup.width() // 2, anchor.y() - self.popup.height() - 4)
+        self.popup.show()
+
+    def show_image(self, image):
+        """Show a thumbnail in the popup, or nothing if it is None."""
+        if image is None:
+            self.image_label.clear()
+            self.image_label.hide()
+        else:
+            self.image_label.setPixmap(QPixmap.fromImage(image))
+            self.image_label.show()
+
+    def hide_preview(self):
+        """Hide the preview and drop the thumbnails queued for it."""
+        self.popup.hide()
+        self.hover_keyframe = None
+        self.wanted = frozenset()
+
+    def is_wanted(self, keyframe_ms):
+        """Return True if a keyframe is still near the pointer; called from pool threads."""
+        return keyframe_ms in self.wanted
+
+    def thumbnail_ready(self, keyframe_ms):
+        """Replace the stand-in thumbnail when the hovered keyframe arrives."""
+        if self.popup.isVisible() and keyframe_ms == self.hover_keyframe:
+            self.show_image(self.loader.images.get(keyframe_ms))
+            self.popup.adjustSize()
@@ -0,0 +1,143 @@
+"""
+Automatic split point planning for the MP4 Splitter application.
+
+Plans are computed from the video duration, the keyframe index or the
+MP4 sample tables alone, without decoding or encoding anything, so even a
+long recording is planned almost instantly.
+"""
+
+from array import array
+from itertools import accumulate, chain
+
+from mp4splitter.mp4 import MP4Error, parse_mp4
+from mp4splitter.mp4.remux import select_samples
+from mp4splitter.split_point import SplitPoint
+from mp4splitter.split_spec import points_from_cuts
+
+# Allowance for the headers of a remuxed segment: a fixed part for the
+# movie and track headers plus the sample table entries of every sample.
+# Both are upper bounds for what ``mp4.remux`` writes in practice.
+SEGMENT_HEADER_SIZE = 4096
+SAMPLE_ENTRY_SIZE = 32
+
+
+def plan_fixed_interval(duration_ms, interval_ms, keyframe_index=None):
+    """
+    Plan segments of equal length.
+
+    Args:
+        duration_ms: Duration of the video in milliseconds.
+        interval_ms: Segment length in milliseconds; fractions are allowed,
+            so an interval of N frames does not drift.
+        keyframe_index: Optional KeyframeIndex; each cut is moved to the
+            nearest keyframe, so the segments can be stream copied.
+
+    Returns:
+        list: SplitPoint objects covering the whole video; the last one
+        has no end time.
+
+    Raises:
+        ValueError: If the interval is not positive.
+    """
+    if interval_ms <= 0:
+        raise ValueError("The split interval must be positive")
+    count = int(duration_ms // interval_ms)
+    cuts = (int(round(k * interval_ms)) for k in range(1, count + 1))
+    cuts = [t for t in cuts if t < duration_ms]
+    if keyframe_index is not None and len(keyframe_index):
+        cuts = [keyframe_index.nearest_ms(t) for t in cuts]
+    return points_from_cuts(cuts)
+
+
+def plan_by_size(video_path, max_bytes):
+    """
+    Plan stream copy segments that each stay under a file size.
+
+    Every cut is placed on a video keyframe, where stream copy cuts, as
+    late as the size limit allows. Segment sizes are the sum of the sample
+    sizes (``stsz``) the remuxer selects for each segment, plus a header
+    allowance. A single GOP larger than the limit cannot be split without
+    re-encoding and becomes a segment of its own.
+
+    Args:
+        video_path: Path to a (non-fragmented) MP4 file.
+        max_bytes: Maximum size of each segment file in bytes.
+
+    Returns:
+        list: SplitPoint objects covering the whole video; the last one
+        has no end time.
+
+    Raises:
+        MP4Error: If the file cannot be parsed as MP4.
+        ValueError: If the limit is too small for even the headers.
+    """
+    movie = parse_mp4(video_path)
+    tracks = [track for track in movie.tracks if track.is_video or track.is_audio]
+    if not tracks:
+        raise MP4Error("No video or audio tracks found")
+    reference = movie.video_track or tracks[0]
+
+    fixed_size = SEGMENT_HEADER_SIZE + len(movie.ftyp) + len(movie.udta or b"")
+    if max_bytes <= fixed_size:
+        raise ValueError(f"The size limit must be larger than {fixed_size} bytes")
+
+    samples = reference.samples
+    keyframes = samples.sync_samples if samples.sync_samples is not None else range(len(samples))
+    if not keyframes:
+        raise MP4Error("The video has no keyframes")
+
+    # Cut times in whole milliseconds, as the split points store them.
+    # Rounding down keeps each cut within the remuxer's tolerance of its
+    # keyframe and makes the previous segment end before that keyframe.
+    cts = samples.cts_offsets
+    cut_ms = []
+    for index in keyframes:
+        pts = samples.dts[index] + (cts[index] if cts is not None else 0)
+        cut_ms.append(max(int((pts - reference.media_time) * 1000 // reference.timescale), 0))
+
+    # Running byte totals per track, so any sample range is summed in O(1)
+    prefix_sizes = {
+        track.track_id: array("Q", accumulate(chain([0], track.samples.sizes)))
+        for track in tracks
+    }
+
+    def segment_size(first_key, end_key):
+        """Estimated file size from keyframe ``first_key`` to ``end_key`` (exclusive)."""
+        start_sec = cut_ms[first_key] / 1000
+        end_sec = cut_ms[end_key] / 1000 if end_key < len(keyframes) else None
+        size = fixed_size
+        for track in tracks:
+            count = len(track.samples)
+            if end_sec is None:
+                # The last segment runs to the end of every track
+                first, last = select_samples(track, start_sec, start_sec)[0], count
+            else:
+                first, last = select_samples(track, start_sec, end_sec)
+            if track is reference:
+                # The remuxer starts the reference track on the keyframe itself
+                first = keyframes[first_key]
+                last = max(last, first + 1)
+            sizes = prefix_sizes[track.track_id]
+            size += sizes[last] - sizes[first] + (last - first) * SAMPLE_ENTRY_SIZE
+        return size
+
+    points = []
+    start_key = 0
+    while True:
+        # The size grows with the end keyframe, so find the last one that
+        # fits by bisection; len(keyframes) stands for the end of the video
+        lo, hi = start_key + 1, len(keyframes) + 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if segment_size(start_key, mid) <= max_bytes:
+                lo = mid + 1
+            else:
+                hi = mid
+        end_key = max(lo - 1, start_key + 1)
+
+        start_ms = cut_ms[start_key] if points else 0
+        if end_key >= len(keyframes):
+            points.append(SplitPoint(start_ms, None))
+            return points
+        points.append(SplitPoint(start_ms, cut_ms[end_key]))
+        start_key = end_key
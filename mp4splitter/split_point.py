@@ -0,0 +1,20 @@
+"""
+Split point model for the MP4 Splitter application.
+"""
+
+
+class SplitPoint:
+    """
+    Class representing a video split point with start and end times.
+    """
+    def __init__(self, start_time, end_time=None):
+        self.start_time = start_time
+        self.end_time = end_time
+        self.selected = True
+        
+    @property
+    def duration(self):
+        """Calculate the duration of the segment."""
+        if self.end_time is None or self.start_time is None:
+            return 0
+        return self.end_time - self.start_time
@@ -2,165 +2,250 @@
 Split points table component for the MP4 Splitter application.
 """
 
-from PySide6.QtWidgets import (QTableWidget, QTableWidgetItem, QHeaderView, 
-                              QCheckBox, QWidget, QHBoxLayout)
-from PySide6.QtCore import Qt
+from bisect import bisect_right
 
+from PySide6.QtWidgets import QTableView, QHeaderView
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 
-class SplitPoint:
+# SplitPoint lives in its own module so non-GUI code can use it without
+# importing QtWidgets; it is re-exported here for existing imports
+from mp4splitter.split_point import SplitPoint
+from mp4splitter.silence_detector import DEFAULT_SNAP_TOLERANCE_MS
+
+
+class SplitPointsModel(QAbstractTableModel):
     """
-    Class representing a video split point with start and end times.
+    Table model exposing the split points of a SplitPointsTable.
+
+    The view only asks for the cells it shows, so the cost of displaying or
+    replacing the split points does not grow with their number.
     """
-    def __init__(self, start_time, end_time=None):
-        self.start_time = start_time
-        self.end_time = end_time
-        self.selected = True
-        
-    @property
-    def duration(self):
-        """Calculate the duration of the segment."""
-        if self.end_time is None or self.start_time is None:
-            return 0
-        return self.end_time - self.start_time
-
-
-class SplitPointsTable(QTableWidget):
+    headers = ["", "Start", "End", "Duration"]  # Checkbox, Start, End, Duration
+
+    def __init__(self, table):
+        super().__init__()
+        self.table = table
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.table.split_points)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.table.split_points):
+            return None
+        point = self.table.split_points[index.row()]
+        column = index.column()
+
+        if column == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if point.selected else Qt.Unchecked
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == 3 and point.end_time is None:
+                # An open last segment has no known length until the split runs
+                return ""
+            value = (point.start_time, point.end_time, point.duration)[column - 1]
+            return self.table.format_time(value)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsUserCheckable | Qt.ItemIsEnabled
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if index.column() in (1, 2):
+            # Duration is derived from the times and not editable
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.row() >= len(self.table.split_points):
+            return False
+        row, column = index.row(), index.column()
+        if column == 0 and role == Qt.CheckStateRole:
+            self.table.toggle_selection(row, Qt.CheckState(value))
+            self.rows_changed(row, row + 1)
+            return True
+        if column in (1, 2) and role == Qt.EditRole:
+            return self.table.cell_edited(row, column, value)
+        return False
+
+    def rows_changed(self, first, last):
+        """Tell the view that the rows ``[first, last)`` changed."""
+        first = max(first, 0)
+        last = min(last, len(self.table.split_points))
+        if first < last:
+            self.dataChanged.emit(self.index(first, 0), self.index(last - 1, len(self.headers) - 1))
+
+
+class SplitPointsTable(QTableView):
     """
     Table widget for managing video split points.
     """
     def __init__(self):
         super().__init__()
         self.split_points = []
+        self.keyframe_index = None
+        self.snap_to_keyframes = False
+        self.silence_map = None
+        self.snap_to_silences = False
+        self.silence_snap_tolerance = DEFAULT_SNAP_TOLERANCE_MS
         self.setup_table()
-        
+
     def setup_table(self):
         """Set up the table structure."""
-        self.setColumnCount(4)  # Checkbox, Start, End, Duration
-        self.setHorizontalHeaderLabels(["", "Start", "End", "Duration"])
-        
+        # Editing of time cells goes through the model's setData
+        self.split_points_model = SplitPointsModel(self)
+        self.setModel(self.split_points_model)
+
         # Set column widths
         self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
         self.setColumnWidth(0, 30)
-        
-        # Enable editing for time cells
-        self.cellChanged.connect(self.cell_edited)
-        
+
+    def set_keyframe_index(self, keyframe_index):
+        """Set the KeyframeIndex used for snapping, or None to disable it."""
+        self.keyframe_index = keyframe_index
+
+    def set_snap_to_keyframes(self, enabled):
+        """Enable or disable snapping new and edited split points to keyframes."""
+        self.snap_to_keyframes = enabled
+
+    def set_silence_map(self, silence_map):
+        """Set the SilenceMap used for snapping, or None to disable it."""
+        self.silence_map = silence_map
+
+    def set_snap_to_silences(self, enabled):
+        """Enable or disable moving new and edited split points into a nearby silence."""
+        self.snap_to_silences = enabled
+
+    def snap_time(self, time_ms):
+        """Return the time to use for a split point placed at the given time."""
+        if self.snap_to_silences and self.silence_map is not None:
+            time_ms = self.silence_map.snap_ms(time_ms, self.silence_snap_tolerance)
+        # Keyframes win over silences, as stream copy can only cut there
+        if self.snap_to_keyframes and self.keyframe_index is not None:
+            return self.keyframe_index.nearest_ms(time_ms)
+        return time_ms
+
     def add_split_point(self, current_time):
         """Add a new split point at the current time."""
+        current_time = self.snap_time(current_time)
+
+        if self.split_points and self.split_points[-1].end_time is None:
+            # Generated plans end with a segment running to the end of the
+            # video; cut the segment containing the time in two instead
+            self.split_segment(current_time)
+            return
+
         # If this is the first split point, set start to 0
         if not self.split_points:
             start_time = 0
         else:
             # Use the end time of the last split point as start
             start_time = self.split_points[-1].end_time
-            
-        split_point = SplitPoint(start_time, current_time)
-        self.split_points.append(split_point)
-        
-        # Update the table
+
+        # Only the new row is added; the existing rows are left alone
+        row = len(self.split_points)
+        self.split_points_model.beginInsertRows(QModelIndex(), row, row)
+        self.split_points.append(SplitPoint(start_time, current_time))
+        self.split_points_model.endInsertRows()
+
+    def split_segment(self, time_ms):
+        """Cut the segment containing a time in two; times on a boundary are ignored."""
+        row = bisect_right(self.split_points, time_ms, key=lambda point: point.start_time) - 1
+        if row < 0:
+            return
+        point = self.split_points[row]
+        if time_ms <= point.start_time or (point.end_time is not None and time_ms >= point.end_time):
+            return
+        new_point = SplitPoint(time_ms, point.end_time)
+        new_point.selected = point.selected
+        point.end_time = time_ms
+        self.split_points_model.beginInsertRows(QModelIndex(), row + 1, row + 1)
+        self.split_points.insert(row + 1, new_point)
+        self.split_points_model.endInsertRows()
+        self.split_points_model.rows_changed(row, row + 1)
+
+    def set_split_points(self, split_points):
+        """Replace all split points at once, e.g. with a generated plan."""
+        self.split_points = list(split_points)
         self.update_table()
-        
-        # If this is not the first point, also update the previous point's end time
-        if len(self.split_points) > 1:
-            self.split_points[-2].end_time = start_time
-            self.update_table()
-            
+
     def update_table(self):
         """Update the table display with current split points."""
-        # Block signals during update to prevent recursive calls
-        self.blockSignals(True)
-        
-        self.setRowCount(len(self.split_points))
-        
-        for i, point in enumerate(self.split_points):
-            # Checkbox column
-            checkbox = QCheckBox()
-            checkbox.setChecked(point.selected)
-            
-            # Create a widget to center the checkbox
-            checkbox_widget = QWidget()
-            layout = QHBoxLayout(checkbox_widget)
-            layout.addWidget(checkbox)
-            layout.setAlignment(Qt.AlignCenter)
-            layout.setContentsMargins(0, 0, 0, 0)
-            
-            checkbox.stateChanged.connect(lambda state, row=i: self.toggle_selection(row, state))
-            self.setCellWidget(i, 0, checkbox_widget)
-            
-            # Start time
-            start_item = QTableWidgetItem(self.format_time(point.start_time))
-            self.setItem(i, 1, start_item)
-            
-            # End time
-            end_item = QTableWidgetItem(self.format_time(point.end_time))
-            self.setItem(i, 2, end_item)
-            
-            # Duration
-            duration_item = QTableWidgetItem(self.format_time(point.duration))
-            duration_item.setFlags(duration_item.flags() & ~Qt.ItemIsEditable)  # Make duration non-editable
-            self.setItem(i, 3, duration_item)
-            
-        self.blockSignals(False)
-        
+        self.split_points_model.beginResetModel()
+        self.split_points_model.endResetModel()
+
     def toggle_selection(self, row, state):
         """Toggle the selection state of a split point."""
         if row < len(self.split_points):
             self.split_points[row].selected = (state == Qt.Checked)
-            
-    def cell_edited(self, row, column):
-        """Handle manual editing of time cells."""
+
+    def cell_edited(self, row, column, time_str):
+        """
+        Handle manual editing of time cells.
+
+        Returns:
+            bool: True if the time was valid and applied.
+        """
         if row >= len(self.split_points) or column not in [1, 2]:
-            return
-            
+            return False
+
         try:
-            # Get the edited text
-            time_str = self.item(row, column).text()
-            time_ms = self.parse_time(time_str)
-            
-            # Update the appropriate time
-            if column == 1:  # Start time
-                self.split_points[row].start_time = time_ms
-                
-                # Update previous end time if needed
-                if row > 0:
-                    self.split_points[row-1].end_time = time_ms
-            else:  # End time
-                self.split_points[row].end_time = time_ms
-                
-                # Update next start time if needed
-                if row < len(self.split_points) - 1:
-                    self.split_points[row+1].start_time = time_ms
-                    
-            # Update the table to reflect changes
-            self.update_table()
-            
+            time_ms = self.snap_time(self.parse_time(time_str))
         except ValueError:
-            # Reset to original value if parsing fails
-            self.update_table()
-            
+            # The cell keeps showing the original value
+            return False
+
+        # Update the appropriate time
+        if column == 1:  # Start time
+            self.split_points[row].start_time = time_ms
+
+            # Update previous end time if needed
+            if row > 0:
+                self.split_points[row-1].end_time = time_ms
+        else:  # End time
+            self.split_points[row].end_time = time_ms
+
+            # Update next start time if needed
+            if row < len(self.split_points) - 1:
+                self.split_points[row+1].start_time = time_ms
+
+        # Update the edited row and its neighbours to reflect changes
+        self.split_points_model.rows_changed(row - 1, row + 2)
+        return True
+
     def parse_time(self, time_str):
         """Parse a time string (HH:MM:SS.mmm) to milliseconds."""
         try:
             hours, minutes, rest = time_str.split(':')
             seconds, milliseconds = rest.split('.')
-            
+
             total_ms = (int(hours) * 3600 + int(minutes) * 60 + int(seconds)) * 1000 + int(milliseconds)
             return total_ms
         except ValueError:
             raise ValueError(f"Invalid time format: {time_str}")
-            
+
     def format_time(self, ms):
-        """Format milliseconds as HH:MM:SS.mmm."""
+        """Format milliseconds as HH:MM:SS.mmm; None stands for the end of the video."""
         if ms is None:
-            return "00:00:00.000"
-            
+            return "End of video"
+
         seconds = ms // 1000
         minutes = seconds // 60
         hours = minutes // 60
-        
+
         return f"{hours:02d}:{minutes % 60:02d}:{seconds % 60:02d}.{ms % 1000:03d}"
-        
+
     def get_selected_points(self):
         """Get a list of selected split points."""
         return [point for point in self.split_points if point.selected]
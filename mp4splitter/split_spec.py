@@ -0,0 +1,149 @@
+"""
+Split specifications for the MP4 Splitter application.
+
+Turns cut times, ``start,end`` ranges, CSV files and JSON documents into
+SplitPoint lists for the command line and the job service.
+"""
+
+import csv
+import json
+import math
+import sys
+
+from mp4splitter.split_point import SplitPoint
+
+
+def parse_time(value):
+    """
+    Parse a time given as seconds ("90.5") or as [HH:]MM:SS[.mmm].
+
+    Returns:
+        int: The time in milliseconds.
+
+    Raises:
+        ValueError: If the value is not a valid time.
+    """
+    value = str(value).strip()
+    parts = value.split(":")
+    if len(parts) > 3 or not all(parts):
+        raise ValueError(f"Invalid time: {value}")
+    seconds = 0.0
+    for part in parts:
+        number = float(part)
+        # Every component must count forward; "inf" and "nan" are not times
+        if not math.isfinite(number) or number < 0:
+            raise ValueError(f"Invalid time: {value}")
+        seconds = seconds * 60 + number
+    return int(round(seconds * 1000))
+
+
+def points_from_cuts(cut_times):
+    """
+    Build split points from a list of cut times in milliseconds.
+
+    The video is cut at every time, so N cuts give N + 1 segments; the last
+    one runs to the end of the video.
+    """
+    cuts = sorted(set(t for t in cut_times if t > 0))
+    starts = [0] + cuts
+    ends = cuts + [None]
+    return [SplitPoint(start, end) for start, end in zip(starts, ends)]
+
+
+def points_from_ranges(ranges):
+    """
+    Build split points from ``(start, end)`` pairs.
+
+    Only the last segment of the video may leave its end open (None or an
+    empty string), and segments must not overlap.
+
+    Raises:
+        ValueError: If a time is invalid or the segments do not fit together.
+    """
+    points = []
+    for start, end in ranges:
+        start_ms = parse_time(start)
+        end_ms = parse_time(end) if end not in (None, "") else None
+        if end_ms is not None and end_ms <= start_ms:
+            raise ValueError(f"Segment end {end} is not after its start {start}")
+        points.append(SplitPoint(start_ms, end_ms))
+
+    ordered = sorted(points, key=lambda point: point.start_time)
+    for point, following in zip(ordered, ordered[1:]):
+        if point.end_time is None:
+            raise ValueError("Only the last segment may run to the end of the video")
+        if following.start_time < point.end_time:
+            raise ValueError("Segments must not overlap")
+    return points
+
+
+def points_from_json(data):
+    """
+    Build split points from decoded JSON.
+
+    Accepts a list of ``{"start": ..., "end": ...}`` objects or
+    ``[start, end]`` pairs, or an object with a ``"cuts"`` list of cut
+    times.
+
+    Raises:
+        ValueError: If the data is not a valid split spec.
+    """
+    if isinstance(data, dict):
+        if "cuts" not in data:
+            raise ValueError("JSON split spec objects must have a \"cuts\" list")
+        return points_from_cuts([parse_time(t) for t in data["cuts"]])
+    if not isinstance(data, list):
+        raise ValueError("A JSON split spec must be a list or an object")
+
+    ranges = []
+    for entry in data:
+        if isinstance(entry, dict):
+            if "start" not in entry:
+                raise ValueError("Every segment needs a \"start\" time")
+            ranges.append((entry["start"], entry.get("end")))
+        elif isinstance(entry, list) and entry:
+            ranges.append((entry[0], entry[1] if len(entry) > 1 else None))
+        else:
+            raise ValueError(f"Invalid segment: {entry!r}")
+    return points_from_ranges(ranges)
+
+
+def load_split_spec(path, spec_format=None):
+    """
+    Read split points from a CSV or JSON file ("-" reads standard input).
+
+    CSV files hold one segment per row as ``start,end`` (a header row is
+    allowed; an empty end means "to the end of the video"). JSON files are
+    read with ``points_from_json``. Times are seconds or [HH:]MM:SS[.mmm]
+    strings.
+
+    Args:
+        path: Path of the file.
+        spec_format: "csv" or "json"; guessed from the extension if None.
+
+    Returns:
+        list: SplitPoint objects.
+
+    Raises:
+        ValueError: If the file content is not a valid split spec.
+    """
+    if spec_format is None:
+        spec_format = "json" if path.lower().endswith(".json") else "csv"
+
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+
+    if spec_format == "json":
+        return points_from_json(json.loads(text))
+
+    rows = [row for row in csv.reader(text.splitlines()) if row and any(row)]
+    if rows:
+        try:
+            parse_time(rows[0][0])
+        except ValueError:
+            # Header row
+            rows = rows[1:]
+    return points_from_ranges((row[0], row[1] if len(row) > 1 else None) for row in rows)
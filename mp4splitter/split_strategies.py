@@ -0,0 +1,569 @@
+"""
+Segment writing strategies for the MP4 Splitter application.
+
+Each strategy knows how to turn a time range of the source video into a
+standalone MP4 file. ``VideoSplitter`` picks one per job by name.
+"""
+
+import os
+import tempfile
+import time
+from multiprocessing.util import Finalize
+
+from moviepy.video.io.VideoFileClip import VideoFileClip
+
+from mp4splitter.decode_pipeline import DecodePipeline, FrameConsumer
+from mp4splitter.encoder_profiles import DEFAULT_PROFILE, get_profile
+from mp4splitter.cancellation import OperationCancelled
+from mp4splitter.ffmpeg_tools import (FrameEncoder, run_ffmpeg, probe_audio_codec, probe_duration,
+                                      probe_start_time, probe_video_codec)
+from mp4splitter.keyframe_index import get_keyframe_index
+from mp4splitter.mp4 import MP4Error, parse_mp4, remux_segment
+from mp4splitter.progress import REPORT_INTERVAL
+
+# Tolerance when comparing a requested cut time to a keyframe time
+KEYFRAME_TOLERANCE = 0.001
+
+# Source audio codecs that can be stream copied into an MP4 segment as is
+COPYABLE_AUDIO_CODECS = ("aac",)
+
+# Seconds stream copied past the end of a smart cut segment, so the frames
+# it presents last still have the later reference frames they decode from;
+# the edit list of the segment hides everything past the end
+REORDER_MARGIN = 0.5
+
+
+def source_range_input(video_path, start_sec, end_sec):
+    """Return ffmpeg input arguments reading a time range of the source."""
+    return ["-ss", f"{start_sec:.6f}", "-t", f"{end_sec - start_sec:.6f}", "-i", video_path]
+
+
+class SplitStrategy:
+    """
+    Base class for segment writing strategies.
+    """
+    name = None
+    label = None
+    # Strategies that write all segments from one pass over the source
+    # implement write_segments() instead of write_segment()
+    single_pass = False
+    # Strategies that encode new video use the settings of ``profile``
+    reencodes = True
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        self.video_path = None
+        self.duration = 0
+        self.profile = get_profile(profile)
+        # Codec of the source audio, probed by strategies that re-encode video
+        self.audio_codec = None
+        # threading.Event set by the splitter when the job is cancelled
+        self.cancel_event = None
+        # Callable receiving (index, seconds written) while a segment is written
+        self.progress_callback = None
+
+    def open(self, video_path):
+        """Prepare the strategy for writing segments of the given video."""
+        self.video_path = video_path
+
+    def write_segment(self, index, start_sec, end_sec, output_path):
+        """
+        Write a single segment to disk.
+
+        Args:
+            index: Zero-based position of the segment in the job.
+            start_sec: Segment start in seconds.
+            end_sec: Segment end in seconds.
+            output_path: Path of the MP4 file to create.
+        """
+        raise NotImplementedError
+
+    def write_segments(self, plan, segment_started, segment_finished):
+        """
+        Write every segment of a job at once (single-pass strategies only).
+
+        Args:
+            plan: List of ``(index, start_sec, end_sec, output_filename,
+                output_path)`` tuples.
+            segment_started: Callback taking ``(index, output_filename)``.
+            segment_finished: Callback taking ``(index,)``.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the strategy."""
+
+    def audio_output_args(self):
+        """
+        Return the ffmpeg output arguments for the audio of a segment.
+
+        AAC audio is stream copied from the source, anything else is encoded
+        with the settings of the encoder profile.
+        """
+        if self.audio_codec in COPYABLE_AUDIO_CODECS:
+            return ["-c:a", "copy"]
+        return self.profile.audio_args()
+
+    def report_progress(self, index, done_sec):
+        """Report how many seconds of a segment have been written."""
+        if self.progress_callback is not None:
+            self.progress_callback(index, done_sec)
+
+
+class ReencodeStrategy(SplitStrategy):
+    """
+    Frame-accurate splitting that decodes and re-encodes every segment.
+
+    Frames are decoded by MoviePy and piped straight into an ffmpeg encoder,
+    which reads the audio from the matching range of the source itself, so
+    no temporary audio file is written.
+    """
+    name = "reencode"
+    label = "Re-encode (frame accurate)"
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        super().__init__(profile)
+        self.video = None
+
+    def open(self, video_path):
+        super().open(video_path)
+        # Audio is read by the encoder, MoviePy only needs to decode video
+        self.video = VideoFileClip(video_path, audio=False)
+        self.duration = self.video.duration
+        self.audio_codec = probe_audio_codec(video_path)
+
+    def write_segment(self, index, start_sec, end_sec, output_path):
+        # Extract the segment - using the new API for MoviePy 2.0+
+        segment = self.video.subclipped(start_sec, end_sec)
+        fps = self.video.fps
+
+        encoder = FrameEncoder(
+            output_path,
+            segment.size,
+            fps,
+            extra_inputs=source_range_input(self.video_path, start_sec, end_sec),
+            output_args=["-map", "0:v", "-map", "1:a?",
+                         *self.profile.video_args(), "-pix_fmt", "yuv420p",
+                         *self.audio_output_args(),
+                         "-movflags", "+faststart"],
+        )
+        try:
+            for frame_number, frame in enumerate(segment.iter_frames(fps=fps, dtype="uint8")):
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    raise OperationCancelled()
+                encoder.write_frame(frame.tobytes())
+                self.report_progress(index, (frame_number + 1) / fps)
+        except BaseException:
+            encoder.kill()
+            raise
+        encoder.close()
+
+    def close(self):
+        if self.video is not None:
+            self.video.close()
+            self.video = None
+
+
+class CopyStrategy(SplitStrategy):
+    """
+    Lossless splitting that remuxes the existing packets without decoding.
+
+    Cuts land on the keyframe at or before each requested start time, so a
+    segment may begin slightly earlier than asked for. MP4 sources are
+    remuxed natively by ``mp4splitter.mp4``; anything it cannot handle
+    (other containers, fragmented MP4) is stream copied through ffmpeg.
+    """
+    name = "copy"
+    label = "Stream copy (lossless, keyframe cuts)"
+    reencodes = False
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        super().__init__(profile)
+        self.movie = None
+
+    def open(self, video_path):
+        super().open(video_path)
+        try:
+            self.movie = parse_mp4(video_path)
+            self.duration = self.movie.duration_seconds
+        except (MP4Error, OSError):
+            self.movie = None
+            self.duration = probe_duration(video_path)
+
+    def write_segment(self, index, start_sec, end_sec, output_path):
+        if self.movie is not None:
+            try:
+                remux_segment(
+                    self.movie, start_sec, end_sec, output_path, self.cancel_event,
+                    lambda fraction: self.report_progress(index, fraction * (end_sec - start_sec))
+                )
+                return
+            except MP4Error:
+                pass
+
+        run_ffmpeg([
+            "-ss", f"{start_sec:.3f}",
+            "-i", self.video_path,
+            "-t", f"{end_sec - start_sec:.3f}",
+            "-map", "0:v?", "-map", "0:a?",
+            "-c", "copy",
+            "-avoid_negative_ts", "make_zero",
+            "-movflags", "+faststart",
+            output_path,
+        ], self.cancel_event, lambda done_sec: self.report_progress(index, done_sec))
+
+
+class SmartCutStrategy(SplitStrategy):
+    """
+    Frame-accurate splitting that only re-encodes the partial GOP at each cut.
+
+    The video frames between the requested start and the next keyframe are
+    re-encoded, the rest of the video is stream copied, and the two parts
+    are spliced with H.264 parameter sets carried in-band, so the copied
+    part still decodes after the re-encoded one. The audio of the segment is
+    taken from the source in one piece and muxed with the spliced video
+    afterwards: AAC is copied, anything else encoded with the profile, so
+    the audio never mixes codecs or gets an encoder gap at the splice.
+
+    Stream copy cuts the end of a segment in decode order, which would keep
+    reordered frames shown after the end and drop some shown before it. The
+    copied part therefore runs a little past the end, and the segment is
+    finally remuxed by ``mp4splitter.mp4``, whose edit list presents exactly
+    the requested range. Segments copied whole from an MP4 source are
+    remuxed from it directly.
+
+    The ``avcC`` record of the segment holds the parameter sets of the
+    re-encoded head; the copied tail relies on the source's parameter sets
+    repeated in-band before its keyframes. The segment is therefore written
+    with the ``avc3`` sample entry, which declares that parameter sets may
+    change in-band, instead of ``avc1``.
+    Sources that are not H.264 fall back to a full re-encode of the segment.
+    """
+    name = "smart"
+    label = "Smart cut (frame accurate, re-encode cut GOPs only)"
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        super().__init__(profile)
+        self.keyframes = None
+        self.can_splice = False
+        self.movie = None
+
+    def open(self, video_path):
+        super().open(video_path)
+        self.duration = probe_duration(video_path)
+        self.audio_codec = probe_audio_codec(video_path)
+        self.can_splice = probe_video_codec(video_path) == "h264"
+        self.keyframes = get_keyframe_index(video_path) if self.can_splice else None
+        try:
+            self.movie = parse_mp4(video_path)
+        except (MP4Error, OSError):
+            self.movie = None
+
+    def write_segment(self, index, start_sec, end_sec, output_path):
+        keyframe = None
+        if self.can_splice:
+            keyframe = self.keyframes.at_or_after(start_sec, KEYFRAME_TOLERANCE)
+
+        # No keyframe inside the segment: there is nothing to copy
+        if keyframe is None or keyframe >= end_sec - KEYFRAME_TOLERANCE:
+            self.encode_range(start_sec, end_sec, output_path,
+                              progress_callback=lambda done: self.report_progress(index, done))
+            return
+
+        # The cut already lands on a keyframe: copy the whole segment
+        if keyframe - start_sec <= KEYFRAME_TOLERANCE:
+            self.copy_segment(index, keyframe, end_sec, output_path)
+            return
+
+        with tempfile.TemporaryDirectory(prefix="mp4splitter_") as temp_dir:
+            head_path = os.path.join(temp_dir, "head.mkv")
+            tail_path = os.path.join(temp_dir, "tail.mkv")
+            video_path = os.path.join(temp_dir, "video.mkv")
+            list_path = os.path.join(temp_dir, "parts.txt")
+            spliced_path = os.path.join(temp_dir, "spliced.mp4")
+
+            # Only video is spliced; the audio is added in one piece below
+            splice_args = ["-an", "-bsf:v", "h264_mp4toannexb", "-f", "matroska"]
+            head_duration = keyframe - start_sec
+            # A fine encoder time base keeps the head frames at their source
+            # times instead of rounding them to whole frame durations
+            self.encode_range(start_sec, keyframe, head_path,
+                              ["-enc_time_base:v", "1:90000", *splice_args],
+                              lambda done: self.report_progress(index, done))
+            self.copy_range(keyframe, end_sec + REORDER_MARGIN, tail_path, splice_args,
+                            lambda done: self.report_progress(index, head_duration + done))
+
+            # The first frame is the first one presented at or after the
+            # cut, which may be a little after it; the segment starts there
+            first_frame = start_sec + probe_start_time(head_path)
+
+            with open(list_path, "w", encoding="utf-8") as f:
+                # The concat demuxer starts every part at its first frame, so
+                # the head lasts until the keyframe the tail starts on
+                f.write(f"file '{head_path}'\n")
+                f.write(f"duration {keyframe - first_frame:.6f}\n")
+                f.write(f"file '{tail_path}'\n")
+
+            run_ffmpeg([
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-c", "copy",
+                "-f", "matroska",
+                video_path,
+            ], self.cancel_event)
+
+            run_ffmpeg([
+                "-i", video_path,
+                *source_range_input(self.video_path, first_frame, end_sec),
+                "-map", "0:v", "-map", "1:a?",
+                "-c:v", "copy", "-tag:v", "avc3",
+                *self.audio_output_args(),
+                spliced_path,
+            ], self.cancel_event)
+            remux_segment(spliced_path, 0.0, end_sec - first_frame, output_path, self.cancel_event)
+
+    def copy_segment(self, index, start_sec, end_sec, output_path):
+        """Stream copy a segment starting on a keyframe, ending exactly at ``end_sec``."""
+        def copied(done):
+            self.report_progress(index, min(done, end_sec - start_sec))
+
+        if self.movie is not None:
+            try:
+                remux_segment(self.movie, start_sec, end_sec, output_path, self.cancel_event,
+                              lambda fraction: copied(fraction * (end_sec - start_sec)))
+                return
+            except MP4Error:
+                pass
+
+        with tempfile.TemporaryDirectory(prefix="mp4splitter_") as temp_dir:
+            copy_path = os.path.join(temp_dir, "copy.mp4")
+            self.copy_range(start_sec, end_sec + REORDER_MARGIN, copy_path,
+                            progress_callback=copied)
+            remux_segment(copy_path, 0.0, end_sec - start_sec, output_path, self.cancel_event)
+
+    def encode_range(self, start_sec, end_sec, output_path, extra_args=(), progress_callback=None):
+        """Re-encode a time range of the source to the given file."""
+        run_ffmpeg([
+            "-ss", f"{start_sec:.6f}",
+            "-i", self.video_path,
+            "-t", f"{end_sec - start_sec:.6f}",
+            "-map", "0:v?", "-map", "0:a?",
+            *self.profile.video_args(),
+            *self.audio_output_args(),
+            *extra_args,
+            output_path,
+        ], self.cancel_event, progress_callback)
+
+    def copy_range(self, start_sec, end_sec, output_path, extra_args=(), progress_callback=None):
+        """Stream copy a time range of the source, starting on a keyframe."""
+        run_ffmpeg([
+            "-ss", f"{start_sec:.6f}",
+            "-i", self.video_path,
+            "-t", f"{end_sec - start_sec:.6f}",
+            "-map", "0:v?", "-map", "0:a?",
+            "-c", "copy",
+            "-avoid_negative_ts", "make_zero",
+            *extra_args,
+            output_path,
+        ], self.cancel_event, progress_callback)
+
+
+class SegmentFanOut(FrameConsumer):
+    """
+    Routes decoded frames to one encoder per segment.
+
+    An encoder is started when the first frame of its segment arrives and
+    closed as soon as a frame past its end is seen, so only the segments
+    overlapping the current position hold an ffmpeg process.
+    """
+    def __init__(self, video_path, plan, segment_started, segment_finished,
+                 progress_callback=None, profile=DEFAULT_PROFILE, audio_args=None):
+        self.video_path = video_path
+        self.profile = get_profile(profile)
+        self.audio_args = audio_args if audio_args is not None else self.profile.audio_args()
+        # Sorted by start time so segments can be opened with a single cursor
+        self.pending = sorted(plan, key=lambda segment: segment[1])
+        self.segment_started = segment_started
+        self.segment_finished = segment_finished
+        self.progress_callback = progress_callback
+        self.active = []  # (segment, encoder) pairs
+        self.pipeline = None
+
+    def start(self, pipeline):
+        self.pipeline = pipeline
+
+    def process_frame(self, index, time_sec, frame):
+        while self.pending and self.pending[0][1] <= time_sec:
+            self.open_segment(self.pending.pop(0))
+
+        still_active = []
+        for segment, encoder in self.active:
+            if time_sec >= segment[2]:
+                self.close_segment(segment, encoder)
+            else:
+                encoder.write_frame(frame)
+                still_active.append((segment, encoder))
+                if self.progress_callback is not None:
+                    self.progress_callback(segment[0], time_sec - segment[1])
+        self.active = still_active
+
+    def finish(self):
+        # Segments reaching the end of the source, then any that started past it
+        for segment, encoder in self.active:
+            self.close_segment(segment, encoder)
+        self.active = []
+        while self.pending:
+            segment = self.pending.pop(0)
+            self.open_segment(segment)
+            self.close_segment(*self.active.pop())
+
+    def abort(self):
+        for segment, encoder in self.active:
+            encoder.kill()
+            output_path = segment[4]
+            if os.path.exists(output_path):
+                os.remove(output_path)
+        self.active = []
+
+    def open_segment(self, segment):
+        """Start the encoder for a segment."""
+        index, start_sec, end_sec, output_filename, output_path = segment
+        self.segment_started(index, output_filename)
+        encoder = FrameEncoder(
+            output_path,
+            self.pipeline.size,
+            self.pipeline.fps,
+            pix_fmt=self.pipeline.pix_fmt,
+            # Audio comes straight from the matching range of the source
+            extra_inputs=source_range_input(self.video_path, start_sec, end_sec),
+            output_args=["-map", "0:v", "-map", "1:a?",
+                         *self.profile.video_args(), "-pix_fmt", "yuv420p",
+                         *self.audio_args,
+                         "-movflags", "+faststart"],
+        )
+        self.active.append((segment, encoder))
+
+    def close_segment(self, segment, encoder):
+        """Finish the encoder for a segment."""
+        encoder.close()
+        self.segment_finished(segment[0])
+
+
+class FanOutStrategy(SplitStrategy):
+    """
+    Frame-accurate splitting that decodes the source exactly once.
+
+    Frames are read sequentially and routed to the encoder of every segment
+    they belong to, so adjacent or overlapping segments never decode the
+    same GOP twice and the reader never seeks.
+    """
+    name = "fanout"
+    label = "Single decode (re-encode, one pass)"
+    single_pass = True
+
+    def open(self, video_path):
+        super().open(video_path)
+        self.duration = probe_duration(video_path)
+        self.audio_codec = probe_audio_codec(video_path)
+
+    def write_segments(self, plan, segment_started, segment_finished):
+        pipeline = DecodePipeline(self.video_path)
+        pipeline.add_consumer(SegmentFanOut(self.video_path, plan, segment_started,
+                                            segment_finished, self.report_progress,
+                                            self.profile, self.audio_output_args()))
+        pipeline.run(self.cancel_event)
+
+
+# Available strategies, keyed by the mode name used in the API and the GUI
+STRATEGIES = {
+    ReencodeStrategy.name: ReencodeStrategy,
+    CopyStrategy.name: CopyStrategy,
+    SmartCutStrategy.name: SmartCutStrategy,
+    FanOutStrategy.name: FanOutStrategy,
+}
+
+DEFAULT_MODE = ReencodeStrategy.name
+
+
+def create_strategy(mode, profile=DEFAULT_PROFILE):
+    """
+    Create a strategy instance for the given mode name.
+
+    Args:
+        mode: Name of the split mode, see ``STRATEGIES``.
+        profile: Encoder profile name or ``EncoderProfile`` used by
+            re-encoding modes.
+
+    Raises:
+        ValueError: If the mode or the profile is not known.
+    """
+    if mode not in STRATEGIES:
+        raise ValueError(f"Unknown split mode: {mode}")
+    return STRATEGIES[mode](profile)
+
+
+# Strategy owned by the current worker process when splitting in parallel
+_worker_strategy = None
+
+# Queue the current worker process reports to, or None
+_worker_progress_queue = None
+
+
+class QueueProgressReporter:
+    """
+    Progress callback for worker processes that forwards reports to a queue.
+
+    Reports are ``(index, seconds written)`` tuples, throttled per segment
+    so the queue stays small.
+    """
+    def __init__(self, progress_queue, interval=REPORT_INTERVAL):
+        self.progress_queue = progress_queue
+        self.interval = interval
+        self.last_report = {}
+
+    def __call__(self, index, done_sec):
+        now = time.monotonic()
+        if now - self.last_report.get(index, 0.0) >= self.interval:
+            self.last_report[index] = now
+            self.progress_queue.put((index, done_sec))
+
+
+def init_segment_worker(mode, video_path, progress_queue=None, profile=DEFAULT_PROFILE,
+                        cancel_event=None):
+    """
+    Process pool initializer: open a strategy on the source for this worker.
+
+    Args:
+        mode: Split mode name.
+        video_path: Path to the source video.
+        progress_queue: Optional multiprocessing queue receiving
+            ``(index, None)`` when a segment starts and
+            ``(index, seconds written)`` while it is written.
+        profile: Encoder profile name or ``EncoderProfile``.
+        cancel_event: Optional multiprocessing event shared by the pool;
+            setting it stops the segments being written.
+
+    The strategy is closed when the worker process shuts down.
+    """
+    global _worker_strategy, _worker_progress_queue
+    _worker_strategy = create_strategy(mode, profile)
+    _worker_strategy.cancel_event = cancel_event
+    _worker_progress_queue = progress_queue
+    if progress_queue is not None:
+        _worker_strategy.progress_callback = QueueProgressReporter(progress_queue)
+    _worker_strategy.open(video_path)
+    Finalize(_worker_strategy, _worker_strategy.close, exitpriority=10)
+
+
+def write_segment_in_worker(index, start_sec, end_sec, output_path):
+    """Write one segment with the strategy opened by ``init_segment_worker``."""
+    if _worker_strategy.cancel_event is not None and _worker_strategy.cancel_event.is_set():
+        raise OperationCancelled()
+    if _worker_progress_queue is not None:
+        _worker_progress_queue.put((index, None))
+    try:
+        _worker_strategy.write_segment(index, start_sec, end_sec, output_path)
+    except OperationCancelled:
+        # Don't leave a truncated segment behind
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    return index
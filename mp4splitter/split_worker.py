@@ -0,0 +1,40 @@
+"""
+Background split worker for the MP4 Splitter application.
+"""
+
+import copy
+
+from PySide6.QtCore import QThread
+
+from mp4splitter.encoder_profiles import DEFAULT_PROFILE
+from mp4splitter.split_strategies import DEFAULT_MODE
+from mp4splitter.video_splitter import VideoSplitter
+
+
+class SplitWorker(QThread):
+    """
+    Thread that runs a single split job off the GUI thread.
+
+    The job settings and split points are copied when the worker is created,
+    so the GUI can load another video or edit split points while it runs.
+    Connect to the signals of ``splitter``; they are emitted from the worker
+    thread and delivered to GUI objects through queued connections.
+    """
+    def __init__(self, video_path, output_dir, split_points, mode=DEFAULT_MODE, workers=1,
+                 profile=DEFAULT_PROFILE, parent=None):
+        super().__init__(parent)
+        self.splitter = VideoSplitter(video_path, output_dir, mode, workers, profile)
+        self.split_points = copy.deepcopy(split_points)
+
+    @property
+    def segment_count(self):
+        """Number of segments in the job."""
+        return len(self.split_points)
+
+    def run(self):
+        """Run the split job (executed in the worker thread)."""
+        self.splitter.split_video(self.split_points)
+
+    def cancel(self):
+        """Request cancellation of the job. Safe to call from the GUI thread."""
+        self.splitter.cancel()
@@ -0,0 +1,330 @@
+"""
+Keyframe thumbnails for the MP4 Splitter application.
+
+Thumbnails are only taken at keyframes: ffmpeg seeks straight to one and
+decodes that single frame, skipping every other frame, so a thumbnail
+costs a few tens of milliseconds whatever the length of the file. They
+are stored as small JPEG images in the persistent metadata cache, and
+``ThumbnailLoader`` produces them on a thread pool so the GUI thread
+never decodes video.
+"""
+
+import subprocess
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from moviepy.config import FFMPEG_BINARY
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage
+
+from mp4splitter.cache import get_cache
+from mp4splitter.keyframe_index import get_keyframe_index
+
+# Height of the thumbnails in pixels; the width follows the aspect ratio
+THUMBNAIL_HEIGHT = 90
+
+# Thumbnails kept decoded in memory (about 60 KB each at 16:9)
+MEMORY_CACHE_SIZE = 512
+
+# JPEG quality scale of ffmpeg's mjpeg encoder (2 is best, 31 worst)
+THUMBNAIL_QUALITY = 5
+
+# Seconds past a keyframe the seek aims at, so a seek time printed with
+# limited precision never lands just before the keyframe and on the GOP
+# before it; far shorter than any frame, so it never reaches the next one
+SEEK_MARGIN = 0.0005
+
+
+def extract_thumbnail(video_path, time_sec, height=THUMBNAIL_HEIGHT):
+    """
+    Decode the keyframe at or before a time as a JPEG thumbnail.
+
+    Args:
+        video_path: Path to the video.
+        time_sec: Time of the keyframe in seconds.
+        height: Height of the thumbnail in pixels.
+
+    Returns:
+        bytes: The JPEG image.
+
+    Raises:
+        RuntimeError: If ffmpeg cannot decode a frame there.
+    """
+    seek_time = time_sec + SEEK_MARGIN
+    cmd = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+           # Only keyframes are decoded, and the seek lands on one
+           "-skip_frame", "nokey", "-ss", f"{seek_time:.6f}", "-noaccurate_seek",
+           "-i", video_path, "-map", "0:v:0", "-an", "-sn", "-frames:v", "1",
+           "-vf", f"scale=-2:{height}", "-c:v", "mjpeg", "-q:v", str(THUMBNAIL_QUALITY),
+           "-f", "image2pipe", "-"]
+    result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE)
+    if result.returncode != 0 or not result.stdout:
+        message = result.stderr.decode(errors="replace").strip()
+        raise RuntimeError(message or f"No frame decoded at {time_sec:.3f}s")
+    return result.stdout
+
+
+def get_thumbnail(video_path, time_sec, height=THUMBNAIL_HEIGHT):
+    """
+    Return the JPEG thumbnail of the keyframe at a time, using the cache.
+
+    Args:
+        video_path: Path to the video.
+        time_sec: Exact time of the keyframe in seconds, as listed in its
+            keyframe index; the cache only keys it by millisecond.
+        height: Height of the thumbnail in pixels.
+
+    Returns:
+        bytes: The JPEG image.
+
+    Raises:
+        RuntimeError: If ffmpeg cannot decode a frame there.
+    """
+    cache = get_cache()
+    key = f"{height}:{int(round(time_sec * 1000))}"
+    if cache is not None:
+        stored = cache.get("thumbnail", video_path, key)
+        if stored is not None:
+            return stored
+    image = extract_thumbnail(video_path, time_sec, height)
+    if cache is not None:
+        cache.put("thumbnail", video_path, image, key)
+    return image
+
+
+class ThumbnailCache:
+    """
+    Bounded in-memory store of decoded thumbnails with least recently used eviction.
+
+    Only used from the GUI thread.
+
+    Args:
+        capacity: Maximum number of thumbnails kept.
+        evicted: Optional callable receiving the time of every evicted thumbnail.
+    """
+    def __init__(self, capacity=MEMORY_CACHE_SIZE, evicted=None):
+        self.capacity = capacity
+        self.evicted = evicted
+        self.images = OrderedDict()
+        self.times = []  # sorted keys of ``images``
+
+    def __len__(self):
+        return len(self.images)
+
+    def __contains__(self, time_ms):
+        return time_ms in self.images
+
+    def get(self, time_ms):
+        """Return the thumbnail of a keyframe time, or None, marking it as used."""
+        image = self.images.get(time_ms)
+        if image is not None:
+            self.images.move_to_end(time_ms)
+        return image
+
+    def put(self, time_ms, image):
+        """Store a thumbnail, evicting the least recently used ones over capacity."""
+        if time_ms not in self.images:
+            insort(self.times, time_ms)
+        self.images[time_ms] = image
+        self.images.move_to_end(time_ms)
+        while len(self.images) > self.capacity:
+            oldest, _ = self.images.popitem(last=False)
+            del self.times[bisect_left(self.times, oldest)]
+            if self.evicted is not None:
+                self.evicted(oldest)
+
+    def nearest(self, time_ms):
+        """Return the stored thumbnail closest to a time, or None if there are none."""
+        if not self.times:
+            return None
+        i = bisect_left(self.times, time_ms)
+        candidates = self.times[max(i - 1, 0):i + 1]
+        return self.get(min(candidates, key=lambda t: abs(t - time_ms)))
+
+    def first(self):
+        """Return any stored thumbnail without marking it as used, or None."""
+        return self.images[self.times[0]] if self.times else None
+
+    def clear(self):
+        """Remove every thumbnail."""
+        self.images.clear()
+        self.times = []
+
+
+class _Task(QRunnable):
+    """Runs one job of a ThumbnailLoader on its thread pool."""
+    def __init__(self, loader, generation, function, *args):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.function = function
+        self.args = args
+
+    def run(self):
+        # Jobs queued for a previous video are dropped without running
+        if self.generation == self.loader.generation:
+            self.function(self.generation, *self.args)
+
+
+class ThumbnailLoader(QObject):
+    """
+    Loads the keyframe index and thumbnails of a video in the background.
+
+    ``request`` queues thumbnails in the order given; the loader picks the
+    keyframe nearest to each requested time and skips keyframes that are
+    already loaded or queued. Decoded thumbnails are kept in ``images``, a
+    bounded ThumbnailCache shared by every view of the video, and
+    ``thumbnail_ready`` is emitted on the GUI thread as each one arrives.
+    The keyframe index is announced with ``index_ready``, or
+    ``index_failed`` if it cannot be read, so other parts of the window can
+    use it without reading it on the GUI thread. Loading a new video drops
+    the work queued for the previous one.
+
+    Args:
+        height: Height of the thumbnails in pixels.
+        capacity: Number of thumbnails kept in memory.
+        parent: Parent object.
+    """
+    index_ready = Signal(object)       # KeyframeIndex
+    index_failed = Signal(str)         # error message
+    thumbnail_ready = Signal(int)      # keyframe time in ms
+
+    # Results delivered from the pool threads to the GUI thread
+    _index_loaded = Signal(int, object)
+    _index_error = Signal(int, str)
+    _thumbnail_loaded = Signal(int, int, QImage)
+
+    def __init__(self, height=THUMBNAIL_HEIGHT, capacity=MEMORY_CACHE_SIZE, parent=None):
+        super().__init__(parent)
+        self.height = height
+        self.pool = QThreadPool(self)
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.video_path = None
+        self.keyframe_times = []  # keyframe times in ms, once the index is loaded
+        self.keyframe_seconds = []  # the same keyframes at their exact times
+        # Keyframes loaded or queued: time in ms -> ``wanted`` filters of the
+        # requests waiting for it, None for a request without one
+        self.queued = {}
+        self.images = ThumbnailCache(capacity, self._evicted)
+        self._index_loaded.connect(self._store_index)
+        self._index_error.connect(self._report_index_error)
+        self._thumbnail_loaded.connect(self._store_thumbnail)
+
+    def set_video(self, video_path):
+        """Start loading the keyframe index of a new video, or clear with None."""
+        self.pool.clear()
+        with self.lock:
+            self.generation += 1
+            self.video_path = video_path
+            self.keyframe_times = []
+            self.keyframe_seconds = []
+            self.queued = {}
+        self.images.clear()
+        if video_path is not None:
+            self.pool.start(_Task(self, self.generation, self._load_index, video_path))
+
+    def _load_index(self, generation, video_path):
+        try:
+            index = get_keyframe_index(video_path)
+        except Exception as e:
+            self._index_error.emit(generation, str(e))
+            return
+        with self.lock:
+            if generation != self.generation:
+                return
+            # The exact times go first: readers check keyframe_times
+            self.keyframe_seconds = list(index.times)
+            self.keyframe_times = [int(round(t * 1000)) for t in index.times]
+        self._index_loaded.emit(generation, index)
+
+    def _store_index(self, generation, index):
+        if generation == self.generation:
+            self.index_ready.emit(index)
+
+    def _report_index_error(self, generation, message):
+        if generation == self.generation:
+            self.index_failed.emit(message)
+
+    def keyframe_position(self, time_ms):
+        """Return the position of the keyframe closest to a time in ms, or None before the index is loaded."""
+        times = self.keyframe_times
+        if not times:
+            return None
+        i = bisect_left(times, time_ms)
+        if i == len(times) or (i > 0 and time_ms - times[i - 1] <= times[i] - time_ms):
+            return i - 1
+        return i
+
+    def nearest_keyframe(self, time_ms):
+        """Return the keyframe time closest to a time in ms, or None before the index is loaded."""
+        i = self.keyframe_position(time_ms)
+        return self.keyframe_times[i] if i is not None else None
+
+    def request(self, times_ms, priority=0, wanted=None):
+        """
+        Queue thumbnails for the keyframes nearest to the given times.
+
+        Args:
+            times_ms: Times in milliseconds, most wanted first.
+            priority: Thread pool priority; higher priority work runs first.
+            wanted: Optional callable receiving a keyframe time in ms; it is
+                checked when the thumbnail's turn comes, and thumbnails that
+                no request wants any more are dropped without decoding. A
+                keyframe also requested without a filter is always loaded.
+
+        Returns:
+            int: The number of thumbnails newly queued.
+        """
+        queued = 0
+        for time_ms in times_ms:
+            i = self.keyframe_position(time_ms)
+            if i is None:
+                break
+            keyframe_ms, keyframe_sec = self.keyframe_times[i], self.keyframe_seconds[i]
+            with self.lock:
+                waiters = self.queued.get(keyframe_ms)
+                if waiters is not None:
+                    # Already queued: the pending task serves this request too
+                    if wanted not in waiters:
+                        waiters.append(wanted)
+                    continue
+                self.queued[keyframe_ms] = [wanted]
+                generation, video_path = self.generation, self.video_path
+            self.pool.start(_Task(self, generation, self._load_thumbnail, video_path,
+                                  keyframe_ms, keyframe_sec),
+                            priority)
+            queued += 1
+        return queued
+
+    def _load_thumbnail(self, generation, video_path, keyframe_ms, keyframe_sec):
+        with self.lock:
+            waiters = self.queued.get(keyframe_ms, ())
+            if None not in waiters and not any(wanted(keyframe_ms) for wanted in waiters):
+                # Nobody wants it any more; let a later request queue it again
+                self.queued.pop(keyframe_ms, None)
+                return
+        try:
+            data = get_thumbnail(video_path, keyframe_sec, self.height)
+        except Exception:
+            return
+        image = QImage.fromData(data, "JPEG")
+        if not image.isNull():
+            self._thumbnail_loaded.emit(generation, keyframe_ms, image)
+
+    def _store_thumbnail(self, generation, keyframe_ms, image):
+        if generation == self.generation:
+            self.images.put(keyframe_ms, image)
+            self.thumbnail_ready.emit(keyframe_ms)
+
+    def _evicted(self, keyframe_ms):
+        # Evicted thumbnails come back from the disk cache when requested again
+        with self.lock:
+            self.queued.pop(keyframe_ms, None)
+
+    def shutdown(self):
+        """Drop queued work and wait for the running thumbnails to finish."""
+        self.set_video(None)
+        self.pool.waitForDone()
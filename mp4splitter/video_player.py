@@ -2,12 +2,21 @@
 Video player component for the MP4 Splitter application.
 """
 
+import functools
+
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                               QPushButton, QSlider, QLabel, QLineEdit)
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PySide6.QtMultimediaWidgets import QVideoWidget
 from PySide6.QtCore import Qt, QUrl, Signal
 
+from mp4splitter.analysis_worker import AnalysisWorker
+from mp4splitter.filmstrip import Filmstrip
+from mp4splitter.slider_preview import SliderPreview
+from mp4splitter.thumbnails import ThumbnailLoader
+from mp4splitter.waveform import get_waveform
+from mp4splitter.waveform_track import WaveformTrack
+
 
 class VideoPlayer(QWidget):
     """
@@ -18,6 +27,7 @@ class VideoPlayer(QWidget):
 
     def __init__(self):
         super().__init__()
+        self.waveform_worker = None
         self.setup_ui()
         self.setup_player()
 
@@ -29,9 +39,23 @@ class VideoPlayer(QWidget):
         self.video_widget = QVideoWidget()
         layout.addWidget(self.video_widget)
 
-        # Slider for seeking
+        # Keyframe thumbnails, shared by the slider preview and the filmstrip
+        self.thumbnail_loader = ThumbnailLoader(parent=self)
+
+        # Slider for seeking, previewing the keyframe under the pointer
         self.position_slider = QSlider(Qt.Horizontal)
         layout.addWidget(self.position_slider)
+        self.slider_preview = SliderPreview(self.position_slider, self.thumbnail_loader,
+                                            self.format_time)
+
+        # Keyframe thumbnails under the slider
+        self.filmstrip = Filmstrip(self.thumbnail_loader)
+        layout.addWidget(self.filmstrip)
+
+        # Audio waveform of the same part of the video as the filmstrip
+        self.waveform_track = WaveformTrack()
+        self.filmstrip.view_changed.connect(self.waveform_track.set_view)
+        layout.addWidget(self.waveform_track)
 
         # Controls
         controls_layout = QHBoxLayout()
@@ -88,6 +112,8 @@ class VideoPlayer(QWidget):
         self.media_player.positionChanged.connect(self.position_changed)
         self.position_slider.sliderMoved.connect(self.set_position)
         self.time_edit.returnPressed.connect(self.time_edit_changed)
+        self.filmstrip.position_requested.connect(self.set_position)
+        self.waveform_track.position_requested.connect(self.set_position)
 
         # Set up duration handling
         self.media_player.durationChanged.connect(self.duration_changed)
@@ -96,6 +122,30 @@ class VideoPlayer(QWidget):
         """Load a video file into the player."""
         self.media_player.setSource(QUrl.fromLocalFile(file_path))
         self.play_button.setText("▶")
+        self.thumbnail_loader.set_video(file_path)
+        self.load_waveform(file_path)
+
+    def load_waveform(self, file_path):
+        """Compute or fetch the waveform of a video in the background."""
+        if self.waveform_worker is not None:
+            self.waveform_worker.cancel()
+        self.waveform_track.set_waveform(None)
+        self.waveform_worker = AnalysisWorker(functools.partial(get_waveform, file_path), parent=self)
+        self.waveform_worker.analysis_completed.connect(self.waveform_loaded, Qt.QueuedConnection)
+        self.waveform_worker.finished.connect(self.waveform_worker_finished)
+        self.waveform_worker.start()
+
+    def waveform_loaded(self, waveform):
+        """Show the waveform unless another video was loaded meanwhile."""
+        if self.sender() is self.waveform_worker:
+            self.waveform_track.set_waveform(waveform)
+
+    def waveform_worker_finished(self):
+        """Release a finished waveform worker; a video without audio shows no waveform."""
+        worker = self.sender()
+        if worker is self.waveform_worker:
+            self.waveform_worker = None
+        worker.deleteLater()
 
     def toggle_play(self):
         """Toggle between play and pause states."""
@@ -117,10 +167,13 @@ class VideoPlayer(QWidget):
         time_str = self.format_time(position)
         self.time_label.setText(time_str)
         self.time_edit.setText(time_str)
+        self.filmstrip.set_position(position)
+        self.waveform_track.set_position(position)
 
     def duration_changed(self, duration):
         """Handle changes to the video duration."""
         self.position_slider.setRange(0, duration)
+        self.filmstrip.set_duration(duration)
 
     def set_position(self, position):
         """Set the playback position."""
@@ -175,6 +228,13 @@ class VideoPlayer(QWidget):
         current_time = self.get_current_time()
         self.add_split_point_signal.emit(current_time)
 
+    def shutdown(self):
+        """Stop background work before the player is closed."""
+        self.thumbnail_loader.shutdown()
+        if self.waveform_worker is not None:
+            self.waveform_worker.cancel()
+            self.waveform_worker.wait()
+
     def set_volume(self, value):
         """Set the audio volume based on slider value."""
         # Convert slider value (0-100) to volume (0.0-1.0)
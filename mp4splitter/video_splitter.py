@@ -2,10 +2,22 @@
 Video splitter component for the MP4 Splitter application.
 """
 
+import multiprocessing
 import os
-from moviepy.video.io.VideoFileClip import VideoFileClip
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from PySide6.QtCore import QObject, Signal
 
+from mp4splitter.cancellation import CANCEL_POLL_INTERVAL, OperationCancelled
+from mp4splitter.encoder_profiles import DEFAULT_PROFILE
+from mp4splitter.ffmpeg_tools import probe_duration, probe_video_fps
+from mp4splitter.job_journal import JobJournal
+from mp4splitter.probe import probe_video
+from mp4splitter.progress import ProgressTracker
+from mp4splitter.split_strategies import (DEFAULT_MODE, create_strategy, init_segment_worker,
+                                          write_segment_in_worker)
+
 
 class VideoSplitter(QObject):
     """
@@ -14,13 +26,20 @@ class VideoSplitter(QObject):
     # Signals for progress updates
     progress_updated = Signal(int, int)  # current, total
     segment_started = Signal(int, str)   # segment number, filename
+    frame_progress = Signal(float, float, float)  # overall percent, frames per second, speed
     splitting_completed = Signal()
+    splitting_cancelled = Signal()
     error_occurred = Signal(str)         # error message
 
-    def __init__(self, video_path=None, output_dir=None):
+    def __init__(self, video_path=None, output_dir=None, mode=DEFAULT_MODE, workers=1,
+                 profile=DEFAULT_PROFILE):
         super().__init__()
         self.video_path = video_path
         self.output_dir = output_dir
+        self.mode = mode
+        self.workers = workers
+        self.profile = profile
+        self.cancel_event = threading.Event()
 
     def set_video_path(self, video_path):
         """Set the path to the video file to be split."""
@@ -34,12 +53,41 @@ class VideoSplitter(QObject):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-    def split_video(self, split_points):
+    def set_mode(self, mode):
+        """Set the default split mode (see ``split_strategies.STRATEGIES``)."""
+        self.mode = mode
+
+    def set_profile(self, profile):
+        """Set the default encoder profile (see ``encoder_profiles.PROFILES``)."""
+        self.profile = profile
+
+    def set_workers(self, workers):
+        """Set the number of worker processes used to write segments in parallel."""
+        self.workers = max(1, int(workers))
+
+    def cancel(self):
+        """
+        Request cancellation of the running job.
+
+        Safe to call from any thread. The segment being written is stopped
+        where the strategy allows it and its partial output removed.
+        """
+        self.cancel_event.set()
+
+    def split_video(self, split_points, mode=None, workers=None, profile=None, resume=True):
         """
         Split the video according to the provided split points.
 
         Args:
             split_points: List of SplitPoint objects defining where to split the video.
+            mode: Name of the split strategy to use for this job. Defaults to
+                the splitter's current mode.
+            workers: Number of worker processes for this job. Defaults to the
+                splitter's current setting; 1 writes segments in this process.
+            profile: Encoder profile name or ``EncoderProfile`` used by the
+                re-encoding modes. Defaults to the splitter's current profile.
+            resume: Skip segments that the job journal in the output
+                directory records as already written and intact.
         """
         if not self.video_path or not self.output_dir:
             self.error_occurred.emit("Video path or output directory not set")
@@ -49,77 +97,222 @@ class VideoSplitter(QObject):
             self.error_occurred.emit("No split points defined")
             return
 
+        mode = mode or self.mode
+        workers = workers or self.workers
+        profile = profile or self.profile
+        try:
+            strategy = create_strategy(mode, profile)
+        except ValueError as e:
+            self.error_occurred.emit(str(e))
+            return
+
+        strategy.cancel_event = self.cancel_event
         try:
-            # Get original filename without extension
-            base_name = os.path.splitext(os.path.basename(self.video_path))[0]
-
-            # Load the video
-            video = VideoFileClip(self.video_path)
-
-            # Add the end of the video as the final split point if needed
-            if split_points and split_points[-1].end_time is None:
-                split_points[-1].end_time = int(video.duration * 1000)
-
-            # Process each split point
-            total_segments = len(split_points)
-            for i, point in enumerate(split_points):
-                # Convert milliseconds to seconds
-                start_sec = point.start_time / 1000
-                end_sec = point.end_time / 1000
-
-                # Create output filename
-                output_filename = f"{base_name}_split_{i+1}.mp4"
-                output_path = os.path.join(self.output_dir, output_filename)
-
-                # Emit progress signals
-                self.segment_started.emit(i+1, output_filename)
-                self.progress_updated.emit(i, total_segments)
-
-                # Extract the segment - using the new API for MoviePy 2.0+
-                segment = video.subclipped(start_sec, end_sec)
-
-                # Save the segment
-                segment.write_videofile(
-                    output_path,
-                    codec="libx264",
-                    audio_codec="aac",
-                    temp_audiofile=os.path.join(self.output_dir, f"temp_audio_{i}.m4a"),
-                    remove_temp=True,
-                    logger=None  # Disable moviepy's console output
-                )
-
-            # Clean up
-            video.close()
-
-            # Signal completion
-            self.progress_updated.emit(total_segments, total_segments)
+            parallel = workers > 1 and len(split_points) > 1 and not strategy.single_pass
+            if parallel:
+                duration = probe_duration(self.video_path)
+            else:
+                # Load the video
+                strategy.open(self.video_path)
+                duration = strategy.duration
+
+            try:
+                plan = self._plan_segments(split_points, duration)
+                settings = {
+                    "mode": mode,
+                    "profile": strategy.profile.settings() if strategy.reencodes else None,
+                }
+                remaining = self._start_job(plan, settings, resume)
+                strategy.progress_callback = self._tracker.update
+                # Nothing is left when an earlier run wrote every segment
+                if remaining:
+                    if parallel:
+                        self._split_parallel(mode, strategy.profile, remaining, workers)
+                    elif strategy.single_pass:
+                        self._split_single_pass(strategy, remaining)
+                    else:
+                        self._split_sequential(strategy, remaining)
+            finally:
+                strategy.close()
+
+            # The final progress update came with the last segment, or from
+            # _start_job when an earlier run had written them all
             self.splitting_completed.emit()
 
+        except OperationCancelled:
+            self.splitting_cancelled.emit()
         except Exception as e:
             self.error_occurred.emit(f"Error splitting video: {str(e)}")
+        finally:
+            # Reset for the next job; a cancel requested before this job
+            # started has stopped it at its first check
+            self.cancel_event.clear()
+
+    def _plan_segments(self, split_points, duration):
+        """
+        Turn split points into a list of segments to write.
+
+        Returns:
+            list: ``(index, start_sec, end_sec, output_filename, output_path)``
+            tuples, with a zero-based index.
+        """
+        # Get original filename without extension
+        base_name = os.path.splitext(os.path.basename(self.video_path))[0]
+
+        # Add the end of the video as the final split point if needed
+        if split_points[-1].end_time is None:
+            split_points[-1].end_time = int(duration * 1000)
+
+        plan = []
+        for i, point in enumerate(split_points):
+            # Convert milliseconds to seconds
+            start_sec = point.start_time / 1000
+            end_sec = point.end_time / 1000
+
+            # Create output filename
+            output_filename = f"{base_name}_split_{i+1}.mp4"
+            output_path = os.path.join(self.output_dir, output_filename)
+            plan.append((i, start_sec, end_sec, output_filename, output_path))
+        return plan
+
+    def _start_job(self, plan, settings, resume):
+        """
+        Set up progress tracking and the job journal for a plan.
+
+        Returns:
+            list: The segments of the plan that still have to be written.
+        """
+        self._plan = {segment[0]: segment for segment in plan}
+        self._tracker = ProgressTracker(
+            {i: end_sec - start_sec for i, start_sec, end_sec, _, _ in plan},
+            self.frame_progress.emit,
+            probe_video_fps(self.video_path)
+        )
+        self._journal = JobJournal.open(self.output_dir, self.video_path, settings, plan)
+        self._completed = 0
+
+        remaining = []
+        for segment in plan:
+            i, start_sec, end_sec, _, output_path = segment
+            if resume and self._journal.is_complete(start_sec, end_sec, output_path):
+                self._completed += 1
+                self._tracker.skip_segment(i)
+            else:
+                remaining.append(segment)
+        self._journal.save()
+        self.progress_updated.emit(self._completed, len(plan))
+        return remaining
+
+    def _segment_finished(self, index):
+        """Record a written segment in the journal and report progress."""
+        _, start_sec, end_sec, _, output_path = self._plan[index]
+        self._journal.mark_complete(start_sec, end_sec, output_path)
+        self._tracker.finish_segment(index)
+        self._completed += 1
+        self.progress_updated.emit(self._completed, len(self._plan))
+
+    def _split_sequential(self, strategy, plan):
+        """Write the planned segments one after another in this process."""
+        for i, start_sec, end_sec, output_filename, output_path in plan:
+            if self.cancel_event.is_set():
+                raise OperationCancelled()
+
+            self.segment_started.emit(i+1, output_filename)
+            try:
+                strategy.write_segment(i, start_sec, end_sec, output_path)
+            except OperationCancelled:
+                # Don't leave a truncated segment behind
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                raise
+            self._segment_finished(i)
+
+    def _split_single_pass(self, strategy, plan):
+        """
+        Write all planned segments from one pass over the source.
+
+        ``segment_started`` is emitted as each segment's encoder opens and
+        ``progress_updated`` counts finished segments.
+        """
+        def segment_started(index, output_filename):
+            self.segment_started.emit(index+1, output_filename)
+
+        strategy.write_segments(plan, segment_started, self._segment_finished)
+
+    def _split_parallel(self, mode, profile, plan, workers):
+        """
+        Write the planned segments across a pool of worker processes.
+
+        Each worker opens its own reader on the source. Workers report when
+        they start a segment and how far they got through a queue, so
+        ``segment_started`` and ``progress_updated`` arrive in the order the
+        work actually happens rather than segment order. On cancellation the
+        workers' shared cancel event stops the running segments at their
+        next check, and segments that have not started are dropped.
+        """
+        context = multiprocessing.get_context("spawn")
+        progress_queue = context.Queue()
+        cancel_event = context.Event()
+        self._started = set()
+        with ProcessPoolExecutor(max_workers=min(workers, len(plan)), mp_context=context,
+                                 initializer=init_segment_worker,
+                                 initargs=(mode, self.video_path, progress_queue,
+                                           profile, cancel_event)) as executor:
+            futures = [executor.submit(write_segment_in_worker, i, start_sec, end_sec, output_path)
+                       for i, start_sec, end_sec, _, output_path in plan]
+
+            pending = set(futures)
+            try:
+                while pending:
+                    if self.cancel_event.is_set():
+                        raise OperationCancelled()
+                    done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL,
+                                         return_when=FIRST_COMPLETED)
+                    self._drain_progress(progress_queue)
+                    for future in done:
+                        index = future.result()
+                        # The start report may still be in the queue
+                        self._report_started(index)
+                        self._segment_finished(index)
+            except BaseException:
+                cancel_event.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    def _report_started(self, index):
+        """Emit ``segment_started`` for a segment written by a worker, once."""
+        if index not in self._started:
+            self._started.add(index)
+            self.segment_started.emit(index+1, self._plan[index][3])
+
+    def _drain_progress(self, progress_queue):
+        """Feed the start and progress reports queued by worker processes."""
+        while True:
+            try:
+                index, done_sec = progress_queue.get_nowait()
+            except queue.Empty:
+                return
+            if done_sec is None:
+                self._report_started(index)
+            else:
+                self._tracker.update(index, done_sec)
 
     def get_video_info(self):
         """
         Get information about the loaded video.
 
+        Only the container headers are read, so this returns quickly even for
+        very large files.
+
         Returns:
             dict: Video information including duration, resolution, etc.
+            See ``probe.probe_video`` for the keys.
         """
         if not self.video_path:
             return None
 
         try:
-            video = VideoFileClip(self.video_path)
-            info = {
-                "duration": video.duration * 1000,  # Convert to milliseconds
-                "width": video.w,
-                "height": video.h,
-                "fps": video.fps,
-                "filename": os.path.basename(self.video_path)
-            }
-            video.close()
-            return info
+            return probe_video(self.video_path)
         except Exception as e:
             self.error_occurred.emit(f"Error getting video info: {str(e)}")
             return None
-
@@ -0,0 +1,347 @@
+"""
+Watch-folder ingestion for the MP4 Splitter application.
+
+Polls a directory for new MP4 files, waits until each one has stopped
+growing, builds its split points from a template and submits a split job
+to a ``JobQueue``. A ledger in the output directory records every file
+that was handled, so restarting the watcher never splits a file twice.
+"""
+
+import json
+import os
+import threading
+import time
+
+from mp4splitter.encoder_profiles import DEFAULT_PROFILE
+from mp4splitter.job_queue import COMPLETED, FAILED, SplitJob
+from mp4splitter.probe import probe_video
+from mp4splitter.split_planner import plan_fixed_interval
+from mp4splitter.split_spec import load_split_spec
+from mp4splitter.split_strategies import DEFAULT_MODE
+
+# Seconds between two scans of the watched directory
+DEFAULT_POLL_INTERVAL = 2.0
+
+# Seconds a file must keep the same size and modification time before it
+# is considered completely written
+DEFAULT_SETTLE_TIME = 5.0
+
+VIDEO_EXTENSIONS = (".mp4",)
+SIDECAR_EXTENSIONS = (".csv", ".json")
+
+LEDGER_NAME = ".mp4splitter-watch-ledger.json"
+LEDGER_VERSION = 1
+
+
+class SplitTemplate:
+    """
+    Rule that turns a detected video into split points.
+
+    With both a sidecar and an interval, a split spec next to the video is
+    used when there is one and fixed-interval splitting otherwise.
+
+    Args:
+        interval: Segment length in seconds, or None to not split at fixed
+            intervals.
+        sidecar: Read the split points from ``<video name>.csv`` or
+            ``<video name>.json`` next to the video (see
+            ``split_spec.load_split_spec``).
+    """
+    def __init__(self, interval=None, sidecar=True):
+        if interval is None and not sidecar:
+            raise ValueError("A split template needs an interval or sidecar files")
+        if interval is not None and interval <= 0:
+            raise ValueError("The split interval must be positive")
+        self.interval = interval
+        self.sidecar = sidecar
+
+    def find_sidecar(self, video_path):
+        """Return the path of the sidecar split spec of a video, or None."""
+        base_path = os.path.splitext(video_path)[0]
+        for extension in SIDECAR_EXTENSIONS:
+            if os.path.isfile(base_path + extension):
+                return base_path + extension
+        return None
+
+    def split_points(self, video_path, duration_ms):
+        """
+        Build the split points of a video.
+
+        Args:
+            video_path: Path to the video.
+            duration_ms: Duration of the video in milliseconds.
+
+        Returns:
+            list: SplitPoint objects, or None if the template needs a sidecar
+            file that does not exist (yet).
+
+        Raises:
+            ValueError: If the sidecar file is not a valid split spec.
+            OSError: If the sidecar file cannot be read.
+        """
+        if self.sidecar:
+            sidecar_path = self.find_sidecar(video_path)
+            if sidecar_path is not None:
+                return load_split_spec(sidecar_path)
+        if self.interval is None:
+            return None
+        return plan_fixed_interval(duration_ms, self.interval * 1000)
+
+
+class WatchLedger:
+    """
+    Record of the files a folder watcher has handled.
+
+    Files are identified by path, size and modification time, so a file
+    that is replaced by a new recording of the same name is split again.
+
+    Args:
+        path: Path of the ledger file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def open(cls, output_dir):
+        """Load the ledger of an output directory, or start an empty one."""
+        ledger = cls(os.path.join(output_dir, LEDGER_NAME))
+        try:
+            with open(ledger.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return ledger
+        if data.get("version") == LEDGER_VERSION:
+            ledger.entries = data.get("files", {})
+        return ledger
+
+    @staticmethod
+    def _identity(video_path):
+        stat = os.stat(video_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def is_handled(self, video_path):
+        """
+        Check whether the current version of a file was split or failed.
+
+        Files whose job was interrupted are not handled; their job journal
+        lets the next attempt resume where it stopped.
+        """
+        with self.lock:
+            entry = self.entries.get(os.path.abspath(video_path))
+        if entry is None or entry["status"] not in (COMPLETED, FAILED):
+            return False
+        try:
+            identity = self._identity(video_path)
+        except OSError:
+            return True
+        return entry["size"] == identity["size"] and entry["mtime_ns"] == identity["mtime_ns"]
+
+    def record(self, video_path, status, error=None):
+        """Record the state of a file and save the ledger."""
+        try:
+            entry = self._identity(video_path)
+        except OSError:
+            # The file was removed; keep what is known about it
+            entry = dict(self.entries.get(os.path.abspath(video_path), {}))
+        entry.update({"status": status, "error": error, "time": time.time()})
+        with self.lock:
+            self.entries[os.path.abspath(video_path)] = entry
+            self.save()
+
+    def save(self):
+        """Write the ledger atomically."""
+        data = {"version": LEDGER_VERSION, "files": self.entries}
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(temp_path, self.path)
+
+
+class FolderWatcher:
+    """
+    Submits a split job for every new video appearing in a directory.
+
+    The directory is polled rather than watched through OS notifications, so
+    it also works on network shares. Listeners registered with
+    ``add_listener`` are called with an event name and a dictionary of
+    details whenever a file is detected, queued, rejected or its job
+    finishes; they may be called from job threads.
+
+    Args:
+        watch_dir: Directory to watch (not recursive).
+        output_dir: Directory the segments and the ledger are written to.
+        template: SplitTemplate used to split each video.
+        job_queue: JobQueue the jobs are submitted to.
+        mode: Split mode name, see ``split_strategies.STRATEGIES``.
+        profile: Encoder profile name.
+        workers: Number of worker processes of each job.
+        poll_interval: Seconds between two scans.
+        settle_time: Seconds a file must stay unchanged before it is split.
+
+    Raises:
+        ValueError: If the output directory is the watched directory.
+        OSError: If the output directory cannot be created.
+    """
+    def __init__(self, watch_dir, output_dir, template, job_queue, mode=DEFAULT_MODE,
+                 profile=DEFAULT_PROFILE, workers=1, poll_interval=DEFAULT_POLL_INTERVAL,
+                 settle_time=DEFAULT_SETTLE_TIME):
+        # The segments are ordinary videos, which the watcher would split
+        # again and again if they were written where it looks
+        if os.path.isdir(output_dir) and os.path.samefile(watch_dir, output_dir):
+            raise ValueError("The output directory must not be the watched directory")
+        self.watch_dir = watch_dir
+        self.output_dir = output_dir
+        self.template = template
+        self.job_queue = job_queue
+        self.mode = mode
+        self.profile = profile
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.listeners = []
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.ledger = WatchLedger.open(output_dir)
+        # Files seen but not yet stable: path -> (size, mtime_ns, unchanged since)
+        self.pending = {}
+        # Stable files that wait for their sidecar split spec
+        self.waiting = set()
+        # Jobs submitted by this watcher: job ID -> source path
+        self.jobs = {}
+        self.jobs_lock = threading.Lock()
+        job_queue.add_listener(self._job_changed)
+
+    def add_listener(self, callback):
+        """Register a callable receiving ``(event, details)``."""
+        self.listeners.append(callback)
+
+    def _notify(self, event, video_path, **details):
+        for callback in list(self.listeners):
+            callback(event, {"file": video_path, **details})
+
+    def candidates(self):
+        """Return the paths of the videos in the watched directory."""
+        paths = []
+        with os.scandir(self.watch_dir) as entries:
+            for entry in entries:
+                if (entry.name.startswith(".") or
+                        not entry.name.lower().endswith(VIDEO_EXTENSIONS) or
+                        not entry.is_file()):
+                    continue
+                paths.append(entry.path)
+        return sorted(paths)
+
+    def poll(self):
+        """
+        Scan the directory once and submit jobs for the files that are ready.
+
+        Returns:
+            list: The submitted SplitJob objects.
+        """
+        now = time.monotonic()
+        with self.jobs_lock:
+            active = set(self.jobs.values())
+        submitted = []
+        seen = set()
+
+        for video_path in self.candidates():
+            seen.add(video_path)
+            if video_path in active or self.ledger.is_handled(video_path):
+                continue
+            try:
+                stat = os.stat(video_path)
+            except OSError:
+                continue
+
+            previous = self.pending.get(video_path)
+            if previous is None:
+                self._notify("detected", video_path, size=stat.st_size)
+            if previous is None or previous[:2] != (stat.st_size, stat.st_mtime_ns):
+                self.pending[video_path] = (stat.st_size, stat.st_mtime_ns, now)
+                self.waiting.discard(video_path)
+                continue
+            if stat.st_size == 0 or now - previous[2] < self.settle_time:
+                continue
+
+            job = self._create_job(video_path)
+            if job is None:
+                continue
+            del self.pending[video_path]
+            self.waiting.discard(video_path)
+            with self.jobs_lock:
+                self.jobs[job.job_id] = video_path
+            self.ledger.record(video_path, "queued")
+            self.job_queue.submit(job)
+            self._notify("queued", video_path, job=job.job_id, segments=job.segment_count)
+            submitted.append(job)
+
+        # Forget files that disappeared before they were split
+        for video_path in list(self.pending):
+            if video_path not in seen:
+                del self.pending[video_path]
+                self.waiting.discard(video_path)
+        return submitted
+
+    def _create_job(self, video_path):
+        """Return the job for a stable file, or None if it cannot be split yet."""
+        try:
+            duration = probe_video(video_path)["duration"]
+            split_points = self.template.split_points(video_path, duration)
+        except Exception as e:
+            # A file that stays unreadable after settling is not a valid video
+            del self.pending[video_path]
+            self.waiting.discard(video_path)
+            self.ledger.record(video_path, FAILED, str(e))
+            self._notify(FAILED, video_path, error=str(e))
+            return None
+        if split_points is None:
+            if video_path not in self.waiting:
+                self.waiting.add(video_path)
+                self._notify("waiting", video_path, reason="no sidecar split spec")
+            return None
+        return SplitJob(video_path, self.output_dir, split_points, mode=self.mode,
+                        profile=self.profile, workers=self.workers)
+
+    def _job_changed(self, job):
+        if not job.finished:
+            return
+        with self.jobs_lock:
+            video_path = self.jobs.get(job.job_id)
+        if video_path is None:
+            return
+        # Record the result before the file stops counting as active, so a
+        # concurrent poll never sees it as new
+        self.ledger.record(video_path, job.status, job.error)
+        with self.jobs_lock:
+            del self.jobs[job.job_id]
+        self._notify(job.status, video_path, job=job.job_id, error=job.error)
+
+    @property
+    def busy(self):
+        """Whether a submitted job has not been recorded as finished yet."""
+        with self.jobs_lock:
+            return bool(self.jobs)
+
+    @property
+    def idle(self):
+        """
+        Whether every file has been dealt with: none is settling and no
+        submitted job is unfinished. Files waiting for a sidecar do not count.
+        """
+        return set(self.pending) <= self.waiting and not self.busy
+
+    def run(self, stop_event, until_idle=False):
+        """
+        Poll the directory until ``stop_event`` is set.
+
+        Args:
+            stop_event: threading.Event that ends the loop.
+            until_idle: Also return once every file present has been split.
+        """
+        while not stop_event.is_set():
+            self.poll()
+            if until_idle and self.idle:
+                return
+            stop_event.wait(self.poll_interval)
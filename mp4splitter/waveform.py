@@ -0,0 +1,200 @@
+"""
+Audio waveform overview for the MP4 Splitter application.
+
+The waveform is computed once per file from the streamed PCM of
+``audio_analysis`` as a pyramid of min/max peaks: the finest level holds
+the lowest and highest sample of every ``BASE_SAMPLES`` samples, and each
+further level halves the one below it. Drawing picks the level whose
+peaks are just finer than a pixel, so any zoom level of any file length
+is rendered from a handful of peaks per pixel instead of every sample.
+The pyramid is stored as ``int16`` arrays in the metadata cache.
+"""
+
+import numpy as np
+
+from mp4splitter.audio_analysis import SAMPLE_RATE, run_audio_analysis
+from mp4splitter.cache import get_cache
+
+# Samples covered by one peak of the finest level (16 ms at 16 kHz); a
+# ten-hour file then needs about 18 MB for the whole pyramid
+BASE_SAMPLES = 256
+
+# Values before the peaks in the cache: sample count and base level length
+_HEADER = np.dtype("<i8")
+_HEADER_VALUES = 2
+
+
+class PeakPyramid:
+    """
+    Min/max peaks of a recording at halving resolutions.
+
+    Args:
+        levels: ``int16`` arrays of shape ``(count, 2)`` holding the
+            minimum and maximum of each peak, finest first; each level has
+            half as many peaks as the one before, rounded up.
+        sample_count: Number of samples of the recording.
+    """
+    def __init__(self, levels, sample_count):
+        self.levels = levels
+        self.sample_count = sample_count
+
+    @property
+    def duration_ms(self):
+        """Duration of the recording in milliseconds."""
+        return self.sample_count * 1000 // SAMPLE_RATE
+
+    @classmethod
+    def from_base(cls, base, sample_count):
+        """
+        Build the pyramid above the finest level.
+
+        Args:
+            base: ``int16`` array of shape ``(count, 2)`` with the finest peaks.
+            sample_count: Number of samples of the recording.
+        """
+        levels = [base]
+        while len(levels[-1]) > 1:
+            level = levels[-1]
+            if len(level) % 2:
+                level = np.concatenate([level, level[-1:]])
+            pairs = level.reshape(-1, 2, 2)
+            levels.append(np.stack([pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)], axis=1))
+        return cls(levels, sample_count)
+
+    def to_bytes(self):
+        """Return the pyramid in the compact form stored in the cache."""
+        header = np.array([self.sample_count, len(self.levels[0])], dtype=_HEADER)
+        return header.tobytes() + b"".join(level.astype("<i2").tobytes() for level in self.levels)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Rebuild a pyramid stored with ``to_bytes``.
+
+        Raises:
+            ValueError: If the data is not a complete pyramid.
+        """
+        header_size = _HEADER.itemsize * _HEADER_VALUES
+        if len(data) < header_size:
+            raise ValueError("Truncated waveform")
+        sample_count, count = np.frombuffer(data, dtype=_HEADER, count=_HEADER_VALUES).tolist()
+        values = np.frombuffer(data, dtype="<i2", offset=header_size).astype(np.int16)
+        levels = []
+        offset = 0
+        while True:
+            if offset + count * 2 > len(values):
+                raise ValueError("Truncated waveform")
+            levels.append(values[offset:offset + count * 2].reshape(-1, 2))
+            offset += count * 2
+            if count <= 1:
+                break
+            count = (count + 1) // 2
+        return cls(levels, sample_count)
+
+    def peaks(self, start_ms, end_ms, width):
+        """
+        Return the minimum and maximum sample under every pixel of a view.
+
+        The work depends on ``width`` only, not on the length of the view.
+
+        Args:
+            start_ms: Time at the left edge in milliseconds.
+            end_ms: Time at the right edge in milliseconds.
+            width: Number of pixels.
+
+        Returns:
+            tuple: Two ``int16`` arrays of ``width`` values, the minimum
+            and maximum of each pixel; pixels past the end of the
+            recording are 0.
+        """
+        mins = np.zeros(width, dtype=np.int16)
+        maxs = np.zeros(width, dtype=np.int16)
+        if width <= 0 or end_ms <= start_ms or not len(self.levels[0]):
+            return mins, maxs
+
+        samples_per_pixel = (end_ms - start_ms) * SAMPLE_RATE / 1000 / width
+        # The coarsest level whose peaks still fit in a pixel
+        level_index = 0
+        while (level_index + 1 < len(self.levels) and
+               BASE_SAMPLES << (level_index + 1) <= samples_per_pixel):
+            level_index += 1
+        level = self.levels[level_index]
+        peak_samples = BASE_SAMPLES << level_index
+
+        edges = start_ms * SAMPLE_RATE / 1000 + samples_per_pixel * np.arange(width + 1)
+        inside = (edges[:-1] >= 0) & (edges[:-1] < self.sample_count)
+        if not inside.any():
+            return mins, maxs
+        indices = np.clip((edges // peak_samples).astype(np.int64), 0, len(level))
+        starts = indices[:-1][inside]
+        # Every pixel covers the peaks up to the next pixel's first one, and at least one
+        first, last = starts[0], max(indices[-1], starts[-1] + 1)
+        window = level[first:last]
+        mins[inside] = np.minimum.reduceat(window[:, 0], starts - first)
+        maxs[inside] = np.maximum.reduceat(window[:, 1], starts - first)
+        return mins, maxs
+
+
+class _PeakBuilder:
+    """Collects the finest peaks of a sample stream."""
+    def __init__(self):
+        self.blocks = []
+
+    def add_samples(self, samples):
+        whole = len(samples) - len(samples) % BASE_SAMPLES
+        if whole:
+            peaks = samples[:whole].reshape(-1, BASE_SAMPLES)
+            self.blocks.append(np.stack([peaks.min(axis=1), peaks.max(axis=1)], axis=1))
+        if whole < len(samples):
+            # Only the last block of the stream can be partial
+            tail = samples[whole:]
+            self.blocks.append(np.array([[tail.min(), tail.max()]], dtype=np.int16))
+
+    def base(self):
+        if not self.blocks:
+            return np.zeros((0, 2), dtype=np.int16)
+        return np.concatenate(self.blocks)
+
+
+def compute_waveform(video_path, cancel_event=None, progress_callback=None):
+    """
+    Decode the audio of a video and build its peak pyramid.
+
+    Args:
+        video_path: Path to the video.
+        cancel_event: Optional ``threading.Event`` that stops the decode.
+        progress_callback: Optional callable receiving ``(percent, speed)``.
+
+    Returns:
+        PeakPyramid: The waveform.
+
+    Raises:
+        ValueError: If the video has no audio.
+        RuntimeError: If ffmpeg fails to decode the audio.
+        OperationCancelled: If the cancel event was set.
+    """
+    builder = _PeakBuilder()
+    sample_count = run_audio_analysis(video_path, builder.add_samples, BASE_SAMPLES,
+                                      cancel_event, progress_callback)
+    return PeakPyramid.from_base(builder.base(), sample_count)
+
+
+def get_waveform(video_path, cancel_event=None, progress_callback=None):
+    """
+    Return the peak pyramid of a video, computing it only if it is not cached.
+
+    Takes the same arguments and raises the same errors as ``compute_waveform``.
+    """
+    cache = get_cache()
+    key = str(BASE_SAMPLES)
+    if cache is not None:
+        stored = cache.get("waveform", video_path, key)
+        if stored is not None:
+            try:
+                return PeakPyramid.from_bytes(stored)
+            except ValueError:
+                pass
+    waveform = compute_waveform(video_path, cancel_event, progress_callback)
+    if cache is not None:
+        cache.put("waveform", video_path, waveform.to_bytes(), key)
+    return waveform
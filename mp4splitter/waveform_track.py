@@ -0,0 +1,78 @@
+"""
+Waveform track component for the MP4 Splitter application.
+"""
+
+from PySide6.QtWidgets import QWidget, QSizePolicy
+from PySide6.QtGui import QPainter, QColor, QPen
+from PySide6.QtCore import Qt, QLineF, Signal
+
+# Height of the track in pixels
+WAVEFORM_HEIGHT = 48
+
+
+class WaveformTrack(QWidget):
+    """
+    Audio waveform of the part of a video shown by the filmstrip.
+
+    Every repaint asks the PeakPyramid for one min/max pair per pixel, so
+    drawing costs the same at any zoom level and file length. Clicking
+    asks the player to seek there.
+    """
+    # Emitted with a time in milliseconds when the track is clicked
+    position_requested = Signal(int)
+
+    def __init__(self):
+        super().__init__()
+        self.waveform = None
+        self.position_ms = 0
+        self.view_start = 0
+        self.view_span = 0
+        self.setFixedHeight(WAVEFORM_HEIGHT)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setCursor(Qt.PointingHandCursor)
+
+    def set_waveform(self, waveform):
+        """Show a PeakPyramid, or nothing with None."""
+        self.waveform = waveform
+        self.update()
+
+    def set_view(self, start_ms, span_ms):
+        """Show ``span_ms`` milliseconds from ``start_ms``."""
+        self.view_start, self.view_span = start_ms, span_ms
+        self.update()
+
+    def set_position(self, position_ms):
+        """Move the playhead."""
+        self.position_ms = position_ms
+        self.update()
+
+    def time_at(self, x):
+        """Return the time in milliseconds shown at a horizontal position."""
+        if self.width() <= 0:
+            return 0
+        return int(self.view_start + self.view_span * x / self.width())
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(24, 24, 24))
+        if self.view_span <= 0:
+            return
+
+        middle = self.height() / 2
+        if self.waveform is not None:
+            mins, maxs = self.waveform.peaks(self.view_start, self.view_start + self.view_span,
+                                             self.width())
+            scale = middle / 32768
+            tops = (middle - maxs * scale).tolist()
+            bottoms = (middle - mins * scale + 1).tolist()
+            painter.setPen(QPen(QColor(96, 176, 240), 1))
+            painter.drawLines([QLineF(x + 0.5, top, x + 0.5, bottom)
+                               for x, (top, bottom) in enumerate(zip(tops, bottoms))])
+
+        x = (self.position_ms - self.view_start) * self.width() / self.view_span
+        painter.setPen(QPen(QColor(255, 64, 64), 2))
+        painter.drawLine(int(x), 0, int(x), self.height())
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.view_span > 0:
+            self.position_requested.emit(self.time_at(event.position().x()))
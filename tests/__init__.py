@@ -0,0 +1,3 @@
+"""
+Tests for the MP4 Splitter application.
+"""
@@ -0,0 +1,224 @@
+"""
+Tiny synthetic MP4 files for the tests.
+
+The boxes are written by hand with ``struct`` rather than with the
+remuxer's own builders, so the parser is checked against an independent
+writer. Sample data is never decoded; every sample holds a pattern naming
+its track and index, so a remuxed file can be checked byte for byte.
+"""
+
+import struct
+
+VIDEO = b"vide"
+AUDIO = b"soun"
+
+
+def box(box_type, *payload):
+    """Serialize a box from its type and payload parts."""
+    data = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(data), box_type) + data
+
+
+def full_box(box_type, version, flags, *payload):
+    """Serialize a full box from its version, flags and payload parts."""
+    return box(box_type, struct.pack(">I", (version << 24) | flags), *payload)
+
+
+def sample_data(track_id, index, size):
+    """Return the content of a sample: its track ID and index, repeated."""
+    pattern = struct.pack(">HH", track_id, index)
+    return (pattern * (size // len(pattern) + 1))[:size]
+
+
+def runs(values):
+    """Collapse a sequence into ``[count, value]`` runs."""
+    result = []
+    for value in values:
+        if result and result[-1][1] == value:
+            result[-1][0] += 1
+        else:
+            result.append([1, value])
+    return result
+
+
+class TrackSpec:
+    """
+    Description of one track of a synthetic MP4.
+
+    Args:
+        track_id: Track ID.
+        handler: ``VIDEO`` or ``AUDIO``.
+        timescale: Media timescale.
+        durations: Decode duration of each sample.
+        sizes: Size of each sample in bytes (at least 4).
+        chunk_samples: Number of samples in each chunk.
+        sync_samples: Zero-based sync sample indices, or None to write no
+            ``stss`` box.
+        cts_offsets: Composition offset of each sample, or None to write no
+            ``ctts`` box.
+        media_time: Media time of an edit list, or None to write none.
+    """
+    def __init__(self, track_id, handler, timescale, durations, sizes, chunk_samples,
+                 sync_samples=None, cts_offsets=None, media_time=None):
+        assert sum(chunk_samples) == len(durations) == len(sizes)
+        self.track_id = track_id
+        self.handler = handler
+        self.timescale = timescale
+        self.durations = list(durations)
+        self.sizes = list(sizes)
+        self.chunk_samples = list(chunk_samples)
+        self.sync_samples = sync_samples
+        self.cts_offsets = cts_offsets
+        self.media_time = media_time
+
+    def chunk_data(self, chunk):
+        """Return the sample data of a chunk."""
+        first = sum(self.chunk_samples[:chunk])
+        return b"".join(sample_data(self.track_id, index, self.sizes[index])
+                        for index in range(first, first + self.chunk_samples[chunk]))
+
+    def sample_entry(self):
+        if self.handler == VIDEO:
+            # Visual sample entry: reserved, data reference, pre-defined
+            # fields, 320x240, 72 dpi, one frame per sample, depth 24
+            return box(b"avc1", bytes(6), struct.pack(">H", 1), bytes(16),
+                       struct.pack(">HHIIIH", 320, 240, 0x480000, 0x480000, 0, 1),
+                       bytes(32), struct.pack(">Hh", 24, -1))
+        # Audio sample entry: stereo, 16 bit, 48 kHz
+        return box(b"mp4a", bytes(6), struct.pack(">H", 1), bytes(8),
+                   struct.pack(">HHHHI", 2, 16, 0, 0, 48000 << 16))
+
+    def stbl(self, chunk_offsets, use_co64):
+        stsd = full_box(b"stsd", 0, 0, struct.pack(">I", 1), self.sample_entry())
+        stts_runs = runs(self.durations)
+        children = [stsd, full_box(b"stts", 0, 0, struct.pack(">I", len(stts_runs)),
+                                   *(struct.pack(">II", *run) for run in stts_runs))]
+        if self.cts_offsets is not None:
+            ctts_runs = runs(self.cts_offsets)
+            children.append(full_box(b"ctts", 0, 0, struct.pack(">I", len(ctts_runs)),
+                                     *(struct.pack(">II", *run) for run in ctts_runs)))
+        if self.sync_samples is not None:
+            children.append(full_box(b"stss", 0, 0, struct.pack(">I", len(self.sync_samples)),
+                                     *(struct.pack(">I", i + 1) for i in self.sync_samples)))
+        stsc = []
+        for chunk, count in enumerate(self.chunk_samples):
+            if not stsc or stsc[-1][1] != count:
+                stsc.append((chunk + 1, count, 1))
+        children.append(full_box(b"stsc", 0, 0, struct.pack(">I", len(stsc)),
+                                 *(struct.pack(">III", *entry) for entry in stsc)))
+        children.append(full_box(b"stsz", 0, 0, struct.pack(">II", 0, len(self.sizes)),
+                                 *(struct.pack(">I", size) for size in self.sizes)))
+        if use_co64:
+            children.append(full_box(b"co64", 0, 0, struct.pack(">I", len(chunk_offsets)),
+                                     *(struct.pack(">Q", offset) for offset in chunk_offsets)))
+        else:
+            children.append(full_box(b"stco", 0, 0, struct.pack(">I", len(chunk_offsets)),
+                                     *(struct.pack(">I", offset) for offset in chunk_offsets)))
+        return box(b"stbl", *children)
+
+    def trak(self, chunk_offsets, use_co64, movie_timescale):
+        media_duration = sum(self.durations)
+        duration = media_duration * movie_timescale // self.timescale
+        width, height = (320, 240) if self.handler == VIDEO else (0, 0)
+        tkhd = full_box(b"tkhd", 0, 3, struct.pack(">IIIII", 0, 0, self.track_id, 0, duration),
+                        bytes(8), struct.pack(">hhhH", 0, 0, 0, 0),
+                        struct.pack(">9I", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000),
+                        struct.pack(">II", width << 16, height << 16))
+        parts = [tkhd]
+        if self.media_time is not None:
+            elst = full_box(b"elst", 0, 0, struct.pack(">IIiI", 1, duration, self.media_time,
+                                                       0x10000))
+            parts.append(box(b"edts", elst))
+        mdhd = full_box(b"mdhd", 0, 0, struct.pack(">IIIIHH", 0, 0, self.timescale,
+                                                   media_duration, 0x55C4, 0))
+        hdlr = full_box(b"hdlr", 0, 0, bytes(4), self.handler, bytes(12), b"\0")
+        header = (full_box(b"vmhd", 0, 1, bytes(8)) if self.handler == VIDEO
+                  else full_box(b"smhd", 0, 0, bytes(4)))
+        dinf = box(b"dinf", full_box(b"dref", 0, 0, struct.pack(">I", 1),
+                                     full_box(b"url ", 0, 1)))
+        minf = box(b"minf", header, dinf, self.stbl(chunk_offsets, use_co64))
+        parts.append(box(b"mdia", mdhd, hdlr, minf))
+        return box(b"trak", *parts)
+
+
+def build_mp4(path, tracks, use_co64=False, movie_timescale=1000):
+    """
+    Write a synthetic MP4 file.
+
+    The chunks of the tracks are interleaved in turn in a single ``mdat``
+    placed before the ``moov`` box.
+
+    Args:
+        path: Path of the file to create.
+        tracks: TrackSpec objects.
+        use_co64: Write 64-bit chunk offsets.
+        movie_timescale: Timescale of the movie header.
+
+    Returns:
+        list: The file offset of every chunk, per track.
+    """
+    ftyp = box(b"ftyp", b"isom", struct.pack(">I", 0x200), b"isomiso2avc1mp41")
+    chunk_offsets = [[] for _ in tracks]
+    data = []
+    position = len(ftyp) + 8
+    for chunk in range(max(len(track.chunk_samples) for track in tracks)):
+        for t, track in enumerate(tracks):
+            if chunk < len(track.chunk_samples):
+                chunk_offsets[t].append(position)
+                data.append(track.chunk_data(chunk))
+                position += len(data[-1])
+    mdat = box(b"mdat", *data)
+
+    duration = max(sum(track.durations) * movie_timescale // track.timescale
+                   for track in tracks)
+    mvhd = full_box(b"mvhd", 0, 0, struct.pack(">IIII", 0, 0, movie_timescale, duration),
+                    struct.pack(">Ih", 0x10000, 0x100), bytes(10),
+                    struct.pack(">9I", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000),
+                    bytes(24), struct.pack(">I", len(tracks) + 1))
+    moov = box(b"moov", mvhd, *(track.trak(offsets, use_co64, movie_timescale)
+                                for track, offsets in zip(tracks, chunk_offsets)))
+    with open(path, "wb") as f:
+        f.write(ftyp + mdat + moov)
+    return chunk_offsets
+
+
+def video_track(frames=24, gop=8, frame_duration=40, timescale=1000, track_id=1,
+                reordered=True, chunk_samples=None):
+    """
+    Describe a video track of I P B B frame groups.
+
+    Args:
+        frames: Number of frames.
+        gop: Frames from one keyframe to the next.
+        frame_duration: Duration of a frame in timescale units.
+        timescale: Media timescale.
+        track_id: Track ID.
+        reordered: Write composition offsets and an edit list for B-frames;
+            otherwise every frame is a keyframe and there is no ``stss``.
+        chunk_samples: Samples per chunk; alternating 3 and 2 by default.
+    """
+    if chunk_samples is None:
+        chunk_samples = []
+        while sum(chunk_samples) < frames:
+            chunk_samples.append(min(3 if len(chunk_samples) % 2 == 0 else 2,
+                                     frames - sum(chunk_samples)))
+    # Keyframes are larger, and no two other frames have the same size
+    sizes = [900 if i % gop == 0 else 100 + 7 * i for i in range(frames)]
+    if not reordered:
+        return TrackSpec(track_id, VIDEO, timescale, [frame_duration] * frames, sizes,
+                         chunk_samples)
+    # Decode order I0 P3 B1 B2, presented one frame late by the edit list
+    pattern = [1, 3, 0, 0]
+    cts_offsets = [pattern[i % 4] * frame_duration for i in range(frames)]
+    return TrackSpec(track_id, VIDEO, timescale, [frame_duration] * frames, sizes,
+                     chunk_samples, sync_samples=list(range(0, frames, gop)),
+                     cts_offsets=cts_offsets, media_time=frame_duration)
+
+
+def audio_track(samples=45, track_id=2, samples_per_chunk=8):
+    """Describe an AAC-like 48 kHz audio track of 1024-sample frames."""
+    chunk_samples = [samples_per_chunk] * (samples // samples_per_chunk)
+    if samples % samples_per_chunk:
+        chunk_samples.append(samples % samples_per_chunk)
+    return TrackSpec(track_id, AUDIO, 48000, [1024] * samples,
+                     [200 + i % 5 for i in range(samples)], chunk_samples)
@@ -0,0 +1,194 @@
+"""
+Tests for the MP4 parser and remuxer.
+"""
+
+import pytest
+
+from mp4splitter.mp4 import MP4Error, parse_mp4, probe_mp4, remux_segment
+from tests.mp4_builder import AUDIO, TrackSpec, audio_track, build_mp4, sample_data, video_track
+
+
+def sample_offsets(spec, chunk_offsets):
+    """Return the expected file offset of every sample of a track."""
+    offsets = []
+    index = 0
+    for chunk_offset, count in zip(chunk_offsets, spec.chunk_samples):
+        offset = chunk_offset
+        for _ in range(count):
+            offsets.append(offset)
+            offset += spec.sizes[index]
+            index += 1
+    return offsets
+
+
+def read_samples(path, track):
+    """Return the data of every sample of a parsed track."""
+    with open(path, "rb") as f:
+        data = f.read()
+    samples = track.samples
+    return [data[offset:offset + size] for offset, size in zip(samples.offsets, samples.sizes)]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "source.mp4")
+    build_mp4(path, [video_track(), audio_track()])
+    return path
+
+
+def test_parse_tracks(source):
+    movie = parse_mp4(source)
+    video, audio = movie.tracks
+    assert movie.video_track is video
+    assert movie.audio_tracks == [audio]
+    assert (video.track_id, video.codec, video.width, video.height) == (1, "avc1", 320, 240)
+    assert (audio.track_id, audio.codec, audio.timescale) == (2, "mp4a", 48000)
+    assert movie.duration_seconds == pytest.approx(0.96)
+
+
+def test_parse_sample_table_runs(source):
+    spec = video_track()
+    video = parse_mp4(source).video_track
+    samples = video.samples
+    assert len(samples) == 24
+    assert list(samples.durations) == [40] * 24
+    assert list(samples.dts) == [40 * i for i in range(24)]
+    assert list(samples.cts_offsets) == spec.cts_offsets
+    assert samples.sync_samples == [0, 8, 16]
+    assert [samples.is_sync(i) for i in (0, 1, 8, 23)] == [True, False, True, False]
+    assert video.media_time == 40
+    # The edit list shifts the first I frame to time 0
+    assert samples.presentation_times()[0] - video.media_time == 0
+
+
+def test_parse_multi_chunk_offsets(tmp_path):
+    path = str(tmp_path / "source.mp4")
+    specs = [video_track(), audio_track()]
+    chunk_offsets = build_mp4(path, specs)
+    movie = parse_mp4(path)
+    for track, spec, offsets in zip(movie.tracks, specs, chunk_offsets):
+        chunks = list(track.samples.sample_chunks)
+        expected = [chunk for chunk, count in enumerate(spec.chunk_samples) for _ in range(count)]
+        assert chunks == expected
+        assert list(track.samples.offsets) == sample_offsets(spec, offsets)
+        assert list(track.samples.sizes) == spec.sizes
+        data = read_samples(path, track)
+        assert data == [sample_data(spec.track_id, i, size) for i, size in enumerate(spec.sizes)]
+
+
+def test_parse_without_stss_or_ctts(tmp_path):
+    path = str(tmp_path / "intra.mp4")
+    build_mp4(path, [video_track(frames=10, reordered=False)])
+    video = parse_mp4(path).video_track
+    assert video.samples.sync_samples is None
+    assert video.samples.cts_offsets is None
+    assert video.media_time == 0
+    assert all(video.samples.is_sync(i) for i in range(10))
+
+
+def test_parse_co64_matches_stco(tmp_path):
+    tables = []
+    for use_co64 in (False, True):
+        path = str(tmp_path / f"co64-{use_co64}.mp4")
+        build_mp4(path, [video_track(), audio_track()], use_co64=use_co64)
+        movie = parse_mp4(path)
+        tables.append([(list(track.samples.offsets), list(track.samples.sizes))
+                       for track in movie.tracks])
+    assert tables[0] == tables[1]
+
+
+def test_parse_rejects_non_mp4(tmp_path):
+    path = tmp_path / "not.mp4"
+    path.write_bytes(b"\0\0\0\x10free" + bytes(8))
+    with pytest.raises(MP4Error):
+        parse_mp4(str(path))
+
+
+def test_probe_counts(source):
+    summary = probe_mp4(source)
+    video, audio = summary.video_track, summary.audio_track
+    assert (video.codec, video.sample_count, video.sync_count) == ("h264", 24, 3)
+    assert video.data_size == sum(video_track().sizes)
+    assert (audio.codec, audio.sample_count, audio.sync_count) == ("aac", 45, 45)
+    assert (audio.channels, audio.sample_rate, audio.channel_layout) == (2, 48000, "stereo")
+
+
+def check_segment(source_path, output_path, first_samples):
+    """
+    Check that every track of a remuxed segment holds the source samples
+    from the given first index on, with their timing unchanged.
+    """
+    source = parse_mp4(source_path)
+    output = parse_mp4(output_path)
+    assert len(output.tracks) == len(first_samples)
+    for source_track, track, first in zip(source.tracks, output.tracks, first_samples):
+        count = len(track.samples)
+        last = first + count
+        assert count > 0
+        assert read_samples(output_path, track) == read_samples(source_path, source_track)[first:last]
+        assert list(track.samples.durations) == list(source_track.samples.durations[first:last])
+        assert track.samples.dts[0] == 0
+        if source_track.samples.cts_offsets is not None:
+            assert (list(track.samples.cts_offsets) ==
+                    list(source_track.samples.cts_offsets[first:last]))
+        assert track.duration == sum(track.samples.durations)
+
+
+def test_remux_segment_from_keyframe(source, tmp_path):
+    output_path = str(tmp_path / "segment.mp4")
+    start = remux_segment(source, 0.35, 0.7, output_path)
+    # The cut moves back to the keyframe presented at 0.32 s
+    assert start == pytest.approx(0.32)
+    # Video from keyframe 8, audio from the frame at 0.32 s (15360 / 1024)
+    check_segment(source, output_path, [8, 15])
+
+    video, audio = parse_mp4(output_path).tracks
+    assert len(video.samples) == 11
+    assert video.samples.sync_samples == [0, 8]
+    assert video.media_time == 40
+    assert len(audio.samples) == 18
+    assert audio.samples.sync_samples is None
+
+
+def test_remux_segment_to_the_end(source, tmp_path):
+    output_path = str(tmp_path / "tail.mp4")
+    start = remux_segment(source, 0.64, 10.0, output_path)
+    assert start == pytest.approx(0.64)
+    check_segment(source, output_path, [16, 30])
+    video, audio = parse_mp4(output_path).tracks
+    assert (len(video.samples), len(audio.samples)) == (8, 15)
+
+
+def test_remux_segment_co64_source(tmp_path):
+    source_path = str(tmp_path / "co64.mp4")
+    build_mp4(source_path, [video_track(), audio_track()], use_co64=True)
+    output_path = str(tmp_path / "segment.mp4")
+    remux_segment(source_path, 0.0, 0.32, output_path)
+    check_segment(source_path, output_path, [0, 0])
+    output = parse_mp4(output_path)
+    # Samples are picked in decode order and may run past the end, but
+    # the edit lists only present the requested 0.32 s
+    assert len(output.video_track.samples) >= 8
+    assert output.duration == 320
+
+
+def test_remux_segment_all_intra(tmp_path):
+    source_path = str(tmp_path / "intra.mp4")
+    build_mp4(source_path, [video_track(frames=20, reordered=False)])
+    output_path = str(tmp_path / "segment.mp4")
+    # Every frame is a keyframe, so the cut stays where it was asked
+    assert remux_segment(source_path, 0.2, 0.4, output_path) == pytest.approx(0.2)
+    check_segment(source_path, output_path, [5])
+    video = parse_mp4(output_path).video_track
+    assert len(video.samples) == 5
+    assert video.samples.sync_samples is None
+
+
+def test_remux_audio_only(tmp_path):
+    source_path = str(tmp_path / "audio.mp4")
+    spec = TrackSpec(1, AUDIO, 48000, [1024] * 20, [300] * 20, [6, 6, 6, 2])
+    build_mp4(source_path, [spec])
+    output_path = str(tmp_path / "segment.mp4")
+    remux_segment(source_path, 1024 * 4 / 48000, 1024 * 10 / 48000, output_path)
+    check_segment(source_path, output_path, [4])
+    assert len(parse_mp4(output_path).tracks[0].samples) == 6
@@ -0,0 +1,37 @@
+"""
+Tests for split job progress tracking.
+"""
+
+import pytest
+
+from mp4splitter import progress
+from mp4splitter.progress import ProgressTracker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(progress.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_speed_and_percent(clock):
+    reports = []
+    tracker = ProgressTracker({0: 10.0, 1: 30.0}, lambda *report: reports.append(report),
+                              fps=25, interval=0)
+    clock[0] += 2.0
+    tracker.update(0, 5.0)
+    assert reports[-1] == pytest.approx((12.5, 62.5, 2.5))
+    clock[0] += 2.0
+    tracker.finish_segment(0)
+    assert reports[-1] == pytest.approx((25.0, 62.5, 2.5))
+
+
+def test_skipped_segments_count_for_percent_only(clock):
+    reports = []
+    tracker = ProgressTracker({0: 60.0, 1: 20.0}, lambda *report: reports.append(report),
+                              fps=25, interval=0)
+    tracker.skip_segment(0)
+    clock[0] += 4.0
+    tracker.update(1, 10.0)
+    assert reports[-1] == pytest.approx((87.5, 62.5, 2.5))
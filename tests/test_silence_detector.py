@@ -0,0 +1,97 @@
+"""
+Tests for silence detection and split point snapping.
+"""
+
+import numpy as np
+import pytest
+
+from mp4splitter.audio_analysis import SAMPLE_RATE
+from mp4splitter.silence_detector import (SNAP_MARGIN_MS, WINDOW_MS, SilenceMap, SilenceTracker,
+                                          window_levels)
+
+LOUD = -10.0
+QUIET = -60.0
+
+
+def levels(*runs):
+    """Build window levels from ``(level, window_count)`` runs."""
+    return np.concatenate([np.full(count, level) for level, count in runs])
+
+
+def track(levels_db, block_size=None, min_silence_ms=100):
+    tracker = SilenceTracker(threshold_db=-40.0, min_silence_ms=min_silence_ms)
+    block_size = block_size or len(levels_db)
+    for first in range(0, len(levels_db), block_size):
+        tracker.add_levels(levels_db[first:first + block_size])
+    tracker.finish()
+    return tracker.silences
+
+
+def test_tracker_finds_silences():
+    stream = levels((LOUD, 10), (QUIET, 10), (LOUD, 10), (QUIET, 20), (LOUD, 5))
+    assert track(stream) == [(10 * WINDOW_MS, 20 * WINDOW_MS), (30 * WINDOW_MS, 50 * WINDOW_MS)]
+
+
+def test_tracker_joins_runs_across_blocks():
+    stream = levels((LOUD, 10), (QUIET, 10), (LOUD, 10), (QUIET, 20), (LOUD, 5))
+    expected = track(stream)
+    for block_size in (1, 3, 7, 16):
+        assert track(stream, block_size) == expected
+
+
+def test_tracker_drops_short_pauses():
+    # 100 ms need 5 windows of 20 ms
+    stream = levels((LOUD, 10), (QUIET, 4), (LOUD, 10), (QUIET, 5), (LOUD, 10))
+    assert track(stream) == [(24 * WINDOW_MS, 29 * WINDOW_MS)]
+
+
+def test_tracker_closes_trailing_silence():
+    stream = levels((QUIET, 6), (LOUD, 10), (QUIET, 8))
+    assert track(stream, block_size=5) == [(0, 6 * WINDOW_MS), (16 * WINDOW_MS, 24 * WINDOW_MS)]
+
+
+def test_window_levels():
+    window = SAMPLE_RATE * WINDOW_MS // 1000
+    samples = np.concatenate([np.zeros(window, dtype=np.int16),
+                              np.full(window, 16384, dtype=np.int16)])
+    quiet, half = window_levels(samples)
+    assert quiet == pytest.approx(-120.0)
+    assert half == pytest.approx(20 * np.log10(0.5), abs=0.01)
+
+
+def test_cut_times_skip_edges():
+    silences = SilenceMap([(0, 500), (2000, 3000), (9000, 10000)], 10000)
+    assert silences.cut_times() == [2500]
+    assert [(p.start_time, p.end_time) for p in silences.split_points()] == [
+        (0, 2500), (2500, None)]
+
+
+def test_snap_inside_silence_stays():
+    silences = SilenceMap([(2000, 3000)], 10000)
+    assert silences.snap_ms(2500) == 2500
+
+
+def test_snap_moves_past_margin():
+    silences = SilenceMap([(2000, 3000)], 10000)
+    assert silences.snap_ms(1500) == 2000 + SNAP_MARGIN_MS
+    assert silences.snap_ms(3400) == 3000 - SNAP_MARGIN_MS
+    # Inside the silence but too close to its edge
+    assert silences.snap_ms(2050) == 2000 + SNAP_MARGIN_MS
+
+
+def test_snap_short_silence_uses_middle():
+    silences = SilenceMap([(2000, 2100)], 10000)
+    assert silences.snap_ms(1900) == 2050
+
+
+def test_snap_picks_nearest_silence():
+    silences = SilenceMap([(1000, 2000), (4000, 5000)], 10000)
+    assert silences.snap_ms(2500) == 2000 - SNAP_MARGIN_MS
+    assert silences.snap_ms(3500) == 4000 + SNAP_MARGIN_MS
+
+
+def test_snap_out_of_reach():
+    silences = SilenceMap([(2000, 3000)], 10000)
+    assert silences.snap_ms(6000, tolerance_ms=1000) == 6000
+    assert silences.snap_ms(1000, tolerance_ms=1000) == 1000
+    assert SilenceMap([], 10000).snap_ms(1234) == 1234
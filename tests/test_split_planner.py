@@ -0,0 +1,84 @@
+"""
+Tests for automatic split point planning.
+"""
+
+import os
+
+import pytest
+
+from mp4splitter.keyframe_index import KeyframeIndex
+from mp4splitter.mp4 import parse_mp4, remux_segment
+from mp4splitter.split_planner import plan_by_size, plan_fixed_interval
+from tests.mp4_builder import audio_track, build_mp4, video_track
+
+
+@pytest.fixture
+def source(tmp_path):
+    # 4 s of video with a keyframe every 0.32 s, and audio
+    path = str(tmp_path / "source.mp4")
+    build_mp4(path, [video_track(frames=100), audio_track(samples=188)])
+    return path
+
+
+def test_fixed_interval():
+    points = plan_fixed_interval(10000, 3000)
+    assert [(p.start_time, p.end_time) for p in points] == [
+        (0, 3000), (3000, 6000), (6000, 9000), (9000, None)]
+
+
+def test_fixed_interval_snaps_to_keyframes():
+    index = KeyframeIndex([0.0, 2.5, 5.2, 7.9])
+    points = plan_fixed_interval(10000, 2500, index)
+    assert [p.start_time for p in points] == [0, 2500, 5200, 7900]
+
+
+def test_fixed_interval_rejects_zero():
+    with pytest.raises(ValueError):
+        plan_fixed_interval(10000, 0)
+
+
+def test_plan_by_size_cuts_on_keyframes(source):
+    points = plan_by_size(source, 12000)
+    assert len(points) > 2
+    assert points[0].start_time == 0
+    assert points[-1].end_time is None
+    for point, following in zip(points, points[1:]):
+        assert point.end_time == following.start_time
+        # Keyframes are presented every 320 ms
+        assert following.start_time % 320 == 0
+
+
+def test_plan_by_size_segments_fit(source, tmp_path):
+    max_bytes = 12000
+    points = plan_by_size(source, max_bytes)
+    movie = parse_mp4(source)
+    total = 0
+    for i, point in enumerate(points):
+        output_path = str(tmp_path / f"segment{i}.mp4")
+        end = point.end_time / 1000 if point.end_time is not None else movie.duration_seconds
+        start = remux_segment(movie, point.start_time / 1000, end, output_path)
+        assert start == pytest.approx(point.start_time / 1000)
+        assert os.path.getsize(output_path) <= max_bytes
+        total += len(parse_mp4(output_path).video_track.samples)
+    # Each frame is decoded by exactly one segment, except the keyframe
+    # after each cut that the remuxer may take along
+    assert 100 <= total <= 100 + len(points) - 1
+
+
+def test_plan_by_size_uses_the_room(source):
+    # A larger limit never needs more segments
+    counts = [len(plan_by_size(source, max_bytes)) for max_bytes in (10000, 20000, 40000)]
+    assert counts == sorted(counts, reverse=True)
+    assert counts[-1] < counts[0]
+    assert len(plan_by_size(source, 10 ** 9)) == 1
+
+
+def test_plan_by_size_large_gop(source):
+    # Limits below a single GOP still give one segment per GOP
+    points = plan_by_size(source, 6000)
+    assert [p.start_time for p in points] == [320 * k for k in range(13)]
+
+
+def test_plan_by_size_rejects_tiny_limit(source):
+    with pytest.raises(ValueError):
+        plan_by_size(source, 100)
@@ -0,0 +1,100 @@
+"""
+Tests for split specifications.
+"""
+
+import json
+
+import pytest
+
+from mp4splitter.split_spec import (load_split_spec, parse_time, points_from_cuts,
+                                    points_from_json, points_from_ranges)
+
+
+def spans(points):
+    return [(point.start_time, point.end_time) for point in points]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("90.5", 90500),
+    (12, 12000),
+    ("1:30", 90000),
+    ("01:02:03.25", 3723250),
+    (" 0:00:00.001 ", 1),
+    ("0", 0),
+])
+def test_parse_time(value, expected):
+    assert parse_time(value) == expected
+
+
+@pytest.mark.parametrize("value", [
+    "", "abc", "1::2", "1:2:3:4", "inf", "nan", "-5", "1:-5", "1e400", "1:inf",
+])
+def test_parse_time_rejects(value):
+    with pytest.raises(ValueError):
+        parse_time(value)
+
+
+def test_points_from_cuts():
+    assert spans(points_from_cuts([20000, 5000, 0, 20000])) == [
+        (0, 5000), (5000, 20000), (20000, None)]
+    assert spans(points_from_cuts([])) == [(0, None)]
+
+
+def test_points_from_ranges():
+    points = points_from_ranges([("0", "10"), ("10", "1:00"), ("1:30", None)])
+    assert spans(points) == [(0, 10000), (10000, 60000), (90000, None)]
+    assert spans(points_from_ranges([("5", "")])) == [(5000, None)]
+
+
+def test_points_from_ranges_keeps_order():
+    # Ranges may be given in any order as long as they fit together
+    points = points_from_ranges([("20", None), ("0", "10")])
+    assert spans(points) == [(20000, None), (0, 10000)]
+
+
+@pytest.mark.parametrize("ranges", [
+    [("10", "5")],
+    [("10", "10")],
+    [("0", None), ("10", "20")],
+    [("0", "15"), ("10", "20")],
+    [("0", "x")],
+])
+def test_points_from_ranges_rejects(ranges):
+    with pytest.raises(ValueError):
+        points_from_ranges(ranges)
+
+
+def test_points_from_json():
+    assert spans(points_from_json({"cuts": [10, "1:00"]})) == [
+        (0, 10000), (10000, 60000), (60000, None)]
+    assert spans(points_from_json([{"start": 0, "end": 5}, {"start": "0:05"}])) == [
+        (0, 5000), (5000, None)]
+    assert spans(points_from_json([[0, 5], [5]])) == [(0, 5000), (5000, None)]
+
+
+@pytest.mark.parametrize("data", [
+    {"segments": []},
+    "0,10",
+    [{"end": 5}],
+    [[]],
+    [42],
+])
+def test_points_from_json_rejects(data):
+    with pytest.raises(ValueError):
+        points_from_json(data)
+
+
+def test_load_csv_with_header(tmp_path):
+    path = tmp_path / "spec.csv"
+    path.write_text("start,end\n0,10\n\n10,\n", encoding="utf-8")
+    assert spans(load_split_spec(str(path))) == [(0, 10000), (10000, None)]
+
+
+def test_load_json(tmp_path):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps({"cuts": [3, 6]}), encoding="utf-8")
+    assert spans(load_split_spec(str(path))) == [(0, 3000), (3000, 6000), (6000, None)]
+    # The format can be forced whatever the extension
+    other = tmp_path / "spec.txt"
+    other.write_text(json.dumps([[1, 2]]), encoding="utf-8")
+    assert spans(load_split_spec(str(other), "json")) == [(1000, 2000)]
@@ -0,0 +1,60 @@
+"""
+Tests for the smart cut strategy, run against clips made with ffmpeg.
+"""
+
+import math
+import subprocess
+
+import pytest
+
+from moviepy.config import FFMPEG_BINARY
+
+from mp4splitter.ffmpeg_tools import run_ffmpeg
+from mp4splitter.split_strategies import SmartCutStrategy
+
+FPS = 25
+
+
+def frame_times(path):
+    """Return the presentation time of every decoded video frame, in frames."""
+    output = subprocess.run(
+        [FFMPEG_BINARY, "-v", "error", "-i", path, "-map", "0:v", "-f", "framecrc", "-"],
+        capture_output=True, check=True, text=True).stdout
+    rows = [line.split(",") for line in output.splitlines() if not line.startswith("#")]
+    return [int(row[2]) for row in rows]
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    # H.264 with B-frames and a keyframe every 2 s, plus AAC audio
+    path = str(tmp_path_factory.mktemp("smart_cut") / "source.mp4")
+    try:
+        run_ffmpeg([
+            "-f", "lavfi", "-i", f"testsrc=size=160x120:rate={FPS}",
+            "-f", "lavfi", "-i", "sine=frequency=440",
+            "-t", "6",
+            "-c:v", "libx264", "-preset", "ultrafast", "-g", str(2 * FPS),
+            "-keyint_min", str(2 * FPS), "-sc_threshold", "0", "-bf", "3",
+            "-c:a", "aac",
+            path,
+        ])
+    except RuntimeError as e:
+        pytest.skip(f"ffmpeg cannot encode the test clip: {e}")
+    return path
+
+
+@pytest.mark.parametrize("start_sec, end_sec", [
+    (0.0, 3.3),   # starts on a keyframe, copied whole
+    (1.3, 4.5),   # re-encoded head spliced to a copied tail
+    (4.0, 6.0),   # the end of the source
+])
+def test_segment_frames(source, tmp_path, start_sec, end_sec):
+    strategy = SmartCutStrategy()
+    strategy.open(source)
+    output_path = str(tmp_path / "segment.mp4")
+    strategy.write_segment(0, start_sec, end_sec, output_path)
+
+    times = frame_times(output_path)
+    # Every source frame presented inside the range, each once
+    assert len(times) == math.ceil(end_sec * FPS) - math.ceil(start_sec * FPS)
+    assert times == list(range(times[0], times[0] + len(times)))
@@ -0,0 +1,115 @@
+"""
+Tests for the waveform peak pyramid.
+"""
+
+import numpy as np
+import pytest
+
+from mp4splitter.audio_analysis import SAMPLE_RATE
+from mp4splitter.waveform import BASE_SAMPLES, PeakPyramid, _PeakBuilder
+
+
+def make_pyramid(samples, block_size=BASE_SAMPLES * 7):
+    """Build a pyramid the way ``compute_waveform`` does, one block at a time."""
+    builder = _PeakBuilder()
+    for first in range(0, len(samples), block_size):
+        builder.add_samples(samples[first:first + block_size])
+    return PeakPyramid.from_base(builder.base(), len(samples))
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(7)
+    # A little over 10 s, so the last peak is partial
+    return rng.integers(-32768, 32767, SAMPLE_RATE * 10 + 100, dtype=np.int16)
+
+
+def test_levels_halve(samples):
+    pyramid = make_pyramid(samples)
+    counts = [len(level) for level in pyramid.levels]
+    assert counts[0] == -(-len(samples) // BASE_SAMPLES)
+    assert counts[-1] == 1
+    for count, following in zip(counts, counts[1:]):
+        assert following == (count + 1) // 2
+
+
+def test_levels_bound_the_samples(samples):
+    pyramid = make_pyramid(samples)
+    for index, level in enumerate(pyramid.levels):
+        span = BASE_SAMPLES << index
+        for peak in (0, len(level) // 2, len(level) - 1):
+            chunk = samples[peak * span:(peak + 1) * span]
+            assert level[peak, 0] == chunk.min()
+            assert level[peak, 1] == chunk.max()
+
+
+def test_bytes_round_trip(samples):
+    pyramid = make_pyramid(samples)
+    restored = PeakPyramid.from_bytes(pyramid.to_bytes())
+    assert restored.sample_count == pyramid.sample_count
+    assert restored.duration_ms == 10006
+    assert len(restored.levels) == len(pyramid.levels)
+    for level, original in zip(restored.levels, pyramid.levels):
+        assert level.dtype == np.int16
+        assert np.array_equal(level, original)
+
+
+def test_from_bytes_rejects_truncated(samples):
+    data = make_pyramid(samples).to_bytes()
+    for size in (4, 16, len(data) - 2):
+        with pytest.raises(ValueError):
+            PeakPyramid.from_bytes(data[:size])
+
+
+def test_peaks_exact_at_base_resolution(samples):
+    pyramid = make_pyramid(samples)
+    # One base peak per pixel, aligned on peak boundaries
+    width = 100
+    start_ms = BASE_SAMPLES * 1000 * 10 // SAMPLE_RATE
+    end_ms = start_ms + BASE_SAMPLES * width * 1000 // SAMPLE_RATE
+    mins, maxs = pyramid.peaks(start_ms, end_ms, width)
+    chunks = samples[BASE_SAMPLES * 10:BASE_SAMPLES * (10 + width)].reshape(width, -1)
+    assert np.array_equal(mins, chunks.min(axis=1))
+    assert np.array_equal(maxs, chunks.max(axis=1))
+
+
+@pytest.mark.parametrize("start_ms, end_ms, width", [
+    (0, 10006, 800),
+    (1234, 5678, 300),
+    (9000, 9100, 50),
+    (0, 10006, 3),
+])
+def test_peaks_cover_every_pixel(samples, start_ms, end_ms, width):
+    pyramid = make_pyramid(samples)
+    mins, maxs = pyramid.peaks(start_ms, end_ms, width)
+    assert len(mins) == len(maxs) == width
+    samples_per_pixel = (end_ms - start_ms) * SAMPLE_RATE / 1000 / width
+    # The coarsest peaks that still fit in a pixel
+    span = BASE_SAMPLES
+    while span * 2 <= samples_per_pixel:
+        span *= 2
+    edges = start_ms * SAMPLE_RATE / 1000 + samples_per_pixel * np.arange(width + 1)
+    for x in range(width):
+        # Each pixel shows the peaks starting under it, so blocks crossing
+        # into the next pixel count for this one
+        first = int(edges[x] // span)
+        last = max(int(edges[x + 1] // span), first + 1)
+        pixel = samples[first * span:last * span]
+        assert mins[x] == pixel.min()
+        assert maxs[x] == pixel.max()
+
+
+def test_peaks_outside_the_recording(samples):
+    pyramid = make_pyramid(samples)
+    mins, maxs = pyramid.peaks(9000, 13000, 40)
+    assert not mins[20:].any() and not maxs[20:].any()
+    assert maxs[:10].all()
+    assert not pyramid.peaks(20000, 30000, 10)[1].any()
+
+
+def test_peaks_empty_view(samples):
+    pyramid = make_pyramid(samples)
+    assert len(pyramid.peaks(0, 1000, 0)[0]) == 0
+    assert not pyramid.peaks(1000, 1000, 10)[1].any()
+    empty = PeakPyramid.from_base(np.zeros((0, 2), dtype=np.int16), 0)
+    assert not empty.peaks(0, 1000, 10)[1].any()